@@ -3,9 +3,15 @@ import streamlit as st
 import os
 import tempfile
 from src.ats.main import employer_kickoff,candidate_kickoff,improve_resume_for_ats
-from src.ats.utils.candidateUtils import get_resume_text,display_resume
+from src.ats.utils.candidateUtils import get_resume_text,display_resume,extract_resume_texts
+from src.ats.utils.emailOutbox import get_email_outbox
+from src.ats.utils.llmMetrics import get_llm_metrics
 from dotenv import load_dotenv
 load_dotenv()
+# Start the outbox worker so emails queued before a restart are delivered
+get_email_outbox()
+# Serves /metrics when ATS_METRICS_PORT is set
+get_llm_metrics()
 
 # Streamlit app
 st.set_page_config(
@@ -55,9 +61,10 @@ if selected_role == "Employer":
                     resume_texts = []
                     id=0
                     if uploaded_resumes:
-                        for file in uploaded_resumes:
+                        # Extract all resumes in parallel worker processes, in upload order
+                        texts = extract_resume_texts([(file.getvalue(), file.type) for file in uploaded_resumes])
+                        for file, text in zip(uploaded_resumes, texts):
                             id+=1
-                            text = get_resume_text(file)
                             resume_texts.append({
                                 "id":str(id),
                                 "filename": file.name,
@@ -0,0 +1,91 @@
+"""
+Tokens per candidate and end-to-end latency of batched vs single scoring.
+
+Scores the same synthetic candidates with LeadScoreCrew one per call and in
+batches of K per call, against the local mock LLM endpoint.
+
+    python -m benchmarks.bench_batch_scoring --candidates 40 --batch-sizes 1,5,10
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks.mock_llm_server import MockLLMServer
+
+JOB_DESCRIPTION = (
+    "Senior Python Engineer. We build data-heavy backend services on AWS. "
+    "Requirements: 5+ years of Python, REST APIs, PostgreSQL, Docker, Kubernetes, CI/CD. "
+    "Nice to have: Kafka, Terraform, machine learning pipelines. "
+) * 4
+
+
+def _candidates(n):
+    from src.ats.types import Candidate
+
+    return [
+        Candidate(
+            id=str(i + 1),
+            name=f"Candidate {i + 1}",
+            email=f"candidate{i + 1}@example.com",
+            bio=("Backend engineer with %d years building Python APIs, PostgreSQL schemas and Docker-based "
+                 "deployments on AWS. Led migration of a monolith to services. " % (i % 10 + 1)) * 6,
+            years_of_exp=str(i % 10 + 1),
+            skills="Python, PostgreSQL, Docker, AWS",
+        )
+        for i in range(n)
+    ]
+
+
+async def _score(candidates, batch_size):
+    from src.ats.main import score_candidate, score_candidate_batch
+
+    if batch_size <= 1:
+        return await asyncio.gather(*(score_candidate(c, JOB_DESCRIPTION) for c in candidates))
+    batches = [candidates[i:i + batch_size] for i in range(0, len(candidates), batch_size)]
+    results = await asyncio.gather(*(score_candidate_batch(b, JOB_DESCRIPTION) for b in batches))
+    return [score for batch in results for score in batch]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--candidates", type=int, default=40)
+    parser.add_argument("--batch-sizes", default="1,5,10")
+    parser.add_argument("--latency", type=float, default=0.3, help="Mock LLM latency per call in seconds")
+    parser.add_argument("--latency-per-token", type=float, default=0.002, help="Extra mock latency per completion token")
+    parser.add_argument("--partial-batch-rate", type=float, default=0.0, help="Share of batch answers that drop a candidate")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory, MockLLMServer(
+        latency=args.latency,
+        latency_per_token=args.latency_per_token,
+        partial_batch_rate=args.partial_batch_rate,
+    ) as server:
+        # Run from a temp dir so email_responses/ and other flow output stay out of the repo
+        os.chdir(directory)
+        os.environ["OPENAI_BASE_URL"] = os.environ["OPENAI_API_BASE"] = server.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+        os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+        os.environ["ATS_LLM_CACHE"] = "0"
+        # Measure the LLM path, not the provider budget of the rate-limit scheduler
+        os.environ.setdefault("ATS_LLM_RPM", "100000")
+        os.environ.setdefault("ATS_LLM_TPM", "100000000")
+
+        candidates = _candidates(args.candidates)
+        print(f"{'batch':>6} {'seconds':>8} {'calls':>6} {'prompt tok/cand':>16} {'total tok/cand':>15}")
+        for batch_size in [int(b) for b in args.batch_sizes.split(",")]:
+            requests, prompt, completion = server.requests, server.prompt_tokens, server.completion_tokens
+            started = time.perf_counter()
+            scores = asyncio.run(_score(candidates, batch_size))
+            elapsed = time.perf_counter() - started
+            assert [s.id for s in scores] == [c.id for c in candidates], "scores do not match candidates"
+
+            calls = server.requests - requests
+            prompt_per = (server.prompt_tokens - prompt) / len(candidates)
+            total_per = prompt_per + (server.completion_tokens - completion) / len(candidates)
+            print(f"{batch_size:>6} {elapsed:>8.2f} {calls:>6} {prompt_per:>16.0f} {total_per:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Employer run interrupted during scoring: resume from the checkpoint versus
+starting over.
+
+A child process runs LeadScoreFlow over N resumes against the mock LLM
+endpoint and is killed (SIGKILL) once a share of the scoring calls have
+completed. The run is then continued with resume_employer_run, and, for
+comparison, the same inputs are run again from scratch. Reports the LLM
+calls per stage (extraction, filter, score, email) each of them made and
+checks that the resumed run ends with a score for every passing candidate,
+in the flow state and in the result store.
+
+    python -m benchmarks.bench_checkpoint --resumes 60 --kill-at 0.5
+"""
+import argparse
+import multiprocessing
+import os
+import signal
+import tempfile
+import time
+from collections import Counter
+
+from benchmarks.mock_llm_server import MockLLMServer
+
+STAGES = ["extract", "filter", "score", "email"]
+
+
+def configure(base_url, directory):
+    os.environ["OPENAI_BASE_URL"] = os.environ["OPENAI_API_BASE"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+    os.environ["ATS_LLM_CACHE"] = "0"
+    # Measure the LLM calls, not the provider budget of the rate-limit scheduler
+    os.environ.setdefault("ATS_LLM_RPM", "100000")
+    os.environ.setdefault("ATS_LLM_TPM", "100000000")
+    # Every candidate goes through LeadFilterCrew, and emails are only queued
+    os.environ["ATS_PREFILTER"] = "0"
+    os.environ["ATS_OUTBOX_WORKER"] = "0"
+    os.environ["ATS_CHECKPOINT_PATH"] = os.path.join(directory, "checkpoints.sqlite3")
+    os.environ["ATS_RESULTS_PATH"] = os.path.join(directory, "results.sqlite3")
+    os.environ["ATS_OUTBOX_PATH"] = os.path.join(directory, "outbox.sqlite3")
+
+
+def resumes(n):
+    return [
+        {"id": str(i), "content": f"Name: Person {i}\nEmail: person{i}@example.com\n"
+                                  f"Python developer, {i % 12} years with Django, AWS, Docker and SQL."}
+        for i in range(n)
+    ]
+
+
+def run_until_killed(base_url, directory, jd, n, run_id):
+    configure(base_url, directory)
+    from src.ats.main import LeadScoreFlow
+
+    flow = LeadScoreFlow()
+    flow.reset()
+    flow.kickoff(inputs={"run_id": run_id, "jd": jd, "candidate_resumes": resumes(n)})
+
+
+def calls_since(llm, before):
+    return {stage: llm.completed[stage] - before[stage] for stage in STAGES}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=60)
+    parser.add_argument("--kill-at", type=float, default=0.5, help="Share of the resumes scored before the kill")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=1.0, help="Spreads the scoring calls out in time")
+    args = parser.parse_args()
+    jd = "Senior Python developer with Django, AWS and Docker experience."
+
+    with tempfile.TemporaryDirectory() as directory, MockLLMServer(latency=args.latency, jitter=args.jitter) as llm:
+        # Run from a temp dir, inherited by the child, so email_responses/ stays out of the repo
+        os.chdir(directory)
+        configure(llm.base_url, directory)
+        run_id = "bench-run"
+        child = multiprocessing.get_context("spawn").Process(
+            target=run_until_killed, args=(llm.base_url, directory, jd, args.resumes, run_id)
+        )
+        child.start()
+        while llm.completed["score"] < args.resumes * args.kill_at * 2 / 3:
+            if not child.is_alive():
+                raise SystemExit("the run finished before it could be interrupted; raise --jitter")
+            time.sleep(0.01)
+        os.kill(child.pid, signal.SIGKILL)
+        child.join()
+        killed = calls_since(llm, Counter())
+        time.sleep(args.latency + args.jitter)  # let requests of the killed process drain
+
+        from src.ats.main import LeadScoreFlow, resume_employer_run
+        from src.ats.utils.flowCheckpoint import get_flow_checkpoint
+        from src.ats.utils.resultStore import get_result_store
+
+        [run] = [run for run in get_flow_checkpoint().unfinished_runs() if run["run_id"] == run_id]
+        print(f"killed during scoring: {run['items']} items checkpointed, calls so far {killed}")
+
+        before, started = Counter(llm.completed), time.perf_counter()
+        flow = resume_employer_run(run_id)
+        resumed, resumed_seconds = calls_since(llm, before), time.perf_counter() - started
+        passed = {f.id for f in flow.state.candidate_filters if f.result == "Pass"}
+        assert set(flow.state.candidate_score) == passed, "every passing candidate has one score"
+        assert get_flow_checkpoint().run(run_id) is None, "a finished run drops its checkpoint"
+        stored = {row["candidate_id"] for row in get_result_store().scores(run_id)}
+        assert stored == set(flow.state.candidate_score), "the result store has every score of the resumed run"
+
+        before, started = Counter(llm.completed), time.perf_counter()
+        rerun = LeadScoreFlow()
+        rerun.reset()
+        rerun.kickoff(inputs={"jd": jd, "candidate_resumes": resumes(args.resumes)})
+        full, full_seconds = calls_since(llm, before), time.perf_counter() - started
+
+    print(f"\n{'':>12} {'seconds':>8} " + " ".join(f"{stage:>8}" for stage in STAGES) + f" {'total':>7}")
+    for name, seconds, calls in [("resume", resumed_seconds, resumed), ("start over", full_seconds, full)]:
+        print(f"{name:>12} {seconds:>8.2f} " + " ".join(f"{calls[stage]:>8}" for stage in STAGES)
+              + f" {sum(calls.values()):>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Per-kickoff crew construction overhead, before and after the crew pool.
+
+"before" builds the crew the old way (`LeadScoreCrew().crew()`: YAML parse,
+Agents, Tasks and LLM clients); "after" takes a copy from the pool. No LLM
+calls are made.
+
+    python -m benchmarks.bench_crew_pool --iterations 200
+"""
+import argparse
+import os
+import time
+
+
+def _per_call_ms(build, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        build()
+    return (time.perf_counter() - started) * 1000 / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+    from src.ats.crews.lead_filter_crew.lead_filter_crew import LeadFilterCrew
+    from src.ats.crews.lead_response_crew.lead_response_crew import LeadResponseCrew
+    from src.ats.crews.lead_score_crew.lead_score_crew import LeadScoreCrew
+    from src.ats.utils.crewPool import CrewPool
+
+    pool = CrewPool()
+    print(f"{'crew':>18} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    for crew_cls in (LeadFilterCrew, LeadScoreCrew, LeadResponseCrew):
+        pool.template(crew_cls)
+        before = _per_call_ms(lambda: crew_cls().crew(), args.iterations)
+        after = _per_call_ms(lambda: pool.acquire(crew_cls), args.iterations)
+        name = crew_cls.__name__.replace("CrewBase(", "").rstrip(")")
+        print(f"{name:>18} {before:>10.2f} {after:>10.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
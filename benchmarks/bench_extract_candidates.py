@@ -0,0 +1,58 @@
+"""
+Wall-clock time of candidate extraction against batch size.
+
+Compares the old sequential extract_candidate_info loop with the bounded
+concurrent extract_candidates_async stage, using a local mock LLM endpoint.
+
+    python -m benchmarks.bench_extract_candidates --latency 0.2
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.mock_llm_server import MockLLMServer
+
+
+def _resumes(n):
+    return [{"id": str(i + 1), "filename": f"resume_{i + 1}.pdf", "content": f"Resume {i + 1}\nPython developer"} for i in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.2, help="Mock LLM latency in seconds")
+    parser.add_argument("--batch-sizes", default="10,50,200")
+    parser.add_argument("--concurrency", default="1,8,32")
+    parser.add_argument("--sequential-max", type=int, default=50, help="Largest batch run through the sequential baseline")
+    args = parser.parse_args()
+
+    with MockLLMServer(latency=args.latency) as server:
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+        os.environ.setdefault("ATS_LLM_RPM", "100000")
+        os.environ.setdefault("ATS_LLM_TPM", "100000000")
+        os.environ.setdefault("ATS_LLM_CONCURRENCY", "64")
+
+        from src.ats.utils.candidateUtils import extract_candidate_info, extract_candidates_async
+
+        print(f"{'batch':>6} {'mode':>14} {'seconds':>9} {'resumes/s':>10}")
+        for size in [int(s) for s in args.batch_sizes.split(",")]:
+            resumes = _resumes(size)
+
+            if size <= args.sequential_max:
+                started = time.perf_counter()
+                for resume in resumes:
+                    extract_candidate_info(resume["content"], resume["id"])
+                elapsed = time.perf_counter() - started
+                print(f"{size:>6} {'sequential':>14} {elapsed:>9.2f} {size / elapsed:>10.1f}")
+
+            for concurrency in [int(c) for c in args.concurrency.split(",")]:
+                started = time.perf_counter()
+                candidates = asyncio.run(extract_candidates_async(resumes, concurrency))
+                elapsed = time.perf_counter() - started
+                assert [c.id for c in candidates] == [r["id"] for r in resumes], "results out of order"
+                print(f"{size:>6} {f'async x{concurrency}':>14} {elapsed:>9.2f} {size / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+Offline throughput suite for LeadScoreFlow, CandidateScoreFlow and
+ImproveResumeFlow.
+
+Every flow runs against the local mock LLM endpoint over synthetic resume
+corpora (10, 100 and 1,000 by default), each flow and size in its own
+process so peak RSS is that run's. Reports per run:
+
+- throughput: resumes per second
+- tail latency: p50/p95/p99 of the LLM calls for LeadScoreFlow (one run
+  over the whole corpus), of whole sessions for the per-resume flows
+  (CandidateScoreFlow parses a generated PDF, ImproveResumeFlow rewrites a
+  resume), which run --concurrency at a time in worker threads
+- peak RSS of the process
+- event-loop lag: how late a 10 ms timer fires on the loop driving the run
+- LLM calls, and calls the mock failed with --error-rate / --rate-limit-rate
+
+Results are written to --output as JSON; --compare prints the change
+against an earlier results file. A case where any resume failed is
+reported as an error with the first exception, and left out of the saved
+results.
+
+    python -m benchmarks.bench_flows --sizes 10,100,1000
+    python -m benchmarks.bench_flows --sizes 100 --compare benchmarks/results/<earlier>.json
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from datetime import datetime, timezone
+
+from benchmarks.mock_llm_server import TECH_TERMS, MockLLMServer
+
+FLOWS = ["lead", "candidate", "improve"]
+JOB_DESCRIPTION = (
+    "Senior Python Engineer. Requirements: 5+ years of Python, REST APIs, PostgreSQL, Docker, "
+    "Kubernetes, AWS and CI/CD. Nice to have: Kafka and Terraform."
+)
+
+
+def resume_text(rng, i):
+    skills = ", ".join(rng.sample(TECH_TERMS, rng.randint(1, len(TECH_TERMS))))
+    return (
+        f"Candidate {i}\ncandidate{i}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}\n"
+        f"Summary\nBackend engineer with {rng.randint(1, 12)} years of experience building Python services.\n"
+        f"Skills\n{skills}\n"
+        "Experience\nSenior Engineer | Acme | 2020 - 2024\n- Built data pipelines and REST APIs\n"
+        "Education\nBSc Computer Science"
+    )
+
+
+def write_pdf(path, text):
+    import fitz
+
+    doc = fitz.open()
+    doc.new_page().insert_text((50, 60), text, fontsize=10)
+    doc.save(path)
+    doc.close()
+
+
+def percentiles(values):
+    from src.ats.utils.llmMetrics import percentiles
+
+    return percentiles(values)
+
+
+class LoopLag:
+    """Samples how late a short sleep wakes up on the running loop."""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.samples = []
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - started - self.interval))
+
+    def summary(self):
+        lag = {name: round(value * 1000, 2) for name, value in percentiles(self.samples).items()}
+        lag["max"] = round(max(self.samples, default=0.0) * 1000, 2)
+        return lag
+
+
+async def lead_run(size, options):
+    from src.ats.main import LeadScoreFlow
+    from src.ats.utils.llmMetrics import get_llm_metrics
+
+    rng = random.Random(0)
+    run_id = f"bench-lead-{size}"
+    flow = LeadScoreFlow()
+    flow.reset()
+    await flow.kickoff_async(inputs={
+        "run_id": run_id,
+        "jd": JOB_DESCRIPTION,
+        "candidate_resumes": [{"id": str(i), "content": resume_text(rng, i)} for i in range(size)],
+    })
+    summary = get_llm_metrics().run_summary(run_id)
+    # Passing candidates are scored, the others are rejected; both get an email
+    completed = len(flow.state.hydrated_candidates) + len(flow.state.failed_candidates)
+    return {
+        "completed": completed,
+        "failed": size - completed,
+        "latency_of": "llm_call",
+        "latency_seconds": summary["latency_seconds"],
+    }
+
+
+def candidate_session(rng, i):
+    from src.ats.main import CandidateScoreFlow
+
+    path = os.path.abspath(f"resume_{i}.pdf")
+    write_pdf(path, resume_text(rng, i))
+    return lambda: _kickoff(CandidateScoreFlow, {"jd": JOB_DESCRIPTION, "file_path": path}, "candidate_score")
+
+
+def improve_session(rng, i):
+    from src.ats.main import ImproveResumeFlow
+
+    text = resume_text(rng, i)
+    return lambda: _kickoff(ImproveResumeFlow, {"jd": JOB_DESCRIPTION, "resume_data": text}, "initial_score")
+
+
+def _kickoff(flow_cls, inputs, result_field):
+    flow = flow_cls()
+    flow.reset()
+    flow.kickoff(inputs=inputs)
+    return getattr(flow.state, result_field) is not None
+
+
+async def session_run(size, options, make_session):
+    rng = random.Random(0)
+    # Corpus files are generated before the clock starts
+    sessions = [make_session(rng, i) for i in range(size)]
+    slots = asyncio.Semaphore(options["concurrency"])
+    latencies, outcomes, errors = [], [], []
+
+    async def run(session):
+        async with slots:
+            started = time.perf_counter()
+            try:
+                completed = await asyncio.to_thread(session)
+                if not completed:
+                    errors.append("the flow finished without a result")
+            except Exception:
+                errors.append(traceback.format_exc())
+                completed = False
+            outcomes.append(completed)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(run(session) for session in sessions))
+    return {
+        "completed": sum(outcomes),
+        "failed": len(outcomes) - sum(outcomes),
+        "first_error": errors[0] if errors else None,
+        "latency_of": "session",
+        "latency_seconds": percentiles(latencies),
+    }
+
+
+async def drive(flow, size, options):
+    lag = LoopLag()
+    monitor = asyncio.create_task(lag.run())
+    started = time.perf_counter()
+    if flow == "lead":
+        result = await lead_run(size, options)
+    elif flow == "candidate":
+        result = await session_run(size, options, candidate_session)
+    else:
+        result = await session_run(size, options, improve_session)
+    seconds = time.perf_counter() - started
+    monitor.cancel()
+    return {
+        "seconds": round(seconds, 3),
+        "resumes_per_second": round(size / seconds, 3),
+        **result,
+        "loop_lag_ms": lag.summary(),
+    }
+
+
+def run_case(flow, size, options, workdir, conn):
+    os.chdir(workdir)
+    # The crews' verbose output goes to a log so the report stays readable
+    log = open(os.path.join(workdir, "run.log"), "w")
+    os.dup2(log.fileno(), 1)
+    os.dup2(log.fileno(), 2)
+    try:
+        import src.ats.main  # noqa: F401, imported before the clock starts
+        result = asyncio.run(drive(flow, size, options))
+        result["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    except Exception:
+        result = {"error": traceback.format_exc()}
+    else:
+        # Throughput of a run that lost resumes is not a result
+        first_error = result.pop("first_error", None)
+        if result["failed"]:
+            result = {"error": f"{result['failed']} of {size} resumes failed; first error:\n{first_error or 'not captured'}"}
+    conn.send(result)
+
+
+def configure(base_url):
+    os.environ["OPENAI_BASE_URL"] = os.environ["OPENAI_API_BASE"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+    os.environ["ATS_LLM_CACHE"] = "0"
+    os.environ["ATS_PARSE_CACHE"] = "0"
+    # Measure the flows, not the provider budget of the rate-limit scheduler
+    os.environ.setdefault("ATS_LLM_RPM", "100000")
+    os.environ.setdefault("ATS_LLM_TPM", "100000000")
+    # Emails are only queued; checkpoints, results and metrics go to the run's directory
+    os.environ["ATS_OUTBOX_WORKER"] = "0"
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def print_results(runs, baseline=None):
+    previous = {(run["flow"], run["size"]): run for run in (baseline or {}).get("runs", [])}
+    print(f"\n{'flow':>10} {'size':>6} {'resumes/s':>10} {'latency':>9} {'p50':>7} {'p95':>7} {'p99':>7} "
+          f"{'RSS MB':>7} {'lag p99 ms':>11} {'calls':>6} {'errors':>7}")
+    for run in runs:
+        if "error" in run:
+            print(f"{run['flow']:>10} {run['size']:>6}  error: {run['error'].strip().splitlines()[-1]}")
+            continue
+        latency = run["latency_seconds"]
+        print(f"{run['flow']:>10} {run['size']:>6} {run['resumes_per_second']:>10.2f} {run['latency_of']:>9} "
+              f"{latency['p50']:>7.3f} {latency['p95']:>7.3f} {latency['p99']:>7.3f} {run['peak_rss_mb']:>7.0f} "
+              f"{run['loop_lag_ms']['p99']:>11.1f} {run['llm_calls']:>6} {run['llm_errors']:>7}")
+        before = previous.get((run["flow"], run["size"]))
+        if before and "error" not in before:
+            def change(new, old):
+                return f"{(new - old) / old * 100:+.0f}%" if old else "n/a"
+            print(f"{'':>17} vs baseline: throughput {change(run['resumes_per_second'], before['resumes_per_second'])}, "
+                  f"p95 {change(latency['p95'], before['latency_seconds']['p95'])}, "
+                  f"RSS {change(run['peak_rss_mb'], before['peak_rss_mb'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--flows", default=",".join(FLOWS), help="Comma-separated: lead, candidate, improve")
+    parser.add_argument("--sizes", default="10,100,1000")
+    parser.add_argument("--concurrency", type=int, default=8, help="Parallel sessions of the per-resume flows")
+    parser.add_argument("--latency", type=float, default=0.1, help="Mock LLM latency per call in seconds")
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of calls answered with a 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of calls answered with a 429")
+    parser.add_argument("--output", default=os.path.join("benchmarks", "results"))
+    parser.add_argument("--compare", help="Earlier results file to compare with")
+    args = parser.parse_args()
+
+    options = {"concurrency": args.concurrency}
+    runs = []
+    with MockLLMServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                       rate_limit_rate=args.rate_limit_rate) as llm:
+        configure(llm.base_url)
+        for flow in args.flows.split(","):
+            for size in [int(size) for size in args.sizes.split(",")]:
+                with tempfile.TemporaryDirectory() as workdir:
+                    requests, errors = llm.requests, sum(llm.errors.values())
+                    receiver, sender = multiprocessing.Pipe(duplex=False)
+                    process = multiprocessing.get_context("spawn").Process(
+                        target=run_case, args=(flow, size, options, workdir, sender)
+                    )
+                    process.start()
+                    while not receiver.poll(0.5) and process.is_alive():
+                        pass
+                    result = receiver.recv() if receiver.poll() else {"error": f"exit code {process.exitcode}"}
+                    process.join()
+                    run = {"flow": flow, "size": size, **result,
+                           "llm_calls": llm.requests - requests, "llm_errors": sum(llm.errors.values()) - errors}
+                    runs.append(run)
+                    if "error" in run:
+                        print(f"{flow} x {size} failed: {run['error']}")
+                    else:
+                        print(f"{flow} x {size}: {json.dumps(run)}")
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(runs, baseline)
+
+    os.makedirs(args.output, exist_ok=True)
+    path = os.path.join(args.output, f"flows-{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.json")
+    with open(path, "w") as f:
+        json.dump({
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "options": vars(args),
+            # Failed cases are left out so a later --compare only sees valid runs
+            "runs": [run for run in runs if "error" not in run],
+        }, f, indent=2)
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+LLM calls and latency per ImproveResumeFlow session, with and without the
+local rescoring shortcut.
+
+Runs the same number of sessions with ATS_LOCAL_RESCORE=0 (every rewrite
+is rescored by LeadScoreCrew) and =1 (rewrites whose local estimate is
+clearly below the target with another rewrite to come, or that did not
+change, are not),
+against the local mock LLM endpoint. The mock scores a resume by the
+skills it lists and returns a share of rewrites unchanged.
+
+    python -m benchmarks.bench_improve_resume --sessions 10 --latency 0.5
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from benchmarks.mock_llm_server import MockLLMServer
+
+RESUME = (
+    "Summary\nBackend engineer building Python services.\n\n"
+    "Skills\nPython, SQL\n\n"
+    "Experience\nEngineer | Acme | 2019 - 2024\nMaintained internal tools.\n\n"
+    "Education\nBSc Computer Science"
+)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.5, help="Mock LLM latency per call in seconds")
+    parser.add_argument("--unchanged-rate", type=float, default=0.3, help="Share of rewrites that return the resume unchanged")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory, MockLLMServer(
+        latency=args.latency, unchanged_rewrite_rate=args.unchanged_rate
+    ) as server:
+        # Run from a temp dir so email_responses/ and other flow output stay out of the repo
+        os.chdir(directory)
+        os.environ["OPENAI_BASE_URL"] = os.environ["OPENAI_API_BASE"] = server.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+        os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+        os.environ["ATS_LLM_CACHE"] = "0"
+        # Measure the LLM path, not the provider budget of the rate-limit scheduler
+        os.environ.setdefault("ATS_LLM_RPM", "100000")
+        os.environ.setdefault("ATS_LLM_TPM", "100000000")
+
+        from src.ats.main import ImproveResumeFlow
+
+        print(f"{'local rescore':>13} {'mean s':>8} {'p95 s':>8} {'LLM calls/session':>18} {'rescores skipped':>17}")
+        for enabled in ["0", "1"]:
+            os.environ["ATS_LOCAL_RESCORE"] = enabled
+            random.seed(0)  # same mock scores for both modes
+            requests, timings, skipped = server.requests, [], 0
+            for _ in range(args.sessions):
+                flow = ImproveResumeFlow()
+                started = time.perf_counter()
+                flow.kickoff(inputs={"jd": "https://example.com/job", "resume_data": RESUME})
+                timings.append(time.perf_counter() - started)
+                skipped += flow.state.llm_rescores_skipped
+            calls = (server.requests - requests) / args.sessions
+            p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+            print(f"{enabled:>13} {statistics.mean(timings):>8.2f} {p95:>8.2f} {calls:>18.1f} {skipped:>17}")
+
+
+if __name__ == "__main__":
+    main()
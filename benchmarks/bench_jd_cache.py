@@ -0,0 +1,93 @@
+"""
+Job description cache: shared fetches, hits and conditional revalidation.
+
+Against the stand-in job board of bench_jd_fetch (which sends an ETag and
+Last-Modified and answers 304 to a matching If-None-Match):
+
+1. N concurrent sessions load the same posting under differently written
+   URLs (tracking parameters, parameter order, host case, trailing slash),
+   without the cache and with it. With the cache, one request reaches the
+   server.
+2. Repeated loads within the TTL are served from memory.
+3. After the TTL the entry is revalidated with a conditional request that
+   returns 304 instead of the page.
+
+    python -m benchmarks.bench_jd_cache --sessions 50 --page-delay 0.2
+"""
+import argparse
+import statistics
+import threading
+import time
+
+from benchmarks.bench_jd_fetch import StandInServer
+from src.ats.utils.jobDescriptionCache import JobDescriptionCache, normalize_url
+from src.ats.utils.jobFetcher import fetch_job_description
+
+
+def concurrently(function, urls):
+    barrier = threading.Barrier(len(urls))
+    results = [None] * len(urls)
+
+    def run(i):
+        barrier.wait()
+        results[i] = function(urls[i])
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(urls))]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--page-delay", type=float, default=0.2, help="Server time to produce the posting page")
+    parser.add_argument("--hits", type=int, default=10000)
+    args = parser.parse_args()
+
+    with StandInServer(job_delay=args.page_delay) as server:
+        base = server.url("/job")
+        host, rest = base.split("//", 1)[1].split("/", 1)
+        variants = [
+            f"{base}?b=2&a=1",
+            f"{base}/?a=1&b=2&utm_source=newsletter",
+            f"http://{host.upper()}/{rest}?a=1&b=2#apply",
+            f"{base}?a=1&gclid=xyz&b=2",
+        ]
+        assert len({normalize_url(url) for url in variants}) == 1, [normalize_url(url) for url in variants]
+        urls = [variants[i % len(variants)] for i in range(args.sessions)]
+
+        print(f"{'':>22} {'seconds':>8} {'server requests':>16}")
+        requests_before = server.job_requests
+        texts, elapsed = concurrently(fetch_job_description, urls)
+        print(f"{'no cache':>22} {elapsed:>8.2f} {server.job_requests - requests_before:>16}")
+
+        cache = JobDescriptionCache(ttl_seconds=1.0)
+        requests_before = server.job_requests
+        cached, elapsed = concurrently(cache.get, urls)
+        assert cached == texts, "cached text differs from a direct fetch"
+        print(f"{'cache, cold':>22} {elapsed:>8.2f} {server.job_requests - requests_before:>16}")
+
+        requests_before = server.job_requests
+        timings = []
+        for i in range(args.hits):
+            started = time.perf_counter()
+            cache.get(urls[i % len(urls)])
+            timings.append((time.perf_counter() - started) * 1e6)
+        print(f"{'cache, warm':>22} {'':>8} {server.job_requests - requests_before:>16}"
+              f"   ({args.hits} loads, p50 {statistics.median(timings):.1f} us)")
+
+        time.sleep(cache.ttl_seconds)
+        requests_before, not_modified = server.job_requests, server.not_modified
+        revalidated, elapsed = concurrently(cache.get, urls)
+        assert revalidated == texts
+        print(f"{'cache, after TTL':>22} {elapsed:>8.2f} {server.job_requests - requests_before:>16}"
+              f"   ({server.not_modified - not_modified} answered 304 Not Modified)")
+        print(f"cache stats: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Job description loading: direct HTTP fetch versus WebScraperCrew.
+
+Serves a generated job posting (navigation, scripts, cookie banner and
+footer around an <article>) from a local stand-in HTTP server, plus pages
+that are slow, oversized or missing. It checks that the fetcher keeps the
+posting and drops the page chrome, honours the timeout and size cap, and
+falls back to the crew on errors. It then times repeated loads with the
+pooled session, with a new connection per request, and through
+WebScraperCrew against the mock LLM endpoint.
+
+    python -m benchmarks.bench_jd_fetch --requests 200
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from benchmarks.mock_llm_server import MockLLMServer
+
+POSTING = (
+    "<h1>Senior Python Engineer</h1>"
+    "<p>We build data-heavy backend services on AWS.</p>"
+    "<h2>Requirements</h2><ul>"
+    + "".join(f"<li>{item}</li>" for item in [
+        "5+ years of Python", "REST APIs", "PostgreSQL", "Docker and Kubernetes", "CI/CD pipelines",
+    ])
+    + "</ul><h2>Nice to have</h2><p>Kafka, Terraform, machine learning pipelines.</p>"
+    + "<p>" + "Our team owns the ingestion platform end to end. " * 20 + "</p>"
+)
+CHROME = (
+    "<nav>" + "".join(f"<a href='/{i}'>Menu item {i}</a>" for i in range(200)) + "</nav>"
+    "<div class='cookie' aria-hidden='true'>We use cookies</div>"
+    "<script>" + "window.__STATE__ = {};" * 2000 + "</script>"
+    "<style>" + ".a{color:red}" * 2000 + "</style>"
+)
+PAGE = (
+    f"<!doctype html><html><head><title>Job</title></head><body>{CHROME}"
+    f"<main><article>{POSTING}</article></main>"
+    "<footer>Copyright Example Corp. Privacy. Terms.</footer></body></html>"
+).encode("utf-8")
+
+
+class StandInServer:
+    """Local HTTP server standing in for job boards."""
+
+    ETAG = '"posting-v1"'
+    LAST_MODIFIED = "Mon, 05 Jan 2026 09:00:00 GMT"
+
+    def __init__(self, slow_seconds=3.0, huge_mb=20, job_delay=0.0):
+        self.connections = 0
+        self.huge_bytes_sent = 0
+        self.job_requests = 0
+        self.not_modified = 0
+        self.job_delay = job_delay
+        self._lock = threading.Lock()
+        self.slow_seconds = slow_seconds
+        self.huge_mb = huge_mb
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+
+    def url(self, path):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def _send(self, status, body, content_type="text/html; charset=utf-8", headers=()):
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", content_type)
+                    for name, value in headers:
+                        self.send_header(name, value)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # the client gave up, e.g. after its timeout
+
+            def do_GET(self):
+                if self.path.split("?")[0].rstrip("/") == "/job":
+                    with server._lock:
+                        server.job_requests += 1
+                    time.sleep(server.job_delay)
+                    validators = [("ETag", server.ETAG), ("Last-Modified", server.LAST_MODIFIED)]
+                    if self.headers.get("If-None-Match") == server.ETAG:
+                        with server._lock:
+                            server.not_modified += 1
+                        self._send(304, b"", headers=validators)
+                    else:
+                        self._send(200, PAGE, headers=validators)
+                elif self.path == "/slow":
+                    time.sleep(server.slow_seconds)
+                    self._send(200, PAGE)
+                elif self.path == "/huge":
+                    chunk = b"<p>" + b"x" * 65530 + b"</p>"
+                    total = server.huge_mb * 1024 * 1024 // len(chunk)
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/html")
+                    self.send_header("Content-Length", str(total * len(chunk)))
+                    self.end_headers()
+                    try:
+                        for _ in range(total):
+                            self.wfile.write(chunk)
+                            with server._lock:
+                                server.huge_bytes_sent += len(chunk)
+                    except (BrokenPipeError, ConnectionResetError):
+                        pass
+                else:
+                    self._send(404, b"not found")
+
+        return Handler
+
+
+def check(stand_in):
+    from src.ats.utils.jobFetcher import fetch_job_description
+
+    text = fetch_job_description(stand_in.url("/job"))
+    assert "Senior Python Engineer" in text and "5+ years of Python" in text, text[:200]
+    for chrome in ["Menu item", "__STATE__", "color:red", "cookies", "Copyright"]:
+        assert chrome not in text, f"page chrome {chrome!r} left in the job description"
+    print(f"extraction: {len(PAGE) // 1024} KB page -> {len(text)} characters of posting text")
+
+    os.environ["ATS_JD_FETCH_TIMEOUT"] = "1"
+    started = time.perf_counter()
+    try:
+        fetch_job_description(stand_in.url("/slow"))
+        raise AssertionError("slow page did not time out")
+    except requests.Timeout:
+        print(f"timeout: slow page abandoned after {time.perf_counter() - started:.2f}s")
+    del os.environ["ATS_JD_FETCH_TIMEOUT"]
+
+    text = fetch_job_description(stand_in.url("/huge"))
+    time.sleep(0.2)  # let the server notice the closed connection
+    print(f"size cap: {stand_in.huge_mb} MB page -> {len(text)} characters returned, "
+          f"{stand_in.huge_bytes_sent / 1024 / 1024:.1f} MB sent before the client closed")
+    assert len(text) <= int(os.getenv("ATS_JD_MAX_CHARS", 20000))
+
+
+def timed(function, n):
+    timings = []
+    for _ in range(n):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), statistics.quantiles(timings, n=100)[98] if n > 1 else timings[0]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--crew-requests", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.5, help="Mock LLM latency per call in seconds")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory, StandInServer() as stand_in, MockLLMServer(latency=args.latency) as llm:
+        # Run from a temp dir so email_responses/ and other flow output stay out of the repo
+        os.chdir(directory)
+        os.environ["OPENAI_BASE_URL"] = os.environ["OPENAI_API_BASE"] = llm.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+        os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+        os.environ["ATS_LLM_CACHE"] = "0"
+        # Measure the LLM path, not the provider budget of the rate-limit scheduler
+        os.environ.setdefault("ATS_LLM_RPM", "100000")
+        os.environ.setdefault("ATS_LLM_TPM", "100000000")
+
+        from src.ats.main import load_job_description
+        from src.ats.utils.jobFetcher import fetch_job_description, html_to_text
+
+        check(stand_in)
+
+        calls = llm.requests
+        text = load_job_description(stand_in.url("/missing"))
+        assert llm.requests > calls and text, "a missing page should fall back to WebScraperCrew"
+        print("fallback: 404 page loaded through WebScraperCrew")
+
+        url = stand_in.url("/job")
+        rows = []
+        connections = stand_in.connections
+        rows.append(("pooled session", *timed(lambda: fetch_job_description(url), args.requests),
+                     stand_in.connections - connections))
+        connections = stand_in.connections
+        rows.append(("new connection", *timed(lambda: html_to_text(requests.get(url, timeout=10).text), args.requests),
+                     stand_in.connections - connections))
+        os.environ["ATS_JD_FETCHER"] = "crew"
+        connections = stand_in.connections
+        rows.append(("WebScraperCrew", *timed(lambda: load_job_description(url), args.crew_requests),
+                     stand_in.connections - connections))
+        del os.environ["ATS_JD_FETCHER"]
+
+        print(f"{'path':>15} {'p50 ms':>9} {'p99 ms':>9} {'connections':>12}")
+        for name, p50, p99, opened in rows:
+            print(f"{name:>15} {p50:>9.1f} {p99:>9.1f} {opened:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+spaCy work of RewriteResumeTool: per-call parsing versus the keyword engine.
+
+Rewrites N resumes against one job description for three iterations, as
+ImproveResumeFlow does. The reference parses the JD, the resume and each
+enriched section with a separate nlp() call every time, as the tool used
+to; the tool now memoizes JD keywords and batches sections with nlp.pipe.
+Both produce the same rewritten resumes.
+
+    python -m benchmarks.bench_keyword_engine --resumes 50 --batch-size 32
+"""
+import argparse
+import os
+import random
+import time
+
+from src.ats.crews.rewrite_resume_crew.tools.rewrite_resume_tool import RewriteResumeTool
+from src.ats.utils.keywordEngine import get_keyword_memo
+from src.ats.utils.spacyModel import get_nlp
+
+JOB_DESCRIPTION = (
+    "Senior Python Engineer. We build data-heavy backend services on AWS. "
+    "Requirements: 5+ years of Python, REST APIs, PostgreSQL, Docker, Kubernetes, CI/CD. "
+    "Nice to have: Kafka, Terraform, machine learning pipelines. "
+) * 4
+
+WORDS = (
+    "python django postgresql docker kubernetes aws led team built service platform pipeline data "
+    "customers product features reliability production api backend improved latency reduced cost"
+).split()
+
+
+def make_resume(rng):
+    def sentences(n):
+        return " ".join(" ".join(rng.choice(WORDS) for _ in range(10)).capitalize() + "." for _ in range(n))
+
+    return (
+        f"Summary\n{sentences(3)}\n\nSkills\n{', '.join(rng.sample(WORDS, 6))}\n\n"
+        f"Experience\n{sentences(12)}\n\nEducation\nBSc Computer Science"
+    )
+
+
+class ReferenceTool(RewriteResumeTool):
+    """The tool's previous spaCy usage: one nlp() call per JD, resume and section."""
+
+    def _check_missing_keywords(self, resume_text, jd_text):
+        nlp = get_nlp()
+        jd_keywords = {
+            token.lemma_.lower()
+            for token in nlp(jd_text)
+            if token.pos_ in {"NOUN", "PROPN", "ADJ", "VERB"} and not token.is_stop
+        }
+        return jd_keywords - {token.lemma_ for token in nlp(resume_text.lower()) if not token.is_stop}
+
+    def _insert_keywords_contextually(self, resume, missing_keywords):
+        injected, rewritten = set(), []
+        for header, content in self._split_sections(resume):
+            section_lower = header.lower()
+            if section_lower in {"summary", "objective", "professional summary", "experience", "work experience"}:
+                sentences = [sent.text for sent in get_nlp()(content).sents]
+                enriched = self._enrich_section(sentences, missing_keywords, injected)
+            elif section_lower in {"skills"}:
+                enriched = self._add_to_comma_list(content, missing_keywords, injected)
+            else:
+                enriched = content
+            rewritten.append(f"{header}\n{enriched}")
+        return "\n\n".join(rewritten).strip()
+
+
+def rewrite_all(tool, resumes, iterations):
+    outputs = []
+    for _ in range(iterations):
+        outputs = [tool._run(resume, JOB_DESCRIPTION)["resume_data"] for resume in resumes]
+    return outputs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+    os.environ["ATS_SPACY_BATCH_SIZE"] = str(args.batch_size)
+
+    rng = random.Random(0)
+    resumes = [make_resume(rng) for _ in range(args.resumes)]
+    get_nlp()  # model load is not part of either measurement
+
+    timings = {}
+    for name, tool in [("per-call", ReferenceTool()), ("engine", RewriteResumeTool())]:
+        started = time.perf_counter()
+        outputs = rewrite_all(tool, resumes, args.iterations)
+        timings[name] = time.perf_counter() - started
+        if name == "per-call":
+            expected = outputs
+        else:
+            assert outputs == expected, "keyword engine output differs from the per-call reference"
+
+    memo = get_keyword_memo()
+    rewrites = args.resumes * args.iterations
+    for name, seconds in timings.items():
+        print(f"{name:>9} {seconds:>8.2f}s {rewrites / seconds:>8.1f} rewrites/s")
+    print(f"JD keyword memo: {memo.misses} parses, {memo.hits} hits")
+
+
+if __name__ == "__main__":
+    main()
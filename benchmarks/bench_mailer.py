@@ -0,0 +1,159 @@
+"""
+Candidate email delivery: one SMTP connection per email versus the pool.
+
+Starts a local aiosmtpd server (pip install aiosmtpd) that adds a delay to
+each new connection and each message, standing in for the round trips of
+connecting, EHLO, STARTTLS and login to a remote server. It sends N emails
+from coroutines, as write_and_save_emails does, in three ways:
+
+- per-email: the previous send_email, a new connection for every email,
+  called synchronously inside the coroutine
+- pool: send_email_async over SMTPPool, off the event loop
+- pool + drop: the same, with the server dropping every connection after
+  a few messages, so the pool has to reconnect
+
+It reports throughput, connections opened and the worst event loop lag
+seen by a ticker coroutine during the run.
+
+    python -m benchmarks.bench_mailer --emails 1000
+"""
+import argparse
+import asyncio
+import os
+import smtplib
+import socket
+import tempfile
+import threading
+import time
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import SMTP as SMTPServer
+
+from src.ats.utils.mailer import Mailer, SMTPPool, build_message
+
+
+class CountingHandler:
+    def __init__(self, message_delay):
+        self.message_delay = message_delay
+        self.messages = 0
+        self.lock = threading.Lock()
+
+    async def handle_DATA(self, server, session, envelope):
+        await asyncio.sleep(self.message_delay)
+        with self.lock:
+            self.messages += 1
+        return "250 OK"
+
+
+class StandInSMTP(SMTPServer):
+    """aiosmtpd server with a connection setup delay that can drop connections after some messages."""
+
+    connect_delay = 0.0
+    drop_after = 0
+    connections = 0
+
+    async def smtp_EHLO(self, hostname):
+        type(self).connections += 1
+        await asyncio.sleep(self.connect_delay)
+        self.messages_on_connection = 0
+        return await super().smtp_EHLO(hostname)
+
+    async def smtp_DATA(self, arg):
+        await super().smtp_DATA(arg)
+        self.messages_on_connection += 1
+        if self.drop_after and self.messages_on_connection >= self.drop_after:
+            self.transport.close()
+
+
+class StandInController(Controller):
+    def factory(self):
+        return StandInSMTP(self.handler)
+
+
+def old_send_email(file_path, to_email, host, port):
+    """send_email before the pool: connect, EHLO and send for every single email."""
+    msg = build_message(file_path, to_email, "hr@example.com")
+    with smtplib.SMTP(host, port) as server:
+        server.send_message(msg)
+
+
+async def run(send, files, concurrency):
+    lag = 0.0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal lag
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lag = max(lag, time.perf_counter() - started - 0.01)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def write_email(i, path):
+        async with semaphore:
+            await send(path, f"candidate{i}@example.com")
+
+    tick = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    await asyncio.gather(*(write_email(i, path) for i, path in enumerate(files)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await tick
+    return elapsed, lag
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--emails", type=int, default=1000)
+    parser.add_argument("--connect-delay", type=float, default=0.02, help="Server delay per new connection")
+    parser.add_argument("--message-delay", type=float, default=0.002, help="Server delay per message")
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--drop-after", type=int, default=25, help="Messages per connection in the reconnect run")
+    args = parser.parse_args()
+
+    StandInSMTP.connect_delay = args.connect_delay
+    handler = CountingHandler(args.message_delay)
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        host, port = probe.getsockname()
+    controller = StandInController(handler, hostname=host, port=port)
+    controller.start()
+
+    with tempfile.TemporaryDirectory() as directory:
+        files = []
+        for i in range(args.emails):
+            path = os.path.join(directory, f"candidate_{i}.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(f"Subject: Your application\nDear Candidate {i},\nThank you for applying.\nBest regards,\nHR Team")
+            files.append(path)
+
+        async def per_email(path, to_email):
+            old_send_email(path, to_email, host, port)
+
+        print(f"{'mode':>12} {'seconds':>8} {'emails/s':>9} {'connections':>12} {'max loop lag ms':>16}")
+        for name, drop_after in [("per-email", 0), ("pool", 0), ("pool + drop", args.drop_after)]:
+            StandInSMTP.drop_after = drop_after
+            connections, messages = StandInSMTP.connections, handler.messages
+            mailer = None
+            if name == "per-email":
+                send = per_email
+            else:
+                mailer = Mailer(SMTPPool(host, port, size=args.pool_size, starttls=False))
+
+                async def send(path, to_email, mailer=mailer):
+                    await mailer.send_async(build_message(path, to_email, "hr@example.com"))
+
+            elapsed, lag = asyncio.run(run(send, files, concurrency=args.pool_size * 2))
+            if mailer:
+                mailer.close()
+            delivered = handler.messages - messages
+            assert delivered == args.emails, f"{name}: {delivered} of {args.emails} emails delivered"
+            print(f"{name:>12} {elapsed:>8.2f} {args.emails / elapsed:>9.0f} "
+                  f"{StandInSMTP.connections - connections:>12} {lag * 1000:>16.1f}")
+
+    controller.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+LLM call metrics of an employer run.
+
+Runs LeadScoreFlow over N resumes against the mock LLM endpoint with the
+metrics enabled, then:
+
+- checks that the prompt and completion tokens recorded per call add up to
+  what the mock server billed
+- scrapes /metrics and prints the Prometheus series of the run's crews
+- prints the per-stage and per-crew p50/p95/p99 latencies of the run
+  summary written to ATS_METRICS_DIR
+- times LLMMetrics.record, the cost added to every call
+
+    python -m benchmarks.bench_metrics --resumes 40
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import urllib.request
+
+from benchmarks.mock_llm_server import MockLLMServer
+
+
+def resumes(n):
+    return [
+        {"id": str(i), "content": f"Name: Person {i}\nEmail: person{i}@example.com\n"
+                                  f"Python developer, {i % 12} years with Django, AWS, Docker and SQL."}
+        for i in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory, MockLLMServer(latency=args.latency, jitter=args.jitter) as llm:
+        # Run from a temp dir so email_responses/ and other flow output stay out of the repo
+        os.chdir(directory)
+        os.environ["OPENAI_BASE_URL"] = os.environ["OPENAI_API_BASE"] = llm.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+        os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+        os.environ["ATS_LLM_CACHE"] = "0"
+        # Measure the LLM calls, not the provider budget of the rate-limit scheduler
+        os.environ.setdefault("ATS_LLM_RPM", "100000")
+        os.environ.setdefault("ATS_LLM_TPM", "100000000")
+        os.environ["ATS_CHECKPOINT"] = os.environ["ATS_RESULTS"] = "0"
+        os.environ["ATS_OUTBOX_WORKER"] = "0"
+        os.environ["ATS_OUTBOX_PATH"] = os.path.join(directory, "outbox.sqlite3")
+        os.environ["ATS_METRICS_DIR"] = os.path.join(directory, "metrics")
+        os.environ["ATS_METRICS_PORT"] = "0"  # any free port
+
+        from src.ats.main import LeadScoreFlow
+        from src.ats.utils import llmMetrics
+
+        metrics = llmMetrics.get_llm_metrics()
+        flow = LeadScoreFlow()
+        flow.reset()
+        flow.kickoff(inputs={"run_id": "bench-metrics", "jd": "Senior Python developer with Django, AWS and Docker.",
+                             "candidate_resumes": resumes(args.resumes)})
+
+        with open(os.path.join(directory, "metrics", "bench-metrics.json")) as f:
+            summary = json.load(f)
+        with urllib.request.urlopen(f"{llmMetrics._server.url}/metrics") as response:
+            exposition = response.read().decode("utf-8")
+        billed = (llm.prompt_tokens, llm.completion_tokens)
+
+    recorded = (summary["prompt_tokens"], summary["completion_tokens"])
+    print(f"\n{summary['calls']} calls, tokens recorded {recorded}, billed by the server {billed}, "
+          f"cost ${summary['cost_usd']:.4f}")
+    assert recorded == billed, "every call's tokens are accounted for"
+
+    print("\n" + "\n".join(line for line in exposition.splitlines()
+                           if line.startswith(("ats_llm_calls_total", "ats_llm_prompt_tokens_total"))))
+
+    for group in ["by_stage", "by_crew"]:
+        print(f"\n{group[3:]:>28} {'calls':>6} {'tokens':>8} {'p50':>7} {'p95':>7} {'p99':>7} {'queue p95':>10}")
+        for name, row in summary[group].items():
+            latency = row["latency_seconds"]
+            print(f"{name:>28} {row['calls']:>6} {row['prompt_tokens'] + row['completion_tokens']:>8} "
+                  f"{latency['p50']:>7.3f} {latency['p95']:>7.3f} {latency['p99']:>7.3f} "
+                  f"{row['queue_wait_seconds']['p95']:>10.3f}")
+    print(f"\ncandidates with their own accounting: {len(summary['by_candidate'])}")
+
+    overhead = llmMetrics.LLMMetrics()
+    n = 100000
+    started = time.perf_counter()
+    for i in range(n):
+        overhead.record("LeadScoreCrew", seconds=0.5, queue_seconds=0.01, prompt_tokens=800, completion_tokens=60,
+                        tags={"flow": "LeadScoreFlow", "stage": "score_leads", "run_id": "r", "candidate_id": str(i)})
+    print(f"LLMMetrics.record: {(time.perf_counter() - started) / n * 1e6:.1f} us per call")
+
+
+if __name__ == "__main__":
+    main()
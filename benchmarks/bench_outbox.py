@@ -0,0 +1,177 @@
+"""
+Candidate emails through the durable outbox versus sending inline.
+
+Uses the aiosmtpd stand-in of bench_mailer (pip install aiosmtpd), which
+here also answers a share of messages with "451 try again later".
+
+1. A flow writes N emails from coroutines and either sends each one inline
+   (send_email_async) or queues it (queue_email_async). Reports how long the
+   flow takes to return, how long until everything is delivered, and how
+   many emails are lost to the temporary failures.
+2. A process queues N emails and is killed (SIGKILL) while its worker is
+   delivering them. A new outbox on the same file delivers the rest; the
+   server counts distinct Message-IDs to show nothing is lost and how many
+   were sent twice.
+
+    python -m benchmarks.bench_outbox --emails 500 --fail-rate 0.1
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import tempfile
+import threading
+import time
+from email import message_from_bytes
+
+from benchmarks.bench_mailer import StandInController, StandInSMTP
+from src.ats.utils.mailer import Mailer, SMTPPool
+
+
+class FlakyHandler:
+    """Accepts messages after a delay, rejecting a share of them with a temporary 451."""
+
+    def __init__(self, message_delay, fail_rate, seed=7):
+        self.message_delay = message_delay
+        self.fail_rate = fail_rate
+        self.random = random.Random(seed)
+        self.messages = 0
+        self.rejected = 0
+        self.message_ids = set()
+        self.lock = threading.Lock()
+
+    async def handle_DATA(self, server, session, envelope):
+        await asyncio.sleep(self.message_delay)
+        with self.lock:
+            if self.random.random() < self.fail_rate:
+                self.rejected += 1
+                return "451 4.3.0 Try again later"
+            self.messages += 1
+            self.message_ids.add(message_from_bytes(envelope.content)["Message-ID"])
+        return "250 OK"
+
+    def reset(self):
+        with self.lock:
+            self.messages = self.rejected = 0
+            self.message_ids = set()
+
+
+def configure(host, port, outbox_path, pool_size):
+    os.environ.update({
+        "ATS_SMTP_HOST": host,
+        "ATS_SMTP_PORT": str(port),
+        "ATS_SMTP_STARTTLS": "0",
+        "ATS_SMTP_POOL_SIZE": str(pool_size),
+        "ATS_OUTBOX_PATH": outbox_path,
+        "ATS_OUTBOX_RETRY_DELAY": "0.05",
+        "ATS_OUTBOX_LEASE": "1",
+        "EMAIL_ADDRESS": "hr@example.com",
+    })
+    os.environ.pop("EMAIL_PASSWORD", None)
+
+
+def write_files(directory, n, prefix):
+    files = []
+    for i in range(n):
+        path = os.path.join(directory, f"{prefix}_{i}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"Subject: Your application\nDear Candidate {i},\nThank you for applying.\nBest regards,\nHR Team")
+        files.append(path)
+    return files
+
+
+async def flow(send, files, prefix):
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        send(path, f"candidate{i}@example.com", f"{prefix}-{i}") for i, path in enumerate(files)
+    ))
+    return time.perf_counter() - started
+
+
+def queue_and_die(host, port, outbox_path, pool_size, files):
+    """Child process: queue every email, start delivering, and wait to be killed."""
+    configure(host, port, outbox_path, pool_size)
+    from src.ats.utils.candidateUtils import queue_email_async
+
+    asyncio.run(flow(queue_email_async, files, "restart"))
+    time.sleep(3600)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--emails", type=int, default=500)
+    parser.add_argument("--connect-delay", type=float, default=0.02, help="Server delay per new connection")
+    parser.add_argument("--message-delay", type=float, default=0.01, help="Server delay per message")
+    parser.add_argument("--fail-rate", type=float, default=0.1, help="Share of messages answered with 451")
+    parser.add_argument("--pool-size", type=int, default=4)
+    args = parser.parse_args()
+
+    StandInSMTP.connect_delay = args.connect_delay
+    handler = FlakyHandler(args.message_delay, args.fail_rate)
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        host, port = probe.getsockname()
+    controller = StandInController(handler, hostname=host, port=port)
+    controller.start()
+
+    with tempfile.TemporaryDirectory() as directory:
+        configure(host, port, os.path.join(directory, "outbox.sqlite3"), args.pool_size)
+        from src.ats.utils import candidateUtils, mailer
+        from src.ats.utils.emailOutbox import EmailOutbox, get_email_outbox
+
+        files = write_files(directory, args.emails, "candidate")
+        print(f"{'mode':>8} {'flow returns s':>15} {'all delivered s':>16} {'delivered':>10} {'lost':>6}")
+
+        handler.reset()
+        with contextlib.redirect_stdout(io.StringIO()):  # one "Error sending" line per lost email
+            elapsed = asyncio.run(flow(lambda path, to, key: candidateUtils.send_email_async(path, to), files, "inline"))
+        print(f"{'inline':>8} {elapsed:>15.2f} {elapsed:>16.2f} {handler.messages:>10} {args.emails - handler.messages:>6}")
+        mailer.get_mailer().close()
+        mailer._mailer = None
+
+        handler.reset()
+        started = time.perf_counter()
+        returned = asyncio.run(flow(candidateUtils.queue_email_async, files, "outbox"))
+        outbox = get_email_outbox()
+        assert outbox.drain(timeout=120), outbox.stats()
+        delivered_after = time.perf_counter() - started
+        print(f"{'outbox':>8} {returned:>15.2f} {delivered_after:>16.2f} {handler.messages:>10} "
+              f"{args.emails - handler.messages:>6}   ({handler.rejected} temporary failures retried)")
+        outbox.stop()
+
+        # Crash in the middle of delivery, then restart on the same outbox file
+        restart_path = os.path.join(directory, "restart.sqlite3")
+        handler.reset()
+        child = multiprocessing.get_context("spawn").Process(
+            target=queue_and_die, args=(host, port, restart_path, args.pool_size, files)
+        )
+        child.start()
+        while handler.messages < args.emails // 2:
+            time.sleep(0.01)
+        os.kill(child.pid, signal.SIGKILL)
+        child.join()
+        before_restart = handler.messages
+
+        restarted = EmailOutbox(restart_path, send=Mailer(SMTPPool(host, port, size=args.pool_size, starttls=False)).send,
+                                base_delay=0.05, lease_seconds=1)
+        print(f"\nkilled after {before_restart} deliveries; outbox on disk: {restarted.stats()}")
+        started = time.perf_counter()
+        restarted.start(workers=args.pool_size)
+        assert restarted.drain(timeout=120), restarted.stats()
+        distinct = len(handler.message_ids)
+        print(f"restarted outbox delivered the rest in {time.perf_counter() - started:.2f}s: "
+              f"{distinct} of {args.emails} distinct emails received, "
+              f"{handler.messages - distinct} sent twice (in flight when the process died)")
+        assert distinct == args.emails
+        restarted.stop()
+
+    controller.stop()
+
+
+if __name__ == "__main__":
+    main()
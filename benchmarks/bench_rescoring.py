@@ -0,0 +1,95 @@
+"""
+Rescoring after reviewer feedback: every candidate versus incremental.
+
+Scores N candidates with LeadScoreFlow.score_leads against the mock LLM
+endpoint, then gives feedback (as human_in_the_loop does) and runs
+score_leads again with ATS_RESCORE=all and with the default incremental
+mode, which only rescores the top ATS_RESCORE_TOP_N candidates and those
+within ATS_RESCORE_BAND points of the shortlist cutoff. Reports the LLM
+calls of the feedback pass, the number of score entries kept, and whether
+any candidate the full rescore shortlisted was skipped by the incremental
+one.
+
+    python -m benchmarks.bench_rescoring --candidates 100
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks.mock_llm_server import TECH_TERMS, MockLLMServer
+
+JOB_DESCRIPTION = "Senior Python Engineer: PostgreSQL, Docker, Kubernetes, AWS, Kafka, Terraform, CI/CD, REST APIs."
+
+
+def inputs(n):
+    from src.ats.types import Candidate
+
+    resumes, candidates = [], []
+    for i in range(n):
+        # Scores spread with the number of job description terms in the resume
+        skills = ", ".join(TECH_TERMS[:i % (len(TECH_TERMS) + 1)])
+        resumes.append({"id": str(i), "content": f"Engineer {i}. Experience: {skills or 'support'}."})
+        candidates.append(Candidate(id=str(i), name=f"Candidate {i}", email=f"c{i}@example.com",
+                                    bio="", years_of_exp="5", skills=skills))
+    return resumes, candidates
+
+
+async def session(n, mode, llm):
+    from src.ats.main import LeadScoreFlow
+
+    os.environ["ATS_RESCORE"] = mode
+    flow = LeadScoreFlow()
+    resumes, candidates = inputs(n)
+    flow.state.jd, flow.state.candidate_resumes, flow.state.candidates = JOB_DESCRIPTION, resumes, candidates
+    await flow.score_leads()
+    first = dict(flow.state.candidate_score)
+
+    flow.state.scored_leads_feedback = "Weigh Kubernetes and Terraform experience more."
+    flow.state.feedback_revision += 1
+    calls, started = llm.completed["score"], time.perf_counter()
+    await flow.score_leads()
+    rescored = {i for i, revision in flow.state.score_revisions.items() if revision == flow.state.feedback_revision}
+    return flow, first, rescored, llm.completed["score"] - calls, time.perf_counter() - started
+
+
+def shortlist(scores, size=3):
+    return [score.id for score in sorted(scores.values(), key=lambda score: score.score, reverse=True)[:size]]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--candidates", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory, MockLLMServer(latency=args.latency) as llm:
+        # Run from a temp dir so email_responses/ and other flow output stay out of the repo
+        os.chdir(directory)
+        os.environ["OPENAI_BASE_URL"] = os.environ["OPENAI_API_BASE"] = llm.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+        os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+        os.environ["ATS_LLM_CACHE"] = "0"
+        # Measure the LLM calls, not the provider budget of the rate-limit scheduler
+        os.environ.setdefault("ATS_LLM_RPM", "100000")
+        os.environ.setdefault("ATS_LLM_TPM", "100000000")
+        os.environ["ATS_CHECKPOINT"] = os.environ["ATS_RESULTS"] = "0"
+
+        print(f"{'mode':>12} {'feedback calls':>15} {'seconds':>8} {'score entries':>14}   shortlist")
+        full_shortlist = None
+        for mode in ["all", "incremental"]:
+            flow, first, rescored, calls, seconds = asyncio.run(session(args.candidates, mode, llm))
+            assert len(flow.state.candidate_score) == args.candidates
+            top = shortlist(flow.state.candidate_score)
+            print(f"{mode:>12} {calls:>15} {seconds:>8.2f} {len(flow.state.candidate_score):>14}   {top}")
+            if mode == "all":
+                full_shortlist = top
+            else:
+                missed = [i for i in full_shortlist if i not in rescored]
+                print(f"candidates the full rescore shortlisted that were not rescored: {missed or 'none'}; "
+                      f"first-pass shortlist {shortlist(first)}")
+
+
+if __name__ == "__main__":
+    main()
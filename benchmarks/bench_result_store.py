@@ -0,0 +1,110 @@
+"""
+Employer run results: shared CSV rewrites versus the run-scoped result store.
+
+Simulates R concurrent runs of N candidates each. Every candidate produces
+an extracted profile, a filter decision and a score as it is processed:
+
+- csv: the previous behaviour, the stage's full list is rewritten into
+  candidates_info.csv, filtered_candidates.csv and scored_candidates.csv
+  in a shared directory at the end of each stage
+- store: rows are appended to the run's buffered RunResults as they are
+  produced and flushed at the end of each stage
+
+Reports wall time and what survives on disk: with CSVs only the last run
+to finish a stage is left, while the store keeps every run and answers
+per-run queries.
+
+    python -m benchmarks.bench_result_store --runs 8 --candidates 2000
+"""
+import argparse
+import csv
+import os
+import tempfile
+import threading
+import time
+
+from src.ats.types import Candidate, CandidateFilter, CandidateScore
+from src.ats.utils.resultStore import ResultStore
+
+
+def make_rows(run, n):
+    for i in range(n):
+        candidate = Candidate(
+            id=str(i), name=f"Candidate {run}-{i}", email=f"c{run}-{i}@example.com",
+            bio="Backend engineer with Python and AWS experience. " * 6, years_of_exp=str(i % 15),
+            skills="Python, SQL, Docker, Kubernetes, AWS",
+        )
+        result = "Pass" if i % 3 else "Fail"
+        yield (candidate,
+               CandidateFilter(id=candidate.id, name=candidate.name, email=candidate.email, result=result, reason="Skills match"),
+               CandidateScore(id=candidate.id, score=40 + i % 60, reason="Relevant experience") if result == "Pass" else None)
+
+
+def csv_run(directory, run, n):
+    candidates, filters, scores = [], [], []
+    for candidate, candidate_filter, score in make_rows(run, n):
+        candidates.append(candidate)
+        filters.append(candidate_filter)
+        if score:
+            scores.append(score)
+    for name, header, rows in [
+        ("candidates_info.csv", ["id", "name", "email", "bio", "years_of_exp", "skills"],
+         [[c.id, c.name, c.email, c.bio, c.years_of_exp, c.skills] for c in candidates]),
+        ("filtered_candidates.csv", ["id", "result", "reason"], [[f.id, f.result, f.reason] for f in filters]),
+        ("scored_candidates.csv", ["id", "score", "reason"], [[s.id, s.score, s.reason] for s in scores]),
+    ]:
+        with open(os.path.join(directory, name), "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+
+
+def store_run(store, run, n):
+    results = store.run(f"run-{run}", "LeadScoreFlow")
+    for candidate, candidate_filter, score in make_rows(run, n):
+        results.add_candidates([candidate])
+        results.add_filters([candidate_filter])
+        if score:
+            results.add_scores([score])
+    results.finish()
+
+
+def concurrently(function, runs):
+    threads = [threading.Thread(target=function, args=(run,)) for run in range(runs)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=8)
+    parser.add_argument("--candidates", type=int, default=2000)
+    parser.add_argument("--buffer", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        elapsed = concurrently(lambda run: csv_run(directory, run, args.candidates), args.runs)
+        with open(os.path.join(directory, "candidates_info.csv"), newline="") as f:
+            names = {row["name"].rsplit("-", 1)[0] for row in csv.DictReader(f)}
+        print(f"csv:   {elapsed:.2f}s, runs left on disk: {len(names)} of {args.runs}")
+
+        store = ResultStore(os.path.join(directory, "results.sqlite3"), buffer_size=args.buffer)
+        elapsed = concurrently(lambda run: store_run(store, run, args.candidates), args.runs)
+        runs = store.runs()
+        assert len(runs) == args.runs and all(run["finished_at"] for run in runs)
+        for run in runs:
+            assert len(store.candidates(run["run_id"])) == args.candidates
+        started = time.perf_counter()
+        top = store.lead_scores("run-3")[:3]
+        query_ms = (time.perf_counter() - started) * 1000
+        print(f"store: {elapsed:.2f}s, runs left on disk: {len(runs)} of {args.runs}, "
+              f"{os.path.getsize(store.path) / 1024 / 1024:.1f} MB")
+        print(f"lead_scores for one run in {query_ms:.1f} ms, top: {[(r['name'], r['score']) for r in top]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Bulk resume text extraction: sequential versus the process pool.
+
+Generates a corpus of PDF and DOCX resumes in memory and extracts them one
+at a time (as app.py used to) and with extract_resume_texts.
+
+    python -m benchmarks.bench_resume_extraction --files 500
+"""
+import argparse
+import io
+import os
+import random
+import time
+
+import docx
+import fitz
+
+from src.ats.utils.candidateUtils import DOCX_TYPES, extract_resume_text, extract_resume_texts
+
+WORDS = (
+    "python django postgresql docker kubernetes aws led team built service platform pipeline data "
+    "customers product features reliability production api backend improved latency reduced cost"
+).split()
+
+
+def _lines(rng, n):
+    return [" ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(n)]
+
+
+def make_pdf(rng, pages):
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page()
+        page.insert_text((50, 60), "\n".join(_lines(rng, 45)), fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def make_docx(rng, pages):
+    document = docx.Document()
+    for line in _lines(rng, 45 * pages):
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def corpus(n, pages, seed=0):
+    rng = random.Random(seed)
+    files = []
+    for i in range(n):
+        if i % 2:
+            files.append((make_docx(rng, pages), DOCX_TYPES[0]))
+        else:
+            files.append((make_pdf(rng, pages), "application/pdf"))
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--workers", default=None, help="Comma-separated pool sizes (default: all cores)")
+    args = parser.parse_args()
+
+    files = corpus(args.files, args.pages)
+    size = sum(len(data) for data, _ in files) / 1e6
+    print(f"{args.files} files ({args.pages} pages each, {size:.1f} MB), {os.cpu_count()} cores")
+
+    started = time.perf_counter()
+    expected = [extract_resume_text(data, content_type) for data, content_type in files]
+    elapsed = time.perf_counter() - started
+    print(f"{'sequential':>12} {elapsed:>8.2f}s {args.files / elapsed:>8.1f} files/s")
+
+    for workers in [int(w) for w in args.workers.split(",")] if args.workers else [os.cpu_count()]:
+        started = time.perf_counter()
+        texts = extract_resume_texts(files, max_workers=workers)
+        elapsed = time.perf_counter() - started
+        assert texts == expected, "pool results differ from sequential extraction"
+        print(f"{f'pool x{workers}':>12} {elapsed:>8.2f}s {args.files / elapsed:>8.1f} files/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Latency of the CandidateScoreFlow parse stage: tool-only versus ResumeParserCrew.
+
+Parses the same generated resumes with ATS_RESUME_PARSE_MODE=tool (straight
+from ResumeParserTool to ResumeData) and =llm (the crew, against the local
+mock LLM endpoint). The parse cache is off so every file is read and parsed.
+
+    python -m benchmarks.bench_resume_parse --resumes 20 --latency 0.5
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import fitz
+
+from benchmarks.mock_llm_server import MockLLMServer
+
+SKILLS = ["Python", "SQL", "Docker", "AWS", "Kubernetes", "PostgreSQL", "Terraform", "Kafka"]
+
+
+def make_resume(rng, i):
+    lines = [
+        f"Candidate {i}",
+        f"candidate{i}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        "Summary",
+        f"Backend engineer with {rng.randint(1, 12)} years of experience building Python services.",
+        "Skills",
+        ", ".join(rng.sample(SKILLS, 5)),
+        "Experience",
+        "Senior Engineer | Acme | 2020 - 2024",
+        "- Built data pipelines and REST APIs",
+        "Engineer | Initech | 2016 - 2020",
+        "- Maintained PostgreSQL schemas",
+        "Education",
+        "BSc Computer Science",
+    ]
+    doc = fitz.open()
+    doc.new_page().insert_text((50, 60), "\n".join(lines), fontsize=10)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.5, help="Mock LLM latency per call in seconds")
+    args = parser.parse_args()
+
+    with MockLLMServer(latency=args.latency) as server, tempfile.TemporaryDirectory() as directory:
+        # Run from a temp dir so email_responses/ and other flow output stay out of the repo
+        os.chdir(directory)
+        os.environ["OPENAI_BASE_URL"] = os.environ["OPENAI_API_BASE"] = server.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+        os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+        os.environ["ATS_LLM_CACHE"] = "0"
+        # Measure the LLM path, not the provider budget of the rate-limit scheduler
+        os.environ.setdefault("ATS_LLM_RPM", "100000")
+        os.environ.setdefault("ATS_LLM_TPM", "100000000")
+        os.environ["ATS_PARSE_CACHE"] = "0"
+
+        from src.ats.main import parse_resume_file
+
+        rng = random.Random(0)
+        paths = []
+        for i in range(args.resumes):
+            path = os.path.join(directory, f"resume_{i}.pdf")
+            with open(path, "wb") as f:
+                f.write(make_resume(rng, i))
+            paths.append(path)
+
+        print(f"{'mode':>5} {'p50 ms':>9} {'max ms':>9} {'LLM calls':>10}")
+        for mode in ["tool", "llm"]:
+            os.environ["ATS_RESUME_PARSE_MODE"] = mode
+            requests, timings = server.requests, []
+            for path in paths:
+                started = time.perf_counter()
+                resume = parse_resume_file(path)
+                timings.append((time.perf_counter() - started) * 1000)
+                assert resume.email.endswith("@example.com"), resume
+            print(f"{mode:>5} {statistics.median(timings):>9.1f} {max(timings):>9.1f} {server.requests - requests:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Fuzz and scaling checks for the ResumeParserTool section segmenter.
+
+1. Fuzz: random resumes built from headers, keywords, bullets, pipes and
+   blank lines are segmented by split_sections and by the previous
+   per-keyword regex implementation (kept below as the reference); every
+   section must come out identical.
+2. Scaling: adversarial inputs from 16 KB up to 2 MB (long pipe runs,
+   whitespace runs, characters that look like an email or a year count,
+   thousands of headers) go through the whole _extract_field. Time should
+   roughly double with the input size. The previous implementation is timed
+   on the smallest inputs for comparison; it is quadratic on several of them.
+
+    python -m benchmarks.bench_resume_sections --fuzz 2000 --max-mb 2
+"""
+import argparse
+import random
+import re
+import time
+
+from src.ats.crews.resume_parser_crew.tools.resume_parser_tool import (
+    ALL_HEADERS,
+    SECTION_KEYWORDS,
+    ResumeParserTool,
+    split_sections,
+)
+
+
+def reference_extract_section(text, section_keywords, all_headers):
+    """The per-keyword implementation split_sections replaced, verbatim."""
+    headers_pattern = '|'.join([re.escape(h) for h in all_headers])
+    for keyword in section_keywords:
+        pattern = re.compile(rf'({keyword})\s*\n', flags=re.IGNORECASE)
+        match = pattern.search(text)
+        if match:
+            start_idx = match.start()
+            next_header_pattern = re.compile(
+                rf'\n\s*({headers_pattern})\s*[:\-]?\s*\n',
+                flags=re.IGNORECASE
+            )
+            next_match = next_header_pattern.search(text, pos=match.end())
+            end_idx = next_match.start() if next_match else len(text)
+            return text[start_idx:end_idx].strip()
+    return "Not found"
+
+
+def reference_split_experience_entries(experience_text):
+    cleaned = re.sub(r"[\u2022\u2023\u25E6\u2043\u2219\u00b7\u2027\u25CF\u25CB\u25A0\u25A1\u25AA\u25AB\uF0B7]", "-", experience_text)
+    cleaned = re.sub(r"\s{2,}", " ", cleaned)
+    cleaned = cleaned.replace('\n', ' ').strip()
+    job_pattern = re.compile(r'([^\|]+?\|\s*[^\|]+?\|\s*[^|]+?)(?=\s+[^\|]+?\s+\|\s+[^\|]+?\s+\||\Z)', re.DOTALL)
+    return [match.strip() for match in job_pattern.findall(cleaned)]
+
+
+def reference_sections(text):
+    return {
+        section: reference_extract_section(text, keywords, ALL_HEADERS)
+        for section, keywords in SECTION_KEYWORDS.items()
+    }
+
+
+PIECES = (
+    [h for h in ALL_HEADERS]
+    + [k for keywords in SECTION_KEYWORDS.values() for k in keywords]
+    + ["Python, SQL", "Dev | Acme | 2019", "• built things", "5 years", "my skills", "x@y.com", ":", "-", "|"]
+)
+
+
+def random_resume(rng, lines):
+    out = []
+    for _ in range(lines):
+        parts = []
+        for _ in range(rng.randint(0, 3)):
+            piece = rng.choice(PIECES)
+            parts.append(piece.upper() if rng.random() < 0.1 else piece)
+        line = rng.choice(["", " ", "  ", "\t"]).join(parts)
+        line = rng.choice(["", " ", "\t"]) + line + rng.choice(["", " ", ":", " -", "\r", "  "])
+        out.append(line)
+    return "\n".join(out) + rng.choice(["", "\n", "\n\n", "  "])
+
+
+def fuzz(iterations, seed=0):
+    rng = random.Random(seed)
+    for i in range(iterations):
+        text = random_resume(rng, rng.randint(0, 40))
+        expected, actual = reference_sections(text), split_sections(text)
+        if expected != actual:
+            raise AssertionError(f"Section mismatch on case {i}:\n{text!r}\nexpected {expected}\nactual {actual}")
+    print(f"fuzz: {iterations} random resumes, sections identical to the reference")
+
+
+def adversarial(kind, size):
+    if kind == "pipes":
+        unit = "Role | Company | 2019 lorem ipsum "
+    elif kind == "whitespace":
+        return "Experience\n1" + " " * size + "x"
+    elif kind == "email-like":
+        return "a" * size
+    elif kind == "digits":
+        return "Experience\n" + "1 " * (size // 2)
+    elif kind == "headers":
+        unit = "Skills\nExperience\nEducation:\nProjects -\n"
+    else:
+        raise ValueError(kind)
+    return "Experience\n" + unit * (size // len(unit))
+
+
+def reference_extract(text):
+    sections = reference_sections(text)
+    experience = sections["experience"]
+    if experience.lower().startswith(("professional experience", "work experience", "experience")):
+        experience = experience.split('\n', 1)[-1].strip()
+    reference_split_experience_entries(experience)
+    re.search(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", text)
+
+
+def timed(function, text):
+    started = time.perf_counter()
+    function(text)
+    return time.perf_counter() - started
+
+
+def scaling(max_mb, reference_max_kb):
+    tool = ResumeParserTool()
+    sizes = []
+    size = 16 * 1024
+    while size <= max_mb * 1024 * 1024:
+        sizes.append(size)
+        size *= 2
+
+    print(f"{'input':>11} {'size':>8} {'seconds':>9} {'x prev':>7} {'reference':>10}")
+    for kind in ["pipes", "whitespace", "email-like", "digits", "headers"]:
+        previous = None
+        for size in sizes:
+            text = adversarial(kind, size)
+            seconds = timed(tool._extract_field, text)
+            growth = f"{seconds / previous:>7.2f}" if previous else f"{'':>7}"
+            reference = f"{timed(reference_extract, text):>9.3f}s" if size <= reference_max_kb * 1024 else f"{'-':>10}"
+            print(f"{kind:>11} {size // 1024:>6}KB {seconds:>8.3f}s {growth} {reference}")
+            previous = seconds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fuzz", type=int, default=2000)
+    parser.add_argument("--max-mb", type=int, default=2)
+    parser.add_argument("--reference-max-kb", type=int, default=32, help="Largest input also run through the old implementation")
+    args = parser.parse_args()
+
+    fuzz(args.fuzz)
+    scaling(args.max_mb, args.reference_max_kb)
+
+
+if __name__ == "__main__":
+    main()
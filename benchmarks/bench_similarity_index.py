@@ -0,0 +1,68 @@
+"""
+Build and query time of the JD-resume similarity index.
+
+Generates synthetic resumes of realistic length and times vectorizing them
+plus scoring all of them against one job description on a single core.
+
+    python -m benchmarks.bench_similarity_index --resumes 10000
+"""
+import argparse
+import random
+import time
+
+from src.ats.utils.similarityIndex import SimilarityIndex
+
+SKILLS = [
+    "python", "java", "c++", "c#", "go", "rust", "javascript", "typescript", "react", "node.js",
+    "django", "flask", "fastapi", "spring", "sql", "postgresql", "mysql", "mongodb", "redis", "kafka",
+    "docker", "kubernetes", "aws", "gcp", "azure", "terraform", "spark", "airflow", "pandas", "pytorch",
+    "tensorflow", "scikit-learn", "nlp", "computer vision", "graphql", "rest", "grpc", "linux", "git", "ci/cd",
+]
+WORDS = (
+    "led built designed improved migrated scaled reduced latency team service platform pipeline data "
+    "customers product features reliability production api backend frontend infrastructure analytics "
+    "models deployment monitoring testing automation performance cost architecture mentoring stakeholders"
+).split()
+
+
+def _resume(rng, chars):
+    parts = [f"Candidate {rng.randint(1, 10**6)}", "Skills: " + ", ".join(rng.sample(SKILLS, 8))]
+    length = sum(len(p) for p in parts)
+    while length < chars:
+        sentence = " ".join(rng.choice(WORDS + SKILLS) for _ in range(14)) + "."
+        parts.append(sentence)
+        length += len(sentence)
+    return "\n".join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=10000)
+    parser.add_argument("--chars", type=int, default=4000, help="Approximate characters per resume")
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    resumes = [_resume(rng, args.chars) for _ in range(args.resumes)]
+    jd = "Senior backend engineer: 5+ years with python, django, postgresql, docker, kubernetes and aws. " * 3
+
+    build, query = [], []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        index = SimilarityIndex(resumes)
+        built = time.perf_counter()
+        top = index.top_k(jd, args.top_k)
+        done = time.perf_counter()
+        build.append(built - started)
+        query.append(done - built)
+
+    print(f"resumes={args.resumes} chars/resume~{args.chars} nnz={index.weights.size}")
+    print(f"build  best {min(build):.3f}s")
+    print(f"query  best {min(query) * 1000:.1f}ms (top {args.top_k})")
+    print(f"total  best {min(b + q for b, q in zip(build, query)):.3f}s")
+    print(f"best match: {top[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Startup time and memory of `import src.ats.main`.
+
+Each variant runs in a fresh interpreter, several times, and reports the
+median wall time and peak RSS of the child:
+
+- import: importing the app as every process start does; spaCy is not
+  imported any more
+- eager: loading the full en_core_web_sm pipeline first, as the rewrite
+  tool used to do at import time
+- first use: importing the app, then loading the slimmed pipeline on the
+  first get_nlp() call (only the rewrite path pays this)
+
+    python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+CHILD = """
+import json, resource, sys, time
+started = time.perf_counter()
+{setup}
+import src.ats.main
+{after}
+seconds = time.perf_counter() - started
+print(json.dumps({{
+    "seconds": seconds,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "spacy": "spacy" in sys.modules,
+}}))
+"""
+
+VARIANTS = {
+    "import": ("", ""),
+    "eager": ("import spacy; spacy.load('en_core_web_sm')", ""),
+    "first use": ("", "from src.ats.utils.spacyModel import get_nlp; get_nlp()"),
+}
+
+
+def run(setup, after):
+    env = dict(os.environ, OTEL_SDK_DISABLED="true")
+    process = subprocess.run(
+        [sys.executable, "-c", CHILD.format(setup=setup, after=after)],
+        capture_output=True, text=True, env=env,
+    )
+    if process.returncode:
+        return None
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'variant':>10} {'median s':>9} {'peak RSS MB':>12} {'spaCy loaded':>13}")
+    for name, (setup, after) in VARIANTS.items():
+        results = [run(setup, after) for _ in range(args.runs)]
+        if None in results:
+            print(f"{name:>10} {'failed (is en_core_web_sm installed?)':>36}")
+            continue
+        seconds = statistics.median(r["seconds"] for r in results)
+        rss = statistics.median(r["rss_mb"] for r in results)
+        print(f"{name:>10} {seconds:>9.2f} {rss:>12.0f} {str(results[0]['spacy']):>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Pages per second and peak memory of each text extraction backend.
+
+Runs every backend on small (1 page), large (3 page) and many-page
+(40 page) resumes, as PDF and DOCX. Each measurement runs in a fresh
+process so the peak RSS growth belongs to that backend alone. DOCX has no
+pages; a page there is the same 45 lines the PDF pages hold.
+
+    python -m benchmarks.bench_text_extraction
+"""
+import argparse
+import multiprocessing
+import random
+import resource
+import time
+
+from benchmarks.bench_resume_extraction import make_docx, make_pdf
+from src.ats.utils.textExtraction import BACKENDS, extract_text
+
+CORPORA = {"small": (1, 50), "large": (3, 20), "many-page": (40, 3)}  # pages, documents
+
+
+def _measure(kind, backend, documents, pages, min_seconds, queue):
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rounds, started = 0, time.perf_counter()
+    while True:
+        for data in documents:
+            extract_text(data, kind, backend)
+        rounds += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds:
+            break
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((rounds * len(documents) * pages / elapsed, (peak - baseline) / 1024))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--min-seconds", type=float, default=1.0, help="Minimum run time per measurement")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    makers = {"pdf": make_pdf, "docx": make_docx}
+    print(f"{'format':>6} {'backend':>12} {'corpus':>10} {'pages/s':>10} {'peak RSS +MB':>13}")
+    for kind, backends in BACKENDS.items():
+        for corpus, (pages, count) in CORPORA.items():
+            documents = [makers[kind](rng, pages) for _ in range(count)]
+            for backend in backends:
+                queue = multiprocessing.Queue()
+                process = multiprocessing.Process(
+                    target=_measure, args=(kind, backend, documents, pages, args.min_seconds, queue)
+                )
+                process.start()
+                pages_per_second, peak_mb = queue.get()
+                process.join()
+                print(f"{kind:>6} {backend:>12} {corpus:>10} {pages_per_second:>10.1f} {peak_mb:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
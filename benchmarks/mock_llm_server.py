@@ -0,0 +1,284 @@
+"""
+Local OpenAI-compatible mock endpoint used by the benchmarks.
+
+Serves POST /v1/chat/completions with a configurable latency so the
+throughput of the flows can be measured without network or API spend.
+Answers are valid for the schemas the crews expect (CandidateFilter,
+CandidateScore, CandidateScoreBatch, ResumeData, Resume_Final and the
+extraction function call). A share of requests can be failed with a 429
+(with Retry-After) or a 500, to exercise the retry paths.
+"""
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _candidate_payload(prompt):
+    n = random.randint(1, 10**6)
+    return {
+        "id": "0",
+        "name": f"Candidate {n}",
+        "email": f"candidate{n}@example.com",
+        "bio": "Backend engineer with experience building Python services.",
+        "years_of_exp": str(random.randint(1, 12)),
+        "skills": "Python, SQL, Docker, AWS",
+    }
+
+
+TECH_TERMS = ["python", "postgresql", "docker", "kubernetes", "aws", "kafka", "terraform", "ci/cd", "rest"]
+
+
+def _score_payload(candidate_id, bio=None):
+    if bio is None:
+        score = random.randint(35, 95)
+    else:
+        # Single-candidate answers follow the resume, so rewrites that add skills score higher
+        score = min(95, 40 + 6 * sum(term in bio.lower() for term in TECH_TERMS) + random.randint(-2, 2))
+    return {
+        "id": candidate_id,
+        "score": score,
+        "reason": "Solid skill match with relevant Python and cloud experience; some gaps in leadership.",
+    }
+
+
+def _resume_payload():
+    n = random.randint(1, 10**6)
+    return {
+        "name": f"Candidate {n}",
+        "email": f"candidate{n}@example.com",
+        "mobile_number": "+1 555 123 4567",
+        "skills": ["Python", "SQL", "Docker", "AWS"],
+        "education": ["BSc Computer Science"],
+        "objective": ["Backend engineer building Python services."],
+        "experience_years": float(random.randint(1, 12)),
+        "experience_details": ["Engineer | Acme | 2019 - 2024"],
+        "projects": [],
+        "certifications": [],
+        "linkedin": "Not found",
+        "github": "Not found",
+    }
+
+
+def _job_description():
+    return (
+        "Senior Python Engineer. We build data-heavy backend services on AWS. "
+        "Requirements: 5+ years of Python, REST APIs, PostgreSQL, Docker, Kubernetes, CI/CD. "
+        "Nice to have: Kafka, Terraform, machine learning pipelines."
+    )
+
+
+def _rewrite_payload(prompt, unchanged_rate):
+    if random.random() < unchanged_rate:
+        resume = prompt.split("Rewrite the resume contents ", 1)[-1].split(" to improve its compatibility", 1)[0]
+        return {"resume_data": resume, "feedback": "The resume is already well aligned.", "score": "0"}
+    skills = random.sample(["Python", "PostgreSQL", "Docker", "Kubernetes", "AWS", "Kafka", "Terraform", "CI/CD"], 6)
+    return {
+        "resume_data": (
+            "Summary\nBackend engineer building Python services on AWS.\n\n"
+            f"Skills\n{', '.join(skills)}\n\n"
+            "Experience\nSenior Engineer | Acme | 2019 - 2024\nBuilt REST APIs and data pipelines.\n\n"
+            "Education\nBSc Computer Science"
+        ),
+        "feedback": "Added missing keywords to the summary and skills.",
+        "score": "0",
+    }
+
+
+def _filter_payload(candidate_id):
+    return {
+        "id": candidate_id,
+        "name": f"Candidate {candidate_id}",
+        "email": f"candidate{candidate_id}@example.com",
+        "result": random.choice(["Pass", "Pass", "Fail"]),
+        "reason": "Skills and experience compared with the job requirements.",
+    }
+
+
+class MockLLMServer:
+    """Threaded mock of the OpenAI chat completions API."""
+
+    def __init__(self, latency=0.2, jitter=0.0, latency_per_token=0.0, partial_batch_rate=0.0, unchanged_rewrite_rate=0.0,
+                 error_rate=0.0, rate_limit_rate=0.0, retry_after=0.05, host="127.0.0.1", port=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.latency_per_token = latency_per_token
+        self.partial_batch_rate = partial_batch_rate
+        self.unchanged_rewrite_rate = unchanged_rewrite_rate
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.requests = 0
+        self.prompt_chars = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.completed = Counter()
+        self.errors = Counter()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def final_answer(self, prompt):
+        """Answer a crew task, recognised by the section headers of its prompt."""
+        ids = re.findall(r"Candidate ID: (\S+)", prompt)
+        candidate_id = ids[0] if ids else "1"
+
+        if "CANDIDATES TO SCORE" in prompt:
+            scores = [_score_payload(i) for i in dict.fromkeys(ids)]
+            if scores and random.random() < self.partial_batch_rate:
+                scores.pop()
+            return json.dumps({"scores": scores})
+        if "CANDIDATE BIO" in prompt:
+            bio = prompt.split("Bio:", 1)[-1].split("JOB DESCRIPTION", 1)[0]
+            return json.dumps(_score_payload(candidate_id, bio))
+        if "CANDIDATE RESUME DATA" in prompt:
+            resume = prompt.split("CANDIDATE RESUME DATA", 1)[-1].split("JOB DESCRIPTION", 1)[0]
+            return json.dumps(_score_payload(candidate_id, resume))
+        if "CANDIDATE INFORMATION" in prompt:
+            return json.dumps(_filter_payload(candidate_id))
+        if "Extract the job description from the given URL" in prompt:
+            return _job_description()
+        if "Rewrite the resume contents" in prompt:
+            return json.dumps(_rewrite_payload(prompt, self.unchanged_rewrite_rate))
+        if "Resume file path" in prompt:
+            return json.dumps(_resume_payload())
+        if "PROCEEDING WITH CANDIDATE" in prompt:
+            return f"Subject: Your application\nDear Candidate {candidate_id},\nThank you for applying.\nBest regards,\nHR Team"
+        return "OK"
+
+    @staticmethod
+    def request_kind(body):
+        """Short label of what a request asks for, for per-stage call counts."""
+        if body.get("functions"):
+            return "extract"
+        prompt = "\n".join(str(m.get("content") or "") for m in body.get("messages", []))
+        for marker, kind in [
+            ("CANDIDATES TO SCORE", "score"), ("CANDIDATE BIO", "score"), ("CANDIDATE RESUME DATA", "score"),
+            ("CANDIDATE INFORMATION", "filter"),
+            ("PROCEEDING WITH CANDIDATE", "email"), ("Extract the job description from the given URL", "jd"),
+            ("Rewrite the resume contents", "rewrite"), ("Resume file path", "parse"),
+        ]:
+            if marker in prompt:
+                return kind
+        return "other"
+
+    def respond(self, body):
+        """Build a chat completion response for a parsed request body."""
+        prompt = "\n".join(str(m.get("content") or "") for m in body.get("messages", []))
+        message = {"role": "assistant", "content": None}
+        finish_reason = "stop"
+
+        if body.get("functions"):
+            name = body["functions"][0]["name"]
+            message["function_call"] = {
+                "name": name,
+                "arguments": json.dumps(_candidate_payload(prompt)),
+            }
+            finish_reason = "function_call"
+        else:
+            message["content"] = "Thought: I now can give a great answer\nFinal Answer: " + self.final_answer(prompt)
+
+        completion = json.dumps(message)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o"),
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": {
+                "prompt_tokens": len(prompt) // 4,
+                "completion_tokens": len(completion) // 4,
+                "total_tokens": (len(prompt) + len(completion)) // 4,
+            },
+        }
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def send_error_response(self, status, message, headers=()):
+                payload = json.dumps({"error": {"message": message, "type": "mock_error", "code": status}}).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+
+                roll = random.random()
+                if roll < server.rate_limit_rate + server.error_rate:
+                    status = 429 if roll < server.rate_limit_rate else 500
+                    with server._lock:
+                        server.errors[status] += 1
+                    try:
+                        if status == 429:
+                            self.send_error_response(429, "Rate limit reached (mock)", [
+                                ("retry-after-ms", str(int(server.retry_after * 1000))),
+                                ("retry-after", str(max(1, round(server.retry_after)))),
+                            ])
+                        else:
+                            time.sleep(server.latency)
+                            self.send_error_response(500, "Internal server error (mock)")
+                    except (BrokenPipeError, ConnectionResetError):
+                        pass
+                    return
+                response = server.respond(body)
+                usage = response["usage"]
+                with server._lock:
+                    server.requests += 1
+                    server.prompt_chars += sum(len(str(m.get("content") or "")) for m in body.get("messages", []))
+                    server.prompt_tokens += usage["prompt_tokens"]
+                    server.completion_tokens += usage["completion_tokens"]
+
+                delay = server.latency + random.uniform(0, server.jitter) + usage["completion_tokens"] * server.latency_per_token
+                if delay > 0:
+                    time.sleep(delay)
+
+                payload = json.dumps(response).encode("utf-8")
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    return  # the client is gone, e.g. a benchmark killed it
+                with server._lock:
+                    server.completed[server.request_kind(body)] += 1
+
+        return Handler
@@ -1,6 +1,6 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
-from src.ats.types import CandidateScore
+from src.ats.types import CandidateScore, CandidateScoreBatch
 
 
 @CrewBase
@@ -24,6 +24,13 @@ class LeadScoreCrew:
             output_pydantic=CandidateScore,
         )
 
+    # Not decorated with @task so that crew() keeps scoring one candidate
+    def evaluate_candidates_batch_task(self) -> Task:
+        return Task(
+            config=self.tasks_config["evaluate_candidates_batch"],
+            output_pydantic=CandidateScoreBatch,
+        )
+
     @crew
     def crew(self) -> Crew:
         """Creates the Lead Score Crew"""
@@ -33,3 +40,12 @@ class LeadScoreCrew:
             process=Process.sequential,
             verbose=True,
         )
+
+    def batch_crew(self) -> Crew:
+        """Creates the Lead Score Crew that scores several candidates per call"""
+        return Crew(
+            agents=[self.hr_evaluation_agent()],
+            tasks=[self.evaluate_candidates_batch_task()],
+            process=Process.sequential,
+            verbose=True,
+        )
@@ -3,8 +3,115 @@ from pydantic import BaseModel, Field
 import os
 from typing import Type
 import re
-import docx2txt
-import fitz  # PyMuPDF
+import bisect
+from src.ats.utils.parseCache import content_key,get_parse_cache
+from src.ats.utils.textExtraction import extract_text
+
+# Bump whenever _extract_text or _extract_field change their output, so cached parses are not reused
+PARSER_VERSION = "2"
+
+# Patterns are compiled once. Runs that cannot contain their delimiter are
+# possessive and the email may only start at a word boundary, so no search
+# backtracks more than a bounded amount on long inputs.
+EMAIL_PATTERN = re.compile(r"(?<![a-zA-Z0-9_.+-])[a-zA-Z0-9_.+-]++@[a-zA-Z0-9-]++\.[a-zA-Z0-9-.]+")
+PHONE_PATTERN = re.compile(r"""
+    (?:\+?\d{1,3}[-.\s]?)?              # Optional country code
+    \(?\d{3}\)?[-.\s]?                   # Area code with optional parentheses
+    \d{3}[-.\s]?                         # First 3 digits
+    \d{4}                                # Last 4 digits
+""", re.VERBOSE)
+LINKEDIN_PATTERN = re.compile(r"(https?://)?(www\.)?linkedin\.com/[^\s]+")
+GITHUB_PATTERN = re.compile(r"(https?://)?(www\.)?github\.com/\S+")
+EXPERIENCE_PATTERN = re.compile(r"""
+    (?<!\d)(\d+(?:\.\d+)?)                # Number (e.g., 3 or 2.5)
+    \s*+                                 # Optional space
+    (?:\+?\s*+\d+)?                       # Optional range like 3-5
+    \s*+                                 # Optional space
+    (?:years?|yrs?)                      # Variations of "years"
+""", re.IGNORECASE | re.VERBOSE)
+BULLET_PATTERN = re.compile(r"[\u2022\u2023\u25E6\u2043\u2219\u00b7\u2027\u25CF\u25CB\u25A0\u25A1\u25AA\u25AB\uF0B7]")
+SPACES_PATTERN = re.compile(r"\s{2,}")
+WHITESPACE_PATTERN = re.compile(r"\s*")
+
+# Common headers (all potential headers to detect section boundaries)
+ALL_HEADERS = ["Experience", "Education", "Skills", "Certifications", "Projects", "Summary", "Objective", "Achievements"]
+# Keywords that open each section, tried in order
+SECTION_KEYWORDS = {
+    "objective": ["Objective", "Career Objective", "Professional Summary", "Summary"],
+    "skills": ["Skills", "Technical Skills", "Core Competencies"],
+    "education": ["Education", "Academic Background", "Educational Qualifications"],
+    "experience": ["Experience", "Professional Experience", "Work Experience"],
+    "projects": ["Projects", "Key Projects", "Academic Projects"],
+    "certifications": ["Certifications", "Licenses", "Certificates"],
+}
+_HEADERS = {header.lower() for header in ALL_HEADERS}
+_KEYWORDS = sorted({keyword.lower() for keywords in SECTION_KEYWORDS.values() for keyword in keywords})
+
+
+def split_sections(text: str) -> dict:
+    """
+    Text of every section in SECTION_KEYWORDS ("Not found" when absent), from
+    a single pass over the lines of `text`.
+
+    A section opens at the first line ending with one of its keywords (the
+    first keyword in list order that occurs) and runs up to the next line,
+    after the one following the keyword, that holds only a header from
+    ALL_HEADERS, optionally followed by ":" or "-".
+    """
+    keyword_starts = {}
+    header_lines = []
+    position = 0
+    lines = text.split("\n")
+    # The last line has no newline after it, so it can neither open nor close a section
+    for index in range(len(lines) - 1):
+        line = lines[index]
+        stripped = line.rstrip()
+        for keyword in _KEYWORDS:
+            if keyword not in keyword_starts and stripped[-len(keyword):].lower() == keyword:
+                keyword_starts[keyword] = position + len(stripped) - len(keyword)
+        if index:
+            candidate = stripped.strip()
+            if candidate[-1:] in (":", "-"):
+                candidate = candidate[:-1].rstrip()
+            if candidate.lower() in _HEADERS:
+                header_lines.append(position)
+        position += len(line) + 1
+
+    sections = {}
+    for section, keywords in SECTION_KEYWORDS.items():
+        sections[section] = "Not found"
+        for keyword in keywords:
+            start = keyword_starts.get(keyword.lower())
+            if start is None:
+                continue
+            # The keyword line ends at the last newline of the whitespace after it
+            after = start + len(keyword)
+            body = text.rfind("\n", after, WHITESPACE_PATTERN.match(text, after).end()) + 1
+            following = bisect.bisect_right(header_lines, body)
+            end = header_lines[following] if following < len(header_lines) else len(text)
+            sections[section] = text[start:end].strip()
+            break
+    return sections
+
+
+def split_experience_entries(experience_text: str) -> list:
+    """
+    Job entries of an experience section. An entry starts at a line like
+    "Role | Company | Dates"; the lines after it, up to the next such line,
+    are its description.
+    """
+    job_entries = []
+    for line in experience_text.split("\n"):
+        # Remove bullet characters and normalize spacing
+        line = SPACES_PATTERN.sub(" ", BULLET_PATTERN.sub("-", line)).strip()
+        if not line:
+            continue
+        if line.count("|") >= 2:
+            job_entries.append([line])
+        elif job_entries:
+            job_entries[-1].append(line)
+    return [" ".join(entry) for entry in job_entries]
+
 
 class ResumeParserInput(BaseModel):
     file_path: str = Field(
@@ -21,59 +128,26 @@ class ResumeParserTool(BaseTool):
     args_schema: Type[BaseModel] = ResumeParserInput
 
     def _extract_text(self, file_path: str) -> str:
-        if file_path.lower().endswith('.pdf'):
-            doc = fitz.open(file_path)
-            return "\n".join([page.get_text() for page in doc])
-        elif file_path.lower().endswith('.docx'):
-            return docx2txt.process(file_path)
-        else:
-            raise ValueError("Unsupported file type. Only PDF and DOCX are supported.")
+        return extract_text(file_path)
 
     def _extract_field(self, text: str) -> dict:
         data = {}
 
         # Basic fields using regex
-        data["email"] = re.search(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", text)
+        data["email"] = EMAIL_PATTERN.search(text)
         #print("TEXT : ",text)
         # Phone number extraction 
-        phone_pattern = re.compile(r"""
-            (?:\+?\d{1,3}[-.\s]?)?              # Optional country code
-            \(?\d{3}\)?[-.\s]?                   # Area code with optional parentheses
-            \d{3}[-.\s]?                         # First 3 digits
-            \d{4}                                # Last 4 digits
-        """, re.VERBOSE)
-        
-        phone_match = phone_pattern.search(text)
+        phone_match = PHONE_PATTERN.search(text)
         data["mobile_number"] = phone_match if phone_match else None
         
 
-        data["linkedin"] = re.search(r"(https?://)?(www\.)?linkedin\.com/[^\s]+", text)
-        data["github"] = re.search(r"(https?://)?(www\.)?github\.com/\S+", text)
+        data["linkedin"] = LINKEDIN_PATTERN.search(text)
+        data["github"] = GITHUB_PATTERN.search(text)
 
         # Extract name: heuristic (first non-empty line with more than one word)
         lines = [line.strip() for line in text.splitlines() if line.strip()]
         data["name"] = lines[0] if lines and len(lines[0].split()) <= 5 else "Not found"
 
-        # Extract sections using keywords
-        lower_text = text.lower()
-
-        def split_experience_entries(experience_text):
-            job_entries = []
-
-            # Remove bullet characters and normalize spacing
-            cleaned = re.sub(r"[\u2022\u2023\u25E6\u2043\u2219\u00b7\u2027\u25CF\u25CB\u25A0\u25A1\u25AA\u25AB\uF0B7]", "-", experience_text)
-            cleaned = re.sub(r"\s{2,}", " ", cleaned)  # Collapse multiple spaces
-            cleaned = cleaned.replace('\n', ' ').strip()
-
-            # Match job entries like: Role | Company | Dates
-            job_pattern = re.compile(r'([^\|]+?\|\s*[^\|]+?\|\s*[^|]+?)(?=\s+[^\|]+?\s+\|\s+[^\|]+?\s+\||\Z)', re.DOTALL)
-
-            matches = job_pattern.findall(cleaned)
-            for match in matches:
-                job_entries.append(match.strip())
-
-            return job_entries
-        
         def split_skills(text):
             return [s.strip() for s in re.split(r'[,\n]', text) if s.strip()]
         
@@ -86,108 +160,35 @@ class ResumeParserTool(BaseTool):
         def split_certifications(text):
             return [line.strip() for line in text.split('\n') if line.strip()]
         
-        # def extract_section(possible_keywords):
-        #     if isinstance(possible_keywords, str):
-        #         possible_keywords = [possible_keywords]
-
-        #     for keyword in possible_keywords:
-        #         idx = lower_text.find(keyword.lower())
-        #         if idx != -1:
-        #             end_idx = lower_text.find('\n\n', idx)
-        #             return text[idx:end_idx].strip() if end_idx != -1 else text[idx:].strip()
-        #     return "Not found"
-        
         def extract_experience(text):       
-            experience_pattern = r"""
-                (?:(?:\bwith|\bpossess|\bover|\baround)?\s*)      # Common prefixes
-                (\d+(?:\.\d+)?)                                    # Number (e.g., 3 or 2.5)
-                \s*                                                # Optional space
-                (?:\+?\s*\d+)?                                     # Optional range like 3-5
-                \s*                                                # Optional space
-                (?:years?|yrs?)                                    # Variations of "years"
-                (?:\s+of\s+(?:total\s+)??experience)?              # Optional "of experience"
-            """
-            match = re.search(experience_pattern, text, re.IGNORECASE | re.VERBOSE)
+            match = EXPERIENCE_PATTERN.search(text)
             if match:
                 try:
                     return float(match.group(1))
                 except (ValueError, AttributeError):
                     return None
             return None
-        
-        def extract_section(text, section_keywords, all_headers):
-            if isinstance(section_keywords, str):
-                section_keywords = [section_keywords]
-
-            # Create a combined regex pattern for headers (used to detect section boundaries)
-            headers_pattern = '|'.join([re.escape(h) for h in all_headers])
-
-            for keyword in section_keywords:
-                # Regex to find the keyword as a header
-                pattern = re.compile(rf'({keyword})\s*\n', flags=re.IGNORECASE)
-                match = pattern.search(text)
-                if match:
-                    start_idx = match.start()
-
-                    # Match only when a known header appears alone or nearly alone on a line
-                    next_header_pattern = re.compile(
-                        rf'\n\s*({headers_pattern})\s*[:\-]?\s*\n',
-                        flags=re.IGNORECASE
-                    )
-                    next_match = next_header_pattern.search(text, pos=match.end())
-                    end_idx = next_match.start() if next_match else len(text)
-
-                    return text[start_idx:end_idx].strip()
-
-            return "Not found"
-        
-        # Common headers (all potential headers to detect section boundaries)
-        all_headers = ["Experience", "Education", "Skills", "Certifications", "Projects", "Summary", "Objective", "Achievements"]
-
-        objective_text = extract_section(
-            text,
-            section_keywords=["Objective", "Career Objective", "Professional Summary", "Summary"],
-            all_headers=all_headers
-        )
+
+        # Every section comes from one pass over the text
+        sections = split_sections(text)
+
+        objective_text = sections["objective"]
         data["objective"] = objective_text if objective_text != "Not found" else None
 
-        skills_text = extract_section(
-            text,
-            section_keywords=["Skills", "Technical Skills", "Core Competencies"],
-            all_headers=all_headers
-        )
-        data["skills"] = split_skills(skills_text)
+        data["skills"] = split_skills(sections["skills"])
 
-        education_text = extract_section(
-            text,
-            section_keywords=["Education", "Academic Background", "Educational Qualifications"],
-            all_headers=all_headers
-        )
-        data["education"] = split_education_entries(education_text)
+        data["education"] = split_education_entries(sections["education"])
 
         data["experience_years"] = extract_experience(text)
 
-        experience_text = extract_section(text,
-            section_keywords=["Experience", "Professional Experience", "Work Experience"],
-            all_headers=all_headers
-        )
+        experience_text = sections["experience"]
         if experience_text.lower().startswith(("professional experience", "work experience", "experience")):
             experience_text = experience_text.split('\n', 1)[-1].strip()
         data["experience_details"] = split_experience_entries(experience_text)
 
-        projects_text = extract_section(
-            text,
-            section_keywords=["Projects", "Key Projects", "Academic Projects"],
-            all_headers=all_headers
-        )
-        data["projects"] = split_project_entries(projects_text)
+        data["projects"] = split_project_entries(sections["projects"])
         
-        certs_text = extract_section(
-            text,
-            section_keywords=["Certifications", "Licenses", "Certificates"],
-            all_headers=all_headers
-        )
-        data["certifications"] = split_certifications(certs_text)
+        data["certifications"] = split_certifications(sections["certifications"])
 
         # Post-process regex matches
         for k in ["email", "mobile_number", "linkedin", "github"]:
@@ -198,13 +199,34 @@ class ResumeParserTool(BaseTool):
 
         return data
 
+    def parse_file(self, file_path: str) -> dict:
+        """
+        Field dictionary for the resume at `file_path`. Parses are cached by
+        file content, so the same resume uploaded to another path is not
+        extracted or parsed again.
+        """
+        with open(file_path, "rb") as f:
+            data = f.read()
+
+        cache = get_parse_cache()
+        key = content_key(data, PARSER_VERSION)
+        if cache:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached["fields"]
+
+        text = extract_text(data, os.path.splitext(file_path)[1])
+        extracted = self._extract_field(text)
+        if cache:
+            cache.put(key, {"text": text, "fields": extracted})
+        return extracted
+
     def _run(self, file_path: str) -> str:
         try:
             if not os.path.isfile(file_path):
                 return f"❌ Error: File does not exist at {file_path}"
 
-            text = self._extract_text(file_path)
-            extracted = self._extract_field(text)
+            extracted = self.parse_file(file_path)
 
             result = [f"**{k.replace('_', ' ').title()}**: {v}" for k, v in extracted.items()]
             return "\n".join(result)
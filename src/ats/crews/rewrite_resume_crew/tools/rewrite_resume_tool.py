@@ -2,9 +2,7 @@ from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 from typing import Type,Optional,Union
 import re
-import spacy
-
-nlp = spacy.load("en_core_web_sm")
+from src.ats.utils.keywordEngine import find_missing_keywords,parse_texts
 
 
 class ResumeInput(BaseModel):
@@ -19,33 +17,29 @@ class RewriteResumeTool(BaseTool):
     )
     args_schema: Type[BaseModel] = ResumeInput
 
-    def _extract_keywords(self, jd_text: str) -> set:
-        doc = nlp(jd_text)
-        return {
-            token.lemma_.lower()
-            for token in doc
-            if token.pos_ in {"NOUN", "PROPN", "ADJ", "VERB"} and not token.is_stop
-        }
-
-    def _check_missing_keywords(self, resume_text: str, jd_keywords: set) -> set:
-        resume_doc = nlp(resume_text.lower())
-        resume_tokens = {token.lemma_ for token in resume_doc if not token.is_stop}
-        return jd_keywords - resume_tokens
+    def _check_missing_keywords(self, resume_text: str, jd_text: str) -> set:
+        # JD keywords are memoized by hash, so rewrite iterations against one JD parse it once
+        return find_missing_keywords([resume_text], jd_text)[0]
 
     def _insert_keywords_contextually(self, resume: str, missing_keywords: set) -> str:
         sections = self._split_sections(resume)
         injected_keywords = set()
         rewritten_sections = []
 
+        # Sentence-split every section that gets enriched in one nlp.pipe call
+        enriched_headers = {"summary", "objective", "professional summary", "experience", "work experience"}
+        to_enrich = [content for header, content in sections if header.lower() in enriched_headers]
+        section_sentences = iter([[sent.text for sent in doc.sents] for doc in parse_texts(to_enrich)])
+
         for header, content in sections:
             section_lower = header.lower()
 
             if section_lower in {"summary", "objective", "professional summary"}:
-                enriched = self._enrich_section(content, missing_keywords, injected_keywords)
+                enriched = self._enrich_section(next(section_sentences), missing_keywords, injected_keywords)
             elif section_lower in {"skills"}:
                 enriched = self._add_to_comma_list(content, missing_keywords, injected_keywords)
             elif section_lower in {"experience", "work experience"}:
-                enriched = self._enrich_section(content, missing_keywords, injected_keywords)
+                enriched = self._enrich_section(next(section_sentences), missing_keywords, injected_keywords)
             else:
                 enriched = content
 
@@ -70,9 +64,7 @@ class RewriteResumeTool(BaseTool):
         return sections or [("Resume", resume_text)]
 
 
-    def _enrich_section(self, text: str, keywords: set, used_keywords: set) -> str:
-        doc = nlp(text)
-        sentences = [sent.text for sent in doc.sents]
+    def _enrich_section(self, sentences: list, keywords: set, used_keywords: set) -> str:
         enriched = []
 
         for sentence in sentences:
@@ -114,8 +106,7 @@ class RewriteResumeTool(BaseTool):
 
             # If job description is provided
             if jd_text:
-                jd_keywords = self._extract_keywords(jd_text)
-                missing_keywords = self._check_missing_keywords(resume_text, jd_keywords)
+                missing_keywords = self._check_missing_keywords(resume_text, jd_text)
                 rewritten_resume = self._insert_keywords_contextually(resume_text, missing_keywords)
 
                 feedback = (
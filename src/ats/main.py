@@ -1,5 +1,8 @@
 #!/usr/bin/env python
 import asyncio
+import os
+import re
+from pathlib import Path
 from typing import List,Dict
 
 from crewai.flow.flow import Flow, listen, or_, router, start
@@ -10,20 +13,36 @@ from src.ats.crews.lead_score_crew.lead_score_crew import LeadScoreCrew
 from src.ats.crews.lead_filter_crew.lead_filter_crew import LeadFilterCrew
 from src.ats.crews.web_scraper_crew.web_scraper_crew import WebScraperCrew
 from src.ats.crews.resume_parser_crew.resume_parser_crew import ResumeParserCrew
+from src.ats.crews.resume_parser_crew.tools.resume_parser_tool import SECTION_KEYWORDS,ResumeParserTool
 from src.ats.crews.resume_score_crew.resume_score_crew import ResumeScoreCrew
 from src.ats.crews.rewrite_resume_crew.rewrite_resume_crew import RewriteResumeCrew
 from src.ats.types import Candidate, CandidateScore, ScoredCandidate,CandidateFilter,ResumeData,Resume_Final
-from src.ats.utils.candidateUtils import combine_candidates_with_scores,extract_candidate_info,get_resume_text,send_email
-import csv
+from openai import AsyncOpenAI
+import requests
+from src.ats.utils.atsScorer import TARGET_SCORE,local_ats_score,local_rescore_enabled,rescore_margin
+from src.ats.utils.candidateUtils import candidate_email_key,combine_candidates_with_scores,email_already_queued,extract_candidate_info_async,extract_candidates_async,format_candidates_batch,get_resume_text,match_batch_scores,queue_email_async,select_for_rescoring
+from src.ats.utils.crewRunner import kickoff_crew,kickoff_crew_async
+from src.ats.utils.flowCheckpoint import get_flow_checkpoint
+from src.ats.utils.jobDescriptionCache import get_job_description_cache
+from src.ats.utils.jobFetcher import as_url,fetch_job_description
+from src.ats.utils.llmCache import cache_key
+from src.ats.utils.preFilter import JobTerms,prefilter_candidate,prefilter_candidates
+from src.ats.utils.resultStore import RunResults,get_result_store
+from src.ats.utils.similarityIndex import SimilarityIndex,StreamingShortlist
 
 
 class LeadScoreState(BaseModel):
+    run_id:str=""
     jd:str=""
     candidate_resumes:List[Dict] = []
     candidates: List[Candidate] = []
     failed_candidates: List[CandidateFilter] = []
-    candidate_score: List[CandidateScore] = []
+    # Latest score per candidate ID, and the feedback revision it was given under
+    candidate_score: Dict[str, CandidateScore] = {}
+    score_revisions: Dict[str, int] = {}
+    feedback_revision: int = 0
     candidate_filters:List[CandidateFilter] = []
+    prefilter_avoided_share: float = 0.0
     hydrated_candidates: List[ScoredCandidate] = []
     top_candidates: List[ScoredCandidate] = []
     scored_leads_feedback: str = ""
@@ -42,34 +61,286 @@ class ImproveResumeState(BaseModel):
     is_rewrite:bool=False
     rewrite_count:int=0
     rewrite_score:CandidateScore | None = None
+    initial_local_score: float | None = None
+    last_scored_resume: str = ""
+    last_score_estimated: bool = False
+    llm_rescores_skipped: int = 0
+
+
+async def score_candidate(candidate: Candidate, jd: str, additional_instructions: str = "") -> CandidateScore:
+    result = await kickoff_crew_async(
+        LeadScoreCrew,
+        inputs={
+            "candidate_id": candidate.id,
+            "name": candidate.name,
+            "bio": candidate.bio,
+            "job_description": jd,
+            "additional_instructions": additional_instructions,
+        },
+    )
+    return result.pydantic
+
+async def score_candidate_batch(candidates: List[Candidate], jd: str, additional_instructions: str = "") -> List[CandidateScore]:
+    """
+    Score several candidates with one LLM call. Candidates the batch answer
+    missed or got wrong are scored again one at a time; candidates that get
+    no score either way are left out.
+    """
+    matched = {}
+    try:
+        result = await kickoff_crew_async(
+            LeadScoreCrew,
+            inputs={
+                "candidates": format_candidates_batch(candidates),
+                "candidate_ids": ", ".join(candidate.id for candidate in candidates),
+                "job_description": jd,
+                "additional_instructions": additional_instructions,
+            },
+            factory="batch_crew",
+        )
+        matched = match_batch_scores(candidates, result.pydantic)
+    except Exception as e:
+        print(f"Batch scoring failed, scoring candidates one at a time: {e}")
+
+    missing = [candidate for candidate in candidates if candidate.id not in matched]
+    fallback = await asyncio.gather(*(score_candidate(candidate, jd, additional_instructions) for candidate in missing))
+    for candidate, score in zip(missing, fallback):
+        if score is not None:
+            matched[candidate.id] = score.model_copy(update={"id": candidate.id})
+    return [matched[candidate.id] for candidate in candidates if candidate.id in matched]
+
+async def filter_candidate(candidate: Candidate, jd: str) -> CandidateFilter:
+    result = await kickoff_crew_async(
+        LeadFilterCrew,
+        inputs={
+            "candidate_id": candidate.id,
+            "name": candidate.name,
+            "bio": candidate.bio,
+            "years_of_exp": candidate.years_of_exp,
+            "skills": candidate.skills,
+            "job_description": jd,
+        },
+    )
+    return result.pydantic
+
+async def write_candidate_email(candidate, proceed_with_candidate: bool, output_dir: Path, jd: str = "") -> str:
+    # A rerun for the same job description (e.g. after a restart) does not write the email again
+    key = candidate_email_key(jd, candidate, proceed_with_candidate)
+    if email_already_queued(key):
+        return f"Email for {candidate.name} already queued for {candidate.email}"
+
+    # Kick off the LeadResponseCrew for the candidate
+    result = await kickoff_crew_async(
+        LeadResponseCrew,
+        inputs={
+            "candidate_id": candidate.id,
+            "name": candidate.name,
+            "reason": candidate.reason,
+            "proceed_with_candidate": proceed_with_candidate,
+        },
+    )
+
+    # Sanitize the candidate's name to create a valid filename
+    safe_name = re.sub(r"[^a-zA-Z0-9_\- ]", "", candidate.name)
+    filename = f"{safe_name}.txt"
+    #print("Filename:", filename)
+
+    # Write the email content to a text file
+    file_path = output_dir / filename
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(result.raw)
+
+    #Queue the corresponding email to each candidate; the outbox worker sends it
+    await queue_email_async(file_path,candidate.email,key)
+
+    # Return a message indicating the email was saved
+    return f"Email queued for {candidate.name} as {filename} to {candidate.email}"
+
+def load_job_description(jd: str) -> str:
+    """
+    Job description text for a posting URL, fetched and cleaned without an
+    LLM and cached by URL for the whole process. WebScraperCrew is the
+    fallback when the fetch fails or yields too little text, and is always
+    used with ATS_JD_FETCHER=crew. Input that is not a URL is taken as the
+    job description itself.
+    """
+    url = as_url(jd)
+    if url is None:
+        return jd
+    if os.getenv("ATS_JD_FETCHER", "direct").lower() != "crew":
+        try:
+            cache = get_job_description_cache()
+            text = cache.get(url) if cache else fetch_job_description(url)
+            if len(text) >= int(os.getenv("ATS_JD_MIN_CHARS", 200)):
+                return text
+            print(f"Job description at {url} is too short, falling back to WebScraperCrew")
+        except requests.RequestException as e:
+            print(f"Fetching the job description failed, falling back to WebScraperCrew: {e}")
+
+    result = kickoff_crew(
+                WebScraperCrew,
+                inputs={
+                    "job_description": url,
+                }
+            )
+    # Extract the actual string
+    return str(result)
+
+# ResumeData fields without which the tool's parse is handed to the LLM crew
+REQUIRED_RESUME_FIELDS = ["name", "email", "mobile_number", "skills", "education"]
+
+def _found(value) -> bool:
+    if isinstance(value, list):
+        return bool(value) and value != ["Not found"]
+    return value not in (None, "", "Not found")
+
+_SECTION_HEADINGS = {keyword.lower() for keywords in SECTION_KEYWORDS.values() for keyword in keywords}
+
+def _is_heading(line: str) -> bool:
+    return line.strip().rstrip(":-").strip().lower() in _SECTION_HEADINGS
+
+def resume_data_from_fields(fields: dict) -> ResumeData:
+    """Build ResumeData from the field dictionary of ResumeParserTool.parse_file."""
+    def as_list(value):
+        # Sections come back with their heading line first
+        items = list(value) if _found(value) else []
+        return items[1:] if items and _is_heading(items[0]) else items
+
+    objective = fields.get("objective")
+    if _found(objective):
+        heading, _, rest = objective.partition("\n")
+        objective = rest.strip() if _is_heading(heading) else objective
+    return ResumeData(
+        name=fields.get("name") or "Not found",
+        email=fields.get("email") or "Not found",
+        mobile_number=fields.get("mobile_number") or "Not found",
+        skills=as_list(fields.get("skills")),
+        education=as_list(fields.get("education")),
+        objective=[objective] if _found(objective) else None,
+        experience_years=fields.get("experience_years"),
+        experience_details=as_list(fields.get("experience_details")),
+        projects=as_list(fields.get("projects")),
+        certifications=as_list(fields.get("certifications")),
+        linkedin=fields.get("linkedin") or "Not found",
+        github=fields.get("github") or "Not found",
+    )
+
+def parse_resume_file(file_path: str) -> ResumeData:
+    """
+    Parse a resume with ResumeParserTool directly. ResumeParserCrew only runs
+    when a required field is "Not found", or always with
+    ATS_RESUME_PARSE_MODE=llm; ATS_RESUME_PARSE_MODE=tool never calls it.
+    """
+    mode = os.getenv("ATS_RESUME_PARSE_MODE", "auto").lower()
+    if mode != "llm":
+        try:
+            fields = ResumeParserTool().parse_file(file_path)
+        except Exception as e:
+            if mode == "tool":
+                raise
+            print(f"Resume parser failed, falling back to ResumeParserCrew: {e}")
+        else:
+            resume_data = resume_data_from_fields(fields)
+            missing = [name for name in REQUIRED_RESUME_FIELDS if not _found(getattr(resume_data, name))]
+            if mode == "tool" or not missing:
+                return resume_data
+            print(f"Resume parser could not find {', '.join(missing)}; falling back to ResumeParserCrew")
+
+    result = kickoff_crew(
+                ResumeParserCrew,
+                inputs={
+                    "file_path": file_path
+                }
+            )
+    return result.pydantic
+
+def flow_run_id(flow: Flow) -> str:
+    """ID of the flow's run: passed in when resuming, otherwise the flow ID."""
+    if not flow.state.run_id:
+        flow.state.run_id = flow.state.id
+    return flow.state.run_id
+
+def run_results(flow: Flow) -> Optional[RunResults]:
+    """Buffered result writer for the flow's run (None with ATS_RESULTS=0)."""
+    store = get_result_store()
+    if store is None:
+        return None
+    return store.run(flow_run_id(flow), type(flow).__name__)
+
+def score_stage(state: LeadScoreState) -> str:
+    """Checkpoint stage of the scores; rescoring with feedback starts a new one."""
+    if not state.scored_leads_feedback:
+        return "score"
+    return f"score:{cache_key(state.scored_leads_feedback)[:12]}"
+
+def start_checkpoint(flow: Flow):
+    checkpoint = get_flow_checkpoint()
+    if checkpoint is not None:
+        checkpoint.start(flow_run_id(flow), type(flow).__name__, {
+            "jd": flow.state.jd,
+            "candidate_resumes": flow.state.candidate_resumes,
+        })
+        print(f"Employer run {flow_run_id(flow)}; resume_employer_run('{flow_run_id(flow)}') continues it if interrupted")
+
+def checkpointed(flow: Flow, stage: str, model) -> Dict[str, BaseModel]:
+    """Items of a stage finished before the run was interrupted, by candidate ID."""
+    checkpoint = get_flow_checkpoint()
+    if checkpoint is None:
+        return {}
+    return checkpoint.load(flow_run_id(flow), stage, model)
+
+def record_results(flow: Flow, candidates=(), filters=(), scores=(), flush: bool = False, restored: bool = False):
+    """
+    Checkpoint candidates, filter results and scores as they are produced and
+    append them to the run's results. Items `restored` from the checkpoint are
+    only written to the results: rows still buffered when the run was
+    interrupted never reached the store, and writing a row again replaces it.
+    """
+    checkpoint = get_flow_checkpoint()
+    if checkpoint is not None and not restored:
+        checkpoint.save(flow_run_id(flow), "extract", list(candidates))
+        checkpoint.save(flow_run_id(flow), "filter", list(filters))
+        checkpoint.save(flow_run_id(flow), score_stage(flow.state), list(scores))
+    results = run_results(flow)
+    if results is None:
+        return
+    if candidates:
+        results.add_candidates(candidates)
+    if filters:
+        results.add_filters(filters)
+    if scores:
+        results.add_scores(scores)
+    if flush:
+        results.flush()
+
+def finish_run(flow: Flow):
+    """Write the last results and drop the run's checkpoint."""
+    results = run_results(flow)
+    if results is not None:
+        results.finish()
+    checkpoint = get_flow_checkpoint()
+    if checkpoint is not None:
+        checkpoint.finish(flow_run_id(flow))
 
 
 #Employer flow
 class LeadScoreFlow(Flow[LeadScoreState]):
     @start()
-    def load_leads(self):
-        id=0
-        candidates=[]
-        for resume_file in self.state.candidate_resumes:
-            # Step 1: Extract structured candidate info
-            id+=1
-            candidate_info = extract_candidate_info(resume_file["content"],resume_file["id"])
-            candidates.append(candidate_info)
-        with open("candidates_info.csv", "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(["id", "name", "email", "bio","years_of_exp","skills"])
-            for candidate in candidates:
-                writer.writerow(
-                    [
-                        candidate.id,
-                        candidate.name,
-                        candidate.email,
-                        candidate.bio,
-                        candidate.years_of_exp,
-                        candidate.skills
-                    ]
-                )
-        #print("Candidates info saved to candidates_info.csv")   
+    async def load_leads(self):
+        start_checkpoint(self)
+        # Resumes extracted before an interruption are not sent to the LLM again
+        extracted = checkpointed(self, "extract", Candidate)
+        record_results(self, candidates=list(extracted.values()), restored=True)
+        pending = [resume for resume in self.state.candidate_resumes if str(resume["id"]) not in extracted]
+
+        # Step 1: Extract structured candidate info concurrently, checkpointing each one
+        for candidate in await extract_candidates_async(
+            pending, on_extracted=lambda candidate: record_results(self, candidates=[candidate])
+        ):
+            if candidate is not None:
+                extracted[candidate.id] = candidate
+        candidates=[extracted[str(resume["id"])] for resume in self.state.candidate_resumes if str(resume["id"]) in extracted]
+        record_results(self, flush=True)
         # Update the state with the loaded candidates
         self.state.candidates = candidates
     
@@ -78,43 +349,41 @@ class LeadScoreFlow(Flow[LeadScoreState]):
         #print("First level filtering of leads")
         tasks = []
 
-        async def filter_candidate(candidate: Candidate):
-            result = await (
-                LeadFilterCrew()
-                .crew()
-                .kickoff_async(
-                    inputs={
-                        "candidate_id": candidate.id,
-                        "name": candidate.name,
-                        "bio": candidate.bio,
-                        "years_of_exp": candidate.years_of_exp,
-                        "skills": candidate.skills,
-                        "job_description": self.state.jd,
-                    }
-                )
-            )
-    
-            self.state.candidate_filters.append(result.pydantic)
+        # Clear-cut candidates are decided locally; only the rest go to the LLM
+        decided, ambiguous = prefilter_candidates(self.state.candidates, self.state.jd)
+        self.state.candidate_filters.extend(decided)
+        record_results(self, filters=decided)
+        if self.state.candidates:
+            self.state.prefilter_avoided_share = len(decided) / len(self.state.candidates)
+        print(
+            f"Pre-filter decided {len(decided)} of {len(self.state.candidates)} candidates locally "
+            f"({self.state.prefilter_avoided_share:.0%} of LeadFilterCrew calls avoided)"
+        )
 
-        for candidate in self.state.candidates:
+        # Decisions made before an interruption are reused
+        done = checkpointed(self, "filter", CandidateFilter)
+        reused = [done[c.id] for c in ambiguous if c.id in done]
+        self.state.candidate_filters.extend(reused)
+        record_results(self, filters=reused, restored=True)
+        ambiguous = [candidate for candidate in ambiguous if candidate.id not in done]
+
+        async def filter_single_candidate(candidate: Candidate):
+            result = await filter_candidate(candidate, self.state.jd)
+            if result is None:
+                print(f"No filter result for candidate {candidate.id}")
+                return
+            result = result.model_copy(update={"id": candidate.id})
+            self.state.candidate_filters.append(result)
+            record_results(self, filters=[result])
+
+        for candidate in ambiguous:
             #print("Scoring candidate:", candidate.name)
-            task = asyncio.create_task(filter_candidate(candidate))
+            task = asyncio.create_task(filter_single_candidate(candidate))
             tasks.append(task)
 
         candidate_filters = await asyncio.gather(*tasks)
         #print("Finished filtering leads: ", len(candidate_filters))
-        with open("filtered_candidates.csv", "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(["id", "result", "reason"])
-            for candidate in self.state.candidate_filters:
-                writer.writerow(
-                    [
-                        candidate.id,
-                        candidate.result,
-                        candidate.reason,
-                    ]
-                )
-        #print("Filtered Candidates info saved to filtered_candidates.csv")   
+        record_results(self, flush=True)
 
         #Filter failed candidates as a seperate list 
         self.state.failed_candidates = [
@@ -155,44 +424,97 @@ class LeadScoreFlow(Flow[LeadScoreState]):
             if candidate.id in resume_lookup:
                 candidate.bio = resume_lookup[candidate.id]
 
-        tasks = []
+        self.shortlist_leads()
 
-        async def score_single_candidate(candidate: Candidate):
-            result = await (
-                LeadScoreCrew()
-                .crew()
-                .kickoff_async(
-                    inputs={
-                        "candidate_id": candidate.id,
-                        "name": candidate.name,
-                        "bio": candidate.bio,
-                        "job_description": self.state.jd,
-                        "additional_instructions": self.state.scored_leads_feedback,
-                    }
-                )
+        def keep(score: CandidateScore):
+            # A new score replaces the candidate's stale one
+            self.state.candidate_score[score.id] = score
+            self.state.score_revisions[score.id] = self.state.feedback_revision
+
+        # After feedback only the candidates it could move across the shortlist are rescored
+        stale = {candidate.id for candidate in self.state.candidates}
+        if self.state.feedback_revision and os.getenv("ATS_RESCORE", "incremental").lower() != "all":
+            stale = select_for_rescoring(
+                self.state.candidate_score,
+                top_n=int(os.getenv("ATS_RESCORE_TOP_N", "10")),
+                band=int(os.getenv("ATS_RESCORE_BAND", "10")),
             )
+        to_score = [c for c in self.state.candidates if c.id in stale or c.id not in self.state.candidate_score]
+        if self.state.feedback_revision:
+            print(f"Rescoring {len(to_score)} of {len(self.state.candidates)} candidates with feedback revision {self.state.feedback_revision}")
+
+        # Scores given before an interruption (for the same feedback) are reused
+        done = checkpointed(self, score_stage(self.state), CandidateScore)
+        reused = [done[candidate.id] for candidate in to_score if candidate.id in done]
+        for score in reused:
+            keep(score)
+        record_results(self, scores=reused, restored=True)
+        to_score = [candidate for candidate in to_score if candidate.id not in done]
 
-            self.state.candidate_score.append(result.pydantic)
+        tasks = []
 
-        for candidate in self.state.candidates:
-            #print("Scoring candidate:", candidate.name)
-            task = asyncio.create_task(score_single_candidate(candidate))
-            tasks.append(task)
+        async def score_single_candidate(candidate: Candidate):
+            score = await score_candidate(candidate, self.state.jd, self.state.scored_leads_feedback)
+            if score is not None:
+                score = score.model_copy(update={"id": candidate.id})
+                keep(score)
+                record_results(self, scores=[score])
+
+        async def score_batch(batch: List[Candidate]):
+            scores = await score_candidate_batch(batch, self.state.jd, self.state.scored_leads_feedback)
+            scores = [score for score in scores if score is not None]
+            for score in scores:
+                keep(score)
+            record_results(self, scores=scores)
+
+        batch_size = int(os.getenv("ATS_SCORE_BATCH_SIZE", "1"))
+        if batch_size > 1:
+            for start in range(0, len(to_score), batch_size):
+                task = asyncio.create_task(score_batch(to_score[start:start + batch_size]))
+                tasks.append(task)
+        else:
+            for candidate in to_score:
+                #print("Scoring candidate:", candidate.name)
+                task = asyncio.create_task(score_single_candidate(candidate))
+                tasks.append(task)
 
         candidate_scores = await asyncio.gather(*tasks)
         #print("Finished scoring leads")
-        with open("scored_candidates.csv", "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(["id", "score", "reason"])
-            for candidate in self.state.candidate_score:
-                writer.writerow(
-                    [
-                        candidate.id,
-                        candidate.score,
-                        candidate.reason,
-                    ]
-                )
-        #print("Scored Candidates info saved to scored_candidates.csv")   
+        record_results(self, flush=True)
+
+    def shortlist_leads(self):
+        """
+        Keep only the ATS_SHORTLIST_K candidates whose resumes are most similar
+        to the job description (all of them when unset or 0). The rest are
+        rejected without an LLM call.
+        """
+        k = int(os.getenv("ATS_SHORTLIST_K", "0"))
+        if k <= 0 or len(self.state.candidates) <= k:
+            return
+
+        # Vectorize every uploaded resume together, then rank the remaining candidates
+        resumes = self.state.candidate_resumes
+        similarity = SimilarityIndex([resume["content"] or "" for resume in resumes]).scores(self.state.jd)
+        score_by_id = {resume["id"]: similarity[i] for i, resume in enumerate(resumes)}
+        ranked = sorted(self.state.candidates, key=lambda c: score_by_id.get(c.id, 0.0), reverse=True)
+
+        self.state.candidates = ranked[:k]
+        cut = [
+            CandidateFilter(
+                id=candidate.id,
+                name=candidate.name,
+                email=candidate.email,
+                result="Fail",
+                reason="Other candidates' resumes were a closer match to the job description.",
+            )
+            for candidate in ranked[k:]
+        ]
+        # The decisions on record match the rejection emails
+        cut_by_id = {candidate_filter.id: candidate_filter for candidate_filter in cut}
+        self.state.candidate_filters = [cut_by_id.get(f.id, f) for f in self.state.candidate_filters]
+        self.state.failed_candidates.extend(cut)
+        record_results(self, filters=cut, flush=True)
+        print(f"Shortlisted {k} of {len(ranked)} candidates for scoring")
 
     @router(score_leads)
     def human_in_the_loop(self):
@@ -200,7 +522,7 @@ class LeadScoreFlow(Flow[LeadScoreState]):
 
         # Combine candidates with their scores using the helper function
         self.state.hydrated_candidates = combine_candidates_with_scores(
-            self.state.candidates, self.state.candidate_score
+            self.state.candidates, list(self.state.candidate_score.values())
         )
 
         # Sort the scored candidates by their score in descending order
@@ -230,6 +552,7 @@ class LeadScoreFlow(Flow[LeadScoreState]):
                 "\nPlease provide additional feedback on what you're looking for in candidates:\n"
             )
             self.state.scored_leads_feedback = feedback
+            self.state.feedback_revision += 1
             #print("\nRe-running lead scoring with your feedback...")
             return "scored_leads_feedback"
         elif choice == "3":
@@ -241,9 +564,6 @@ class LeadScoreFlow(Flow[LeadScoreState]):
 
     @listen("generate_emails")
     async def write_and_save_emails(self):
-        import re
-        from pathlib import Path
-
         #print("Writing and saving emails for all leads.")
 
         # Determine the top 3 candidates to proceed with
@@ -262,36 +582,7 @@ class LeadScoreFlow(Flow[LeadScoreState]):
         async def write_email(candidate):
             # Check if the candidate is among the top 3
             proceed_with_candidate = candidate.id in top_candidate_ids
-
-            # Kick off the LeadResponseCrew for each candidate
-            result = await (
-                LeadResponseCrew()
-                .crew()
-                .kickoff_async(
-                    inputs={
-                        "candidate_id": candidate.id,
-                        "name": candidate.name,
-                        "reason": candidate.reason,
-                        "proceed_with_candidate": proceed_with_candidate,
-                    }
-                )
-            )
-
-            # Sanitize the candidate's name to create a valid filename
-            safe_name = re.sub(r"[^a-zA-Z0-9_\- ]", "", candidate.name)
-            filename = f"{safe_name}.txt"
-            #print("Filename:", filename)
-
-            # Write the email content to a text file
-            file_path = output_dir / filename
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(result.raw)
-            
-            #Send the corresponding email to each candidate
-            send_email(file_path,candidate.email)
-
-            # Return a message indicating the email was saved
-            return f"Email sent for {candidate.name} as {filename} to {candidate.email}"
+            return await write_candidate_email(candidate, proceed_with_candidate, output_dir, self.state.jd)
         
         #Create a composite list for all candidates 
         candidate_list = self.state.hydrated_candidates + self.state.failed_candidates
@@ -308,6 +599,143 @@ class LeadScoreFlow(Flow[LeadScoreState]):
         #print("\nAll emails have been written and saved to 'email_responses' folder.")
         # for message in email_results:
         #     print(message)
+        finish_run(self)
+    def reset(self):
+        self.agents = []
+        self.tasks = []
+        self.memory = None
+
+
+# Employer flow, streaming mode
+class StreamingLeadScoreFlow(Flow[LeadScoreState]):
+    """
+    Streaming variant of LeadScoreFlow. Every candidate goes through
+    extraction, filtering and scoring on its own, and a rejection email is
+    sent as soon as it fails; choosing the top 3 is the only barrier.
+    """
+
+    @start()
+    async def stream_leads(self):
+        start_checkpoint(self)
+        extracted = checkpointed(self, "extract", Candidate)
+        filtered = checkpointed(self, "filter", CandidateFilter)
+        scored = checkpointed(self, score_stage(self.state), CandidateScore)
+        terms = JobTerms(self.state.jd)
+        output_dir = Path("email_responses")
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        # With ATS_SHORTLIST_K set, only the K passing candidates with the most similar resumes are scored
+        shortlist = None
+        k = int(os.getenv("ATS_SHORTLIST_K", "0"))
+        resumes = self.state.candidate_resumes
+        if 0 < k < len(resumes):
+            similarity = SimilarityIndex([resume["content"] or "" for resume in resumes]).scores(self.state.jd)
+            shortlist = StreamingShortlist([str(resume["id"]) for resume in resumes], similarity, k)
+
+        decided = 0
+        semaphore = asyncio.Semaphore(max(1, int(os.getenv("ATS_EXTRACT_CONCURRENCY", "8"))))
+
+        async def process_candidate(resume_file, client):
+            try:
+                await stream_candidate(resume_file, client)
+            finally:
+                # Candidates that dropped out before passing free their place on the shortlist
+                if shortlist is not None:
+                    shortlist.report(str(resume_file["id"]), False)
+
+        async def stream_candidate(resume_file, client):
+            nonlocal decided
+            # Work checkpointed before an interruption is picked up where it stopped
+            candidate = extracted.get(str(resume_file["id"]))
+            if candidate is None:
+                async with semaphore:
+                    candidate = await extract_candidate_info_async(resume_file["content"], resume_file["id"], client)
+                if candidate is None:
+                    return
+                record_results(self, candidates=[candidate])
+            else:
+                record_results(self, candidates=[candidate], restored=True)
+            self.state.candidates.append(candidate)
+
+            result, reason = prefilter_candidate(candidate, terms)
+            if result is not None:
+                decided += 1
+            candidate_filter = filtered.get(candidate.id)
+            if candidate_filter is None:
+                if result is None:
+                    candidate_filter = await filter_candidate(candidate, self.state.jd)
+                    if candidate_filter is None:
+                        print(f"No filter result for candidate {candidate.id}")
+                        return
+                else:
+                    candidate_filter = CandidateFilter(id=candidate.id, name=candidate.name, email=candidate.email, result=result, reason=reason)
+                candidate_filter = candidate_filter.model_copy(update={"id": candidate.id, "email": candidate.email})
+                record_results(self, filters=[candidate_filter])
+            else:
+                record_results(self, filters=[candidate_filter], restored=True)
+
+            if candidate_filter.result == "Pass" and shortlist is not None:
+                shortlist.report(str(resume_file["id"]), True)
+                if not await shortlist.admitted(str(resume_file["id"])):
+                    # The decision on record matches the rejection email
+                    candidate_filter = candidate_filter.model_copy(update={
+                        "result": "Fail",
+                        "reason": "Other candidates' resumes were a closer match to the job description.",
+                    })
+                    record_results(self, filters=[candidate_filter])
+            self.state.candidate_filters.append(candidate_filter)
+            if candidate_filter.result != "Pass":
+                # Rejections go out straight away instead of waiting for the batch
+                self.state.failed_candidates.append(candidate_filter)
+                await write_candidate_email(candidate_filter, False, output_dir, self.state.jd)
+                return
+
+            candidate.bio = resume_file["content"]
+            score = scored.get(candidate.id)
+            if score is None:
+                score = await score_candidate(candidate, self.state.jd, self.state.scored_leads_feedback)
+                if score is None:
+                    return
+                score = score.model_copy(update={"id": candidate.id})
+                record_results(self, scores=[score])
+            else:
+                record_results(self, scores=[score], restored=True)
+            self.state.candidate_score[candidate.id] = score
+            self.state.score_revisions[candidate.id] = self.state.feedback_revision
+
+        async with AsyncOpenAI(max_retries=0) as client:
+            await asyncio.gather(*(process_candidate(resume_file, client) for resume_file in resumes))
+
+        # Candidates finish in any order; keep the upload order in state
+        order = {resume["id"]: i for i, resume in enumerate(resumes)}
+        self.state.candidates.sort(key=lambda c: order.get(c.id, len(order)))
+        self.state.candidate_filters.sort(key=lambda c: order.get(c.id, len(order)))
+        self.state.candidate_score = dict(sorted(self.state.candidate_score.items(), key=lambda item: order.get(item[0], len(order))))
+        if self.state.candidates:
+            self.state.prefilter_avoided_share = decided / len(self.state.candidates)
+        record_results(self, flush=True)
+
+    @listen(stream_leads)
+    def select_top_candidates(self):
+        scored = [candidate for candidate in self.state.candidates if candidate.id in self.state.candidate_score]
+        self.state.hydrated_candidates = sorted(
+            combine_candidates_with_scores(scored, list(self.state.candidate_score.values())),
+            key=lambda c: c.score,
+            reverse=True,
+        )
+        self.state.top_candidates = self.state.hydrated_candidates[:3]
+
+    @listen(select_top_candidates)
+    async def write_and_save_emails(self):
+        # Failed candidates were emailed while streaming; only scored ones are left
+        output_dir = Path("email_responses")
+        top_candidate_ids = {candidate.id for candidate in self.state.top_candidates}
+        await asyncio.gather(*(
+            write_candidate_email(candidate, candidate.id in top_candidate_ids, output_dir, self.state.jd)
+            for candidate in self.state.hydrated_candidates
+        ))
+        finish_run(self)
+
     def reset(self):
         self.agents = []
         self.tasks = []
@@ -318,13 +746,7 @@ class LeadScoreFlow(Flow[LeadScoreState]):
 class CandidateScoreFlow(Flow[CandidateScoreState]):
     @start()
     def extract_job_descrpn(self):
-        result = WebScraperCrew().crew().kickoff(
-                    inputs={
-                        "job_description": self.state.jd,
-                    }
-                )
-        # Extract the actual string
-        job_description = str(result)
+        job_description = load_job_description(self.state.jd)
         #print("Extracted website content:", job_description)
         #print(self.state.file_path)
 
@@ -334,17 +756,13 @@ class CandidateScoreFlow(Flow[CandidateScoreState]):
     @listen(extract_job_descrpn)
     def parse_resume(self):
         #Extract data from resume
-        result =ResumeParserCrew().crew().kickoff(
-                    inputs={
-                        "file_path": self.state.file_path
-                    }
-                )
-        self.state.resume_data=result.pydantic
+        self.state.resume_data=parse_resume_file(self.state.file_path)
         #print(self.state.resume_data)
     
     @listen(parse_resume)
     def score_resume(self):
-        result = ResumeScoreCrew().crew().kickoff(
+        result = kickoff_crew(
+            ResumeScoreCrew,
             inputs={
                     "name": self.state.resume_data.name,
                     "email": self.state.resume_data.email,
@@ -375,13 +793,7 @@ class ImproveResumeFlow(Flow[ImproveResumeState]):
     @start()
     def extract_job_descrpn(self):
         if self.state.jd:
-            result = WebScraperCrew().crew().kickoff(
-                        inputs={
-                            "job_description": self.state.jd,
-                        }
-                    )
-            # Extract the actual string
-            job_description = str(result)
+            job_description = load_job_description(self.state.jd)
         else:
             job_description=""
         #print("Extracted website content:", job_description)
@@ -393,10 +805,21 @@ class ImproveResumeFlow(Flow[ImproveResumeState]):
     def score_resume(self):
         if self.state.is_rewrite:
             resume_data=self.state.improved_resume.resume_data
+            previous = self.state.rewrite_score or self.state.initial_score
+            local_score = self.estimate_rewrite_score(resume_data)
+            if local_score is not None:
+                self.state.llm_rescores_skipped += 1
+                if local_score is not previous:
+                    self.state.last_score_estimated = True
+                self.state.rewrite_score = local_score
+                self.state.improved_resume.score = local_score.score
+                self.state.last_scored_resume = resume_data
+                return
         else:
             resume_data=self.state.resume_data
             
-        result = LeadScoreCrew().crew().kickoff(
+        result = kickoff_crew(
+                LeadScoreCrew,
                 inputs={
                     "candidate_id": "1",
                     "name": "",
@@ -412,6 +835,54 @@ class ImproveResumeFlow(Flow[ImproveResumeState]):
         else:
             self.state.initial_score= result.pydantic
             #print("INITIAL SCORE IS ",self.state.initial_score.score)
+            if local_rescore_enabled() and self.state.jd:
+                # The estimate only saves LLM calls; without it every rewrite is rescored by the model
+                try:
+                    self.state.initial_local_score = local_ats_score(resume_data, self.state.jd)
+                except Exception as e:
+                    print(f"Local ATS score failed, rescoring rewrites with the LLM: {e}")
+        self.state.last_scored_resume = resume_data
+        self.state.last_score_estimated = False
+
+    def estimate_rewrite_score(self, resume_data: str) -> Optional[CandidateScore]:
+        """
+        Score of a rewrite without calling LeadScoreCrew, or None when the LLM
+        should score it. A rewrite identical to the last scored resume keeps
+        that score. Otherwise the initial LLM score is moved by the change in
+        local_ats_score, and the estimate is used only when it is more than
+        ATS_LOCAL_RESCORE_MARGIN below the target with another rewrite still
+        to come. The local score is mostly keyword coverage, which rewrites
+        are prompted to raise, so an estimated pass is always confirmed by
+        the LLM before the flow finishes on it, and the last round always ends
+        on a model score.
+        """
+        if self.state.initial_local_score is None:
+            return None
+        last_round = self.state.rewrite_count > 2
+        previous = self.state.rewrite_score or self.state.initial_score
+        if resume_data.strip() == self.state.last_scored_resume.strip():
+            return None if last_round and self.state.last_score_estimated else previous
+        if last_round:
+            return None
+
+        try:
+            local_score = local_ats_score(resume_data, self.state.jd)
+        except Exception as e:
+            print(f"Local ATS score failed, rescoring the rewrite with the LLM: {e}")
+            return None
+        estimate = self.state.initial_score.score + local_score - self.state.initial_local_score
+        estimate = int(round(min(100, max(0, estimate))))
+        if estimate >= TARGET_SCORE - rescore_margin():
+            return None
+        return CandidateScore(
+            id=previous.id,
+            score=estimate,
+            reason=(
+                f"Estimated locally from keyword coverage, sections and length: well below the target of "
+                f"{TARGET_SCORE}, so the rewrite was not rescored by the model. Previous assessment: {previous.reason}"
+            ),
+        )
+
     @router("score_resume")
     def rewrite_condition_check(self):
         if self.state.is_rewrite:
@@ -419,14 +890,15 @@ class ImproveResumeFlow(Flow[ImproveResumeState]):
         else:
             resume_score=self.state.initial_score.score
         #print("REWRITE COUNT ",self.state.rewrite_count)
-        if int(resume_score) < 85 and self.state.rewrite_count<=2:
+        if int(resume_score) < TARGET_SCORE and self.state.rewrite_count<=2:
             return "improve_resume"
     
     @listen("improve_resume")
     def rewrite_resume(self):
         #Rewrite resume
         #print("IN REWRITE RESUME job description is : ",self.state.jd)
-        result =RewriteResumeCrew().crew().kickoff(
+        result =kickoff_crew(
+                    RewriteResumeCrew,
                     inputs={
                         "resume_data": self.state.resume_data,
                         "job_description": self.state.jd,
@@ -445,10 +917,31 @@ def employer_kickoff(jd,candidate_resumes):
     """
     Run the flow.
     """
-    lead_score_flow = LeadScoreFlow()
+    if os.getenv("ATS_STREAMING", "0").lower() in ("1", "true", "yes"):
+        lead_score_flow = StreamingLeadScoreFlow()
+    else:
+        lead_score_flow = LeadScoreFlow()
     lead_score_flow.reset()
     lead_score_flow.kickoff(inputs={"jd":jd,"candidate_resumes":candidate_resumes})
-    plot()
+    plot(type(lead_score_flow))
+    return lead_score_flow
+
+def resume_employer_run(run_id: str):
+    """
+    Continue an interrupted employer run from its checkpoint. Candidates that
+    were already extracted, filtered or scored are not sent to the LLM again,
+    and emails already queued are not written again.
+    """
+    checkpoint = get_flow_checkpoint()
+    run = checkpoint.run(run_id) if checkpoint is not None else None
+    if run is None:
+        raise ValueError(f"No checkpoint for run {run_id}; it finished or was never started")
+    if run["flow"] == StreamingLeadScoreFlow.__name__:
+        lead_score_flow = StreamingLeadScoreFlow()
+    else:
+        lead_score_flow = LeadScoreFlow()
+    lead_score_flow.reset()
+    lead_score_flow.kickoff(inputs={"run_id": run_id, **run["inputs"]})
     return lead_score_flow
 
 def candidate_kickoff(jd,file_path):
@@ -472,11 +965,11 @@ def improve_resume_for_ats(resume_data,jd):
     return improve_resume_flow
 
 
-def plot():
+def plot(flow_cls=LeadScoreFlow):
     """
     Plot the flow.
     """
-    lead_score_flow = LeadScoreFlow()
+    lead_score_flow = flow_cls()
     lead_score_flow.plot()
 
 def cand_plot():
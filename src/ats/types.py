@@ -32,6 +32,9 @@ class CandidateScore(BaseModel):
     score: int
     reason: str
 
+class CandidateScoreBatch(BaseModel):
+    scores: List[CandidateScore]
+
 
 class ScoredCandidate(BaseModel):
     id: str
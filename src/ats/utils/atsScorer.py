@@ -0,0 +1,65 @@
+import os
+import re
+
+from src.ats.utils.keywordEngine import doc_lemmas, jd_keywords, parse_texts
+
+# Score the LLM has to reach before ImproveResumeFlow stops rewriting
+TARGET_SCORE = 85
+
+EXPECTED_SECTIONS = {
+    "summary": ["summary", "objective", "professional summary", "profile"],
+    "skills": ["skills", "technical skills", "core competencies"],
+    "experience": ["experience", "work experience", "professional experience", "employment"],
+    "education": ["education", "academic background"],
+}
+HEADING_PATTERN = re.compile(r"^[#*\s]*([A-Za-z][A-Za-z ]{2,40}?)[*:\s-]*$", re.MULTILINE)
+
+# Word counts between these bounds get the full length score
+MIN_WORDS, MAX_WORDS = 250, 1000
+
+
+def keyword_coverage(resume_text: str, jd_text: str) -> float:
+    """Share of the JD keywords whose lemma occurs in the resume."""
+    keywords = jd_keywords(jd_text)
+    if not keywords:
+        return 1.0
+    lemmas = doc_lemmas(parse_texts([resume_text.lower()])[0])
+    return len(keywords & lemmas) / len(keywords)
+
+
+def section_presence(resume_text: str) -> float:
+    """Share of the summary, skills, experience and education sections with a heading."""
+    headings = {match.group(1).strip().lower() for match in HEADING_PATTERN.finditer(resume_text)}
+    found = [any(name in headings for name in names) for names in EXPECTED_SECTIONS.values()]
+    return sum(found) / len(found)
+
+
+def length_score(resume_text: str) -> float:
+    words = len(resume_text.split())
+    if words < MIN_WORDS:
+        return words / MIN_WORDS
+    if words > MAX_WORDS:
+        return max(0.0, 1 - (words - MAX_WORDS) / MAX_WORDS)
+    return 1.0
+
+
+def local_ats_score(resume_text: str, jd_text: str) -> float:
+    """
+    Deterministic 0-100 ATS estimate: 70% keyword coverage, 20% section
+    presence and 10% length. It is not calibrated against LeadScoreCrew, so
+    it is used for score differences rather than as a score on its own.
+    """
+    return 100 * (
+        0.7 * keyword_coverage(resume_text, jd_text)
+        + 0.2 * section_presence(resume_text)
+        + 0.1 * length_score(resume_text)
+    )
+
+
+def rescore_margin() -> float:
+    """How far the estimate must be from TARGET_SCORE to skip the LLM (ATS_LOCAL_RESCORE_MARGIN)."""
+    return float(os.getenv("ATS_LOCAL_RESCORE_MARGIN", 10))
+
+
+def local_rescore_enabled() -> bool:
+    return os.getenv("ATS_LOCAL_RESCORE", "1").lower() not in ("0", "false", "no")
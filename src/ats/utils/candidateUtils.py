@@ -1,39 +1,87 @@
-from typing import List
+import multiprocessing
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
 
-from src.ats.types import Candidate, CandidateScore, ScoredCandidate
-import csv
-from  openai import OpenAI,OpenAIError  
-import docx
-import pdfplumber
+from src.ats.types import Candidate, CandidateScore, CandidateScoreBatch, ScoredCandidate
+from  openai import OpenAI,AsyncOpenAI,OpenAIError  
 import json
 import os
-import csv
-import smtplib
-from email.mime.text import MIMEText
+import asyncio
 import base64
+import time
 import streamlit as st
+from src.ats.utils.emailOutbox import get_email_outbox
+from src.ats.utils.llmCache import cache_key,get_llm_cache,schema_fingerprint
+from src.ats.utils.llmMetrics import get_llm_metrics,token_counts
+from src.ats.utils.llmScheduler import get_scheduler
+from src.ats.utils.mailer import build_message,get_mailer
+from src.ats.utils.textExtraction import DOCX_TYPES,PDF_TYPES,extract_text
 
 def extract_text_from_pdf(file):
-    text = ""
-    with pdfplumber.open(file) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text() + "\n"
-    return text
+    return extract_text(file, "pdf")
 
 def extract_text_from_docx(file):
-    doc = docx.Document(file)
-    text = "\n".join([para.text for para in doc.paragraphs])
-    return text
+    return extract_text(file, "docx")
 
 def get_resume_text(file):
-    if file.type == "application/pdf":
+    if file.type in PDF_TYPES:
         return extract_text_from_pdf(file)
-    elif file.type in ["application/vnd.openxmlformats-officedocument.wordprocessingml.document", "application/msword"]:
+    elif file.type in DOCX_TYPES:
         return extract_text_from_docx(file)
     else:
         return None
 
-def extract_candidate_info(resume_text,id)-> Candidate:
+def extract_resume_text(data: bytes, content_type: str):
+    """Text of one resume given its raw bytes and MIME type (None if unsupported)."""
+    if content_type in PDF_TYPES:
+        return extract_text_from_pdf(data)
+    elif content_type in DOCX_TYPES:
+        return extract_text_from_docx(data)
+    else:
+        return None
+
+def extract_resume_texts(files: List[Tuple[bytes, str]], timeout: float = None, max_workers: int = None) -> List[Optional[str]]:
+    """
+    Extract text from many resumes in a pool of worker processes, one per core.
+    `files` holds (bytes, MIME type) pairs. Results are in the same order, with
+    None for files that are unsupported, fail, or take longer than `timeout`
+    seconds (ATS_EXTRACT_TIMEOUT, default 30). A worker stuck on a file is
+    killed and the pool restarted for the files still outstanding.
+    """
+    if timeout is None:
+        timeout = float(os.getenv("ATS_EXTRACT_TIMEOUT", "30"))
+    if max_workers is None:
+        max_workers = int(os.getenv("ATS_EXTRACT_WORKERS", "0")) or os.cpu_count() or 1
+
+    results = [None] * len(files)
+    pending = list(range(len(files)))
+    while pending:
+        with multiprocessing.Pool(min(max_workers, len(pending))) as pool:
+            jobs = {i: pool.apply_async(extract_resume_text, files[i]) for i in pending}
+            outstanding = []
+            for position, i in enumerate(pending):
+                try:
+                    results[i] = jobs[i].get(timeout)
+                except multiprocessing.TimeoutError:
+                    print(f"Resume {i + 1} timed out after {timeout:g}s")
+                    # Keep what already finished; the rest go to a fresh pool
+                    for j in pending[position + 1:]:
+                        if not jobs[j].ready():
+                            outstanding.append(j)
+                            continue
+                        try:
+                            results[j] = jobs[j].get(0)
+                        except Exception as e:
+                            print(f"Error extracting resume {j + 1}: {e}")
+                    break
+                except Exception as e:
+                    print(f"Error extracting resume {i + 1}: {e}")
+        # Leaving the with-block terminates the pool, including a stuck worker
+        pending = outstanding
+    return results
+
+def _candidate_info_request(resume_text):
+    """Build the chat completion arguments used to extract candidate info."""
     prompt = (
         f"Extract the following information from the candidate resume:\n"
         f"- Full Name\n"
@@ -58,18 +106,54 @@ def extract_candidate_info(resume_text,id)-> Candidate:
     "description": "Extracts structured candidate information from a resume.",
     "parameters": Candidate.model_json_schema()
     }   
-    
+
+    return dict(
+        model="gpt-4o",
+        messages=[
+            {"role": "system", "content": "You are an expert resume screener and recruiter."},
+            {"role": "user", "content": prompt}
+        ],
+        functions=[candidate_schema],
+        function_call={"name": "extract_candidate_info"},
+    )
+
+def _cached_candidate_args(request):
+    """Return (cache, key, cached function arguments) for an extraction request."""
+    cache = get_llm_cache()
+    if cache is None:
+        return None, None, None
+    key = cache_key("extract_candidate_info", request["messages"], request["model"], schema_fingerprint(Candidate))
+    cached = cache.get("extract_candidate_info", key)
+    return cache, key, cached["arguments"] if cached else None
+
+def _parse_candidate_info(function_args,id):
+    try:
+        data = json.loads(function_args)
+    except json.JSONDecodeError:
+        # fallback if model responds badly
+        return None
+    data["id"] = str(id)
+    return Candidate(**data)
+
+def _record_extraction(id,seconds=0.0,response=None,outcome="ok"):
+    metrics = get_llm_metrics()
+    if metrics is not None:
+        prompt_tokens, completion_tokens = token_counts(response)
+        metrics.record("extract_candidate_info", seconds=seconds, prompt_tokens=prompt_tokens,
+                       completion_tokens=completion_tokens, outcome=outcome, tags={"candidate_id": str(id)})
+
+def extract_candidate_info(resume_text,id)-> Candidate:
+    request = _candidate_info_request(resume_text)
+    cache, key, function_args = _cached_candidate_args(request)
+    if function_args is not None:
+        _record_extraction(id,outcome="cached")
+        return _parse_candidate_info(function_args,id)
+
     client = OpenAI()
+    started = time.monotonic()
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are an expert resume screener and recruiter."},
-                {"role": "user", "content": prompt}
-            ],
-            functions=[candidate_schema],
-            function_call={"name": "extract_candidate_info"},
-        )
+        response = client.chat.completions.create(**request)
+        _record_extraction(id,time.monotonic() - started,response)
 
         #print("RESPONSE : ",response)
 
@@ -77,16 +161,104 @@ def extract_candidate_info(resume_text,id)-> Candidate:
         function_args = response.choices[0].message.function_call.arguments
     except OpenAIError as e:
         print(f"OpenAI API call failed: {e}")
+        _record_extraction(id,time.monotonic() - started,outcome="failed")
         return None
 
+    candidate = _parse_candidate_info(function_args,id)
+    if cache and candidate:
+        cache.put("extract_candidate_info", key, {"arguments": function_args})
+    return candidate
+
+async def extract_candidate_info_async(resume_text,id,client: AsyncOpenAI)-> Candidate:
+    """
+    Async variant of extract_candidate_info that reuses a shared AsyncOpenAI client.
+    The API call goes through the shared scheduler, which owns rate limiting and retries.
+    """
+    request = _candidate_info_request(resume_text)
+    cache, key, function_args = _cached_candidate_args(request)
+    if function_args is not None:
+        _record_extraction(id,outcome="cached")
+        return _parse_candidate_info(function_args,id)
+
     try:
-        data = json.loads(function_args)
-    except json.JSONDecodeError:
-        # fallback if model responds badly
+        response = await get_scheduler().submit(
+            "extract_candidate_info",
+            lambda: client.chat.completions.create(**request),
+            est_tokens=len(resume_text or "") // 4 + 500,
+            usage=lambda response: response.usage.total_tokens if response.usage else 0,
+            tags={"candidate_id": str(id)},
+        )
+        function_args = response.choices[0].message.function_call.arguments
+    except OpenAIError as e:
+        print(f"OpenAI API call failed: {e}")
         return None
-    data["id"] = str(id)
-    return Candidate(**data)
 
+    candidate = _parse_candidate_info(function_args,id)
+    if cache and candidate:
+        cache.put("extract_candidate_info", key, {"arguments": function_args})
+    return candidate
+
+async def extract_candidates_async(candidate_resumes: List[dict], max_concurrency: int = None, on_extracted=None) -> List[Candidate]:
+    """
+    Extract candidate info for all resumes concurrently with a bounded number of
+    in-flight requests. Results keep the order of candidate_resumes; resumes that
+    could not be extracted are returned as None. `on_extracted` is called with
+    each candidate as soon as it is extracted.
+    """
+    if max_concurrency is None:
+        max_concurrency = int(os.getenv("ATS_EXTRACT_CONCURRENCY", "8"))
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    # Retries are left to the scheduler so 429s slow down every caller
+    async with AsyncOpenAI(max_retries=0) as client:
+        async def extract(resume_file):
+            async with semaphore:
+                candidate = await extract_candidate_info_async(resume_file["content"],resume_file["id"],client)
+            if candidate is not None and on_extracted is not None:
+                on_extracted(candidate)
+            return candidate
+
+        return await asyncio.gather(*(extract(resume_file) for resume_file in candidate_resumes))
+
+
+def format_candidates_batch(candidates: List[Candidate]) -> str:
+    """Render several candidates as one block for the batched scoring prompt."""
+    blocks = [
+        f"Candidate ID: {candidate.id}\nName: {candidate.name}\nBio:\n{candidate.bio}"
+        for candidate in candidates
+    ]
+    return "\n\n---\n\n".join(blocks)
+
+def match_batch_scores(candidates: List[Candidate], batch: CandidateScoreBatch) -> Dict[str, CandidateScore]:
+    """
+    Check a batched scoring answer against the candidate IDs that were sent.
+    Returns the valid scores by ID; IDs that are missing, duplicated or out
+    of range are left out so the caller can rescore them one at a time.
+    """
+    expected = {candidate.id for candidate in candidates}
+    if batch is None:
+        return {}
+    answered = Counter(str(score.id).strip() for score in batch.scores)
+    matched = {}
+    for score in batch.scores:
+        score_id = str(score.id).strip()
+        if score_id in expected and answered[score_id] == 1 and 1 <= score.score <= 100:
+            matched[score_id] = score.model_copy(update={"id": score_id})
+    return matched
+
+def select_for_rescoring(scores: Dict[str, CandidateScore], top_n: int, band: int, shortlist_size: int = 3) -> Set[str]:
+    """
+    IDs of the candidates reviewer feedback can still move across the
+    shortlist: the `top_n` best scored, and those within `band` points of
+    the score that currently makes the top `shortlist_size`.
+    """
+    ranked = sorted(scores.values(), key=lambda score: score.score, reverse=True)
+    if not ranked:
+        return set()
+    cutoff = ranked[min(shortlist_size, len(ranked)) - 1].score
+    selected = {score.id for score in ranked[:top_n]}
+    selected.update(score.id for score in ranked if abs(score.score - cutoff) <= band)
+    return selected
 
 def combine_candidates_with_scores(
     candidates: List[Candidate], candidate_scores: List[CandidateScore]
@@ -116,49 +288,45 @@ def combine_candidates_with_scores(
                 )
             )
 
-    with open("lead_scores.csv", "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["id", "name", "email", "score"])
-        for candidate in scored_candidates:
-            writer.writerow(
-                [
-                    candidate.id,
-                    candidate.name,
-                    candidate.email,
-                    candidate.score
-                ]
-            )
-    #print("Lead scores saved to lead_scores.csv")
+    # The lead scores of a run are the lead_scores view of the result store
     return scored_candidates
 
 def send_email(file_path,to_email):
-    EMAIL_ADDRESS = os.getenv("EMAIL_ADDRESS")
-    EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
-    SMTP_SERVER = 'smtp.gmail.com'
-    SMTP_PORT = 587
+    """Send an email file (first line "Subject: ...") over the pooled SMTP connections."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        if not lines[0].lower().startswith("subject:"):
-            raise ValueError(f"File {file_path} does not start with 'Subject:'")
+        get_mailer().send(build_message(file_path, to_email))
+        #print(f"Email sent to {to_email}")
+    except Exception as e:
+        print(f"Error sending to {to_email}: {e}")
 
-        subject = lines[0][8:].strip()
-        body = "".join(lines[1:]).strip()
+async def send_email_async(file_path,to_email):
+    """send_email for coroutines: the SMTP round trips run on the mailer's threads, not the event loop."""
+    try:
+        await get_mailer().send_async(build_message(file_path, to_email))
+    except Exception as e:
+        print(f"Error sending to {to_email}: {e}")
 
-        msg = MIMEText(body)
-        msg['Subject'] = subject
-        msg['From'] = EMAIL_ADDRESS
-        msg['To'] = to_email
+def candidate_email_key(jd: str, candidate, proceed_with_candidate: bool) -> str:
+    """Idempotency key of a candidate email: one per job description, candidate ID, address and decision."""
+    return cache_key("candidate_email", jd, candidate.id, candidate.email, proceed_with_candidate)
 
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            server.login(EMAIL_ADDRESS, EMAIL_PASSWORD)
-            server.send_message(msg)
-            #print(f"Email sent to {to_email}")
+def email_already_queued(key: str) -> bool:
+    outbox = get_email_outbox()
+    return outbox is not None and outbox.contains(key)
 
+async def queue_email_async(file_path,to_email,key):
+    """
+    Put an email file in the durable outbox and return; its worker delivers it
+    with retries. Sent directly when the outbox is off (ATS_OUTBOX=0).
+    """
+    outbox = get_email_outbox()
+    if outbox is None:
+        await send_email_async(file_path,to_email)
+        return
+    try:
+        await asyncio.to_thread(outbox.enqueue, key, build_message(file_path, to_email))
     except Exception as e:
-        print(f"Error sending to {to_email}: {e}")
+        print(f"Error queueing the email to {to_email}: {e}")
 
 
 def display_resume(file_bytes: bytes, file_name: str):
@@ -0,0 +1,45 @@
+import threading
+
+from crewai import Crew
+
+
+class CrewPool:
+    """
+    Builds each crew once per process and hands out isolated copies.
+
+    Instantiating a @CrewBase class parses its config/*.yaml files and
+    calling .crew() builds the Agents, Tasks and LLM clients. The pool does
+    that once per crew and then serves Crew.copy() clones, which get fresh
+    agents and tasks (so concurrent kickoffs do not share task output or
+    interpolated prompts) while reusing the parsed config and LLM objects.
+
+    Templates are made non-verbose so their copies are too: every Crew sets
+    the verbosity of crewai's one console event listener, which renders a
+    single shared tree that concurrent kickoffs would mutate mid-render.
+    Agents keep their own verbose output.
+    """
+
+    def __init__(self):
+        self._templates = {}
+        self._lock = threading.Lock()
+
+    def template(self, crew_cls, factory: str = "crew") -> Crew:
+        """The shared template crew; never kick it off directly."""
+        key = (crew_cls, factory)
+        with self._lock:
+            if key not in self._templates:
+                template = getattr(crew_cls(), factory)()
+                template.verbose = False
+                self._templates[key] = template
+            return self._templates[key]
+
+    def acquire(self, crew_cls, factory: str = "crew") -> Crew:
+        """A ready-to-kick-off copy of the crew built by `crew_cls().<factory>()`."""
+        return self.template(crew_cls, factory).copy()
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+
+
+crew_pool = CrewPool()
@@ -0,0 +1,152 @@
+from typing import Any, Dict, Optional
+
+from crewai.crews.crew_output import CrewOutput
+
+from src.ats.utils.crewaiCompat import install_thread_safety
+from src.ats.utils.crewPool import crew_pool
+from src.ats.utils.llmCache import cache_key, get_llm_cache, schema_fingerprint
+from src.ats.utils.llmMetrics import get_llm_metrics
+from src.ats.utils.llmScheduler import get_scheduler
+
+# Rough size of the agent/task templates that wrap the inputs, plus the answer
+PROMPT_OVERHEAD_TOKENS = 1000
+COMPLETION_TOKENS = 500
+
+# Kickoffs run concurrently in worker threads
+install_thread_safety()
+
+
+
+def crew_name(crew_cls) -> str:
+    """Readable name of a @CrewBase class, e.g. "LeadScoreCrew"."""
+    name = crew_cls.__name__
+    if name.startswith("CrewBase(") and name.endswith(")"):
+        name = name[len("CrewBase("):-1]
+    return name
+
+
+def _kickoff_name(crew_cls, factory: str) -> str:
+    name = crew_name(crew_cls)
+    return name if factory == "crew" else f"{name}.{factory}"
+
+
+def estimate_tokens(inputs: Dict[str, Any]) -> int:
+    """Approximate tokens for a kickoff (about 4 characters per token)."""
+    chars = sum(len(str(value)) for value in inputs.values())
+    return chars // 4 + PROMPT_OVERHEAD_TOKENS + COMPLETION_TOKENS
+
+
+def _total_tokens(result) -> int:
+    usage = getattr(result, "token_usage", None)
+    return getattr(usage, "total_tokens", 0) or 0
+
+
+def _metric_tags(inputs: Dict[str, Any]) -> dict:
+    # Batch kickoffs are tagged with all the candidates they cover
+    candidate_id = inputs.get("candidate_id") or inputs.get("candidate_ids")
+    return {"candidate_id": candidate_id} if candidate_id else {}
+
+
+def _record_cache_hit(crew_cls, inputs: Dict[str, Any], factory: str):
+    metrics = get_llm_metrics()
+    if metrics is not None:
+        metrics.record(_kickoff_name(crew_cls, factory), seconds=0.0, outcome="cached", tags=_metric_tags(inputs))
+
+
+def _render(template: str, inputs: Dict[str, Any]) -> str:
+    for name, value in inputs.items():
+        template = template.replace("{" + name + "}", str(value))
+    return template
+
+
+def _cache_key(crew_cls, inputs: Dict[str, Any], factory: str) -> str:
+    """Key on crew name, rendered agent/task prompts, models and output schemas."""
+    crew = crew_pool.template(crew_cls, factory)
+    prompts = []
+    for agent in crew.agents:
+        llm = agent.llm
+        prompts.append([
+            getattr(llm, "model", str(llm)),
+            _render(agent.role, inputs),
+            _render(agent.goal, inputs),
+            _render(agent.backstory, inputs),
+        ])
+    for task in crew.tasks:
+        prompts.append([
+            _render(task.description, inputs),
+            _render(task.expected_output, inputs),
+            schema_fingerprint(task.output_pydantic),
+        ])
+    # Inputs are keyed too, in case a placeholder is not interpolated verbatim
+    return cache_key(_kickoff_name(crew_cls, factory), prompts, inputs)
+
+
+def _cached_output(crew_cls, key: str, factory: str) -> Optional[CrewOutput]:
+    cache = get_llm_cache()
+    if cache is None:
+        return None
+    value = cache.get(_kickoff_name(crew_cls, factory), key)
+    if value is None:
+        return None
+    model = crew_pool.template(crew_cls, factory).tasks[-1].output_pydantic
+    pydantic = model(**value["pydantic"]) if model and value.get("pydantic") else None
+    return CrewOutput(raw=value["raw"], pydantic=pydantic, json_dict=value.get("json_dict"))
+
+
+def _store_output(crew_cls, key: str, result: CrewOutput, factory: str):
+    cache = get_llm_cache()
+    if cache is None:
+        return
+    # Do not cache answers that failed to convert to the task's schema
+    if crew_pool.template(crew_cls, factory).tasks[-1].output_pydantic and result.pydantic is None:
+        return
+    cache.put(_kickoff_name(crew_cls, factory), key, {
+        "raw": result.raw,
+        "pydantic": result.pydantic.model_dump() if result.pydantic else None,
+        "json_dict": result.json_dict,
+    })
+
+
+async def kickoff_crew_async(crew_cls, inputs: Dict[str, Any], factory: str = "crew"):
+    """
+    Kick off `crew_cls().<factory>()` through the shared rate-limit-aware
+    scheduler, serving the result from the LLM cache when it is enabled.
+    """
+    key = _cache_key(crew_cls, inputs, factory) if get_llm_cache() else None
+    if key:
+        cached = _cached_output(crew_cls, key, factory)
+        if cached is not None:
+            _record_cache_hit(crew_cls, inputs, factory)
+            return cached
+
+    result = await get_scheduler().submit(
+        _kickoff_name(crew_cls, factory),
+        lambda: crew_pool.acquire(crew_cls, factory).kickoff_async(inputs=inputs),
+        est_tokens=estimate_tokens(inputs),
+        usage=_total_tokens,
+        tags=_metric_tags(inputs),
+    )
+    if key:
+        _store_output(crew_cls, key, result, factory)
+    return result
+
+
+def kickoff_crew(crew_cls, inputs: Dict[str, Any], factory: str = "crew"):
+    """Blocking counterpart of kickoff_crew_async for the synchronous flows."""
+    key = _cache_key(crew_cls, inputs, factory) if get_llm_cache() else None
+    if key:
+        cached = _cached_output(crew_cls, key, factory)
+        if cached is not None:
+            _record_cache_hit(crew_cls, inputs, factory)
+            return cached
+
+    result = get_scheduler().submit_sync(
+        _kickoff_name(crew_cls, factory),
+        lambda: crew_pool.acquire(crew_cls, factory).kickoff(inputs=inputs),
+        est_tokens=estimate_tokens(inputs),
+        usage=_total_tokens,
+        tags=_metric_tags(inputs),
+    )
+    if key:
+        _store_output(crew_cls, key, result, factory)
+    return result
@@ -0,0 +1,39 @@
+"""
+Thread safety for concurrent crew kickoffs under crewai 0.119.
+
+Crew.kickoff_async runs each kickoff in a worker thread, and the flows
+kick off many crews at once. crewai.llm.suppress_warnings swaps
+sys.stdout/sys.stderr for a FilteredStream around every LLM call and
+restores what it saw on entry: interleaved calls restore each other's
+wrappers, the chain of wrappers grows without bound, and the interpreter
+segfaults when it is garbage collected. Installing the wrapper once for
+all calls is not enough either, since crewai copies objects holding the
+stream while it is installed and the copies fail on every write.
+"""
+
+import contextlib
+
+import crewai.llm
+import litellm
+
+
+@contextlib.contextmanager
+def _leave_streams_alone():
+    yield
+
+
+_installed = False
+
+
+def install_thread_safety():
+    """
+    Stop crewai from swapping sys.stdout/sys.stderr around LLM calls. The
+    swap only hid litellm's "Give Feedback / Get Help" banner, which is
+    switched off at the source instead. Called once by crewRunner.
+    """
+    global _installed
+    if _installed:
+        return
+    litellm.suppress_debug_info = True
+    crewai.llm.suppress_warnings = _leave_streams_alone
+    _installed = True
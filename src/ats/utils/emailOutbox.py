@@ -0,0 +1,247 @@
+import email
+import os
+import random
+import smtplib
+import sqlite3
+import threading
+import time
+from email.message import Message
+from typing import Optional
+
+from src.ats.utils.mailer import get_mailer
+
+PENDING, SENDING, SENT, FAILED = "pending", "sending", "sent", "failed"
+
+
+def is_permanent_error(error: Exception) -> bool:
+    """Errors that another attempt cannot fix: the recipient was refused or the message rejected with a 5xx."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return True
+    return isinstance(error, smtplib.SMTPDataError) and 500 <= error.smtp_code < 600
+
+
+class EmailOutbox:
+    """
+    Durable queue of outgoing emails in a local SQLite file.
+
+    `enqueue` stores a message under an idempotency key and returns at once;
+    a message whose key is already queued or sent is not stored again.
+    Worker threads (`start`) claim due messages, send them through the
+    mailer and mark them sent. A failed send is retried after an exponential
+    backoff with jitter until `max_attempts`, then marked failed. A claim is
+    a lease: messages left in "sending" by a process that died are picked up
+    again once the lease expires, so delivery resumes after a restart.
+    """
+
+    def __init__(self, path: str, send=None, max_attempts: int = 6, base_delay: float = 30,
+                 max_delay: float = 3600, lease_seconds: float = 300, retention_days: float = 30):
+        self.path = path
+        self._send = send or get_mailer().send
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lease_seconds = lease_seconds
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition()
+        self._enqueued = 0
+        self._stopping = threading.Event()
+        self._threads = []
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                idempotency_key TEXT NOT NULL UNIQUE,
+                to_email TEXT NOT NULL,
+                message TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                sent_at REAL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at)")
+        self._conn.commit()
+
+    def enqueue(self, key: str, msg: Message) -> bool:
+        """Queue a message; False when one with the same key is already in the outbox."""
+        if "Message-ID" not in msg:
+            # Stable across retries, so a receiving server can spot a resend after a crash
+            msg["Message-ID"] = f"<{key[:40]}@ats-outbox>"
+        now = time.time()
+        with self._lock:
+            added = self._conn.execute(
+                "INSERT OR IGNORE INTO outbox (idempotency_key, to_email, message, status, next_attempt_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, msg["To"], msg.as_string(), PENDING, now, now),
+            ).rowcount
+            self._conn.commit()
+        if added:
+            with self._wakeup:
+                self._enqueued += 1
+                self._wakeup.notify_all()
+        return bool(added)
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM outbox WHERE idempotency_key = ?", (key,)
+            ).fetchone() is not None
+
+    def _claim(self) -> Optional[tuple]:
+        """Lease the next due message to this thread: (id, key, to_email, message, attempts)."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "UPDATE outbox SET status = ?, attempts = attempts + 1, next_attempt_at = ? "
+                "WHERE id = (SELECT id FROM outbox WHERE status IN (?, ?) AND next_attempt_at <= ? "
+                "ORDER BY next_attempt_at LIMIT 1) "
+                "RETURNING id, idempotency_key, to_email, message, attempts",
+                (SENDING, now + self.lease_seconds, PENDING, SENDING, now),
+            ).fetchone()
+            self._conn.commit()
+        return row
+
+    def _next_due_in(self) -> float:
+        with self._lock:
+            due = self._conn.execute(
+                "SELECT MIN(next_attempt_at) FROM outbox WHERE status IN (?, ?)", (PENDING, SENDING)
+            ).fetchone()[0]
+        return self.lease_seconds if due is None else max(0.0, due - time.time())
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def deliver_one(self) -> bool:
+        """Send the next due message, if any. Returns False when nothing was due."""
+        row = self._claim()
+        if row is None:
+            return False
+        message_id, key, to_email, raw, attempts = row
+        try:
+            self._send(email.message_from_string(raw))
+        except Exception as e:
+            permanent = is_permanent_error(e)
+            status = FAILED if permanent or attempts >= self.max_attempts else PENDING
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE outbox SET status = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                    (status, time.time() + self._backoff(attempts), f"{type(e).__name__}: {e}", message_id),
+                )
+                self._conn.commit()
+            if status == FAILED:
+                print(f"Giving up on the email to {to_email} after {attempts} attempt(s): {e}")
+            return True
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, sent_at = ?, last_error = NULL WHERE id = ?", (SENT, now, message_id)
+            )
+            self._conn.execute(
+                "DELETE FROM outbox WHERE status = ? AND sent_at < ?", (SENT, now - self.retention_days * 86400)
+            )
+            self._conn.commit()
+        return True
+
+    def _run(self):
+        while not self._stopping.is_set():
+            with self._wakeup:
+                seen = self._enqueued
+            try:
+                if self.deliver_one():
+                    continue
+                wait = self._next_due_in()
+            except Exception as e:
+                print(f"Email outbox worker error: {e}")
+                wait = self.base_delay
+            with self._wakeup:
+                # Skip the wait when a message was queued since the outbox was last checked
+                if self._enqueued == seen and not self._stopping.is_set():
+                    self._wakeup.wait(min(wait, 60))
+
+    def start(self, workers: int = 1):
+        """Start the delivery threads (daemons; whatever is left is delivered after the next start)."""
+        with self._lock:
+            if self._threads:
+                return
+            self._stopping.clear()
+            self._threads = [
+                threading.Thread(target=self._run, name=f"email-outbox-{i}", daemon=True) for i in range(workers)
+            ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def drain(self, timeout: float = None) -> bool:
+        """Wait until no message is pending or being sent; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            stats = self.stats()
+            if not stats[PENDING] + stats[SENDING]:
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+        return {status: counts.get(status, 0) for status in (PENDING, SENDING, SENT, FAILED)}
+
+
+_outbox = None
+_outbox_lock = threading.Lock()
+
+
+def get_email_outbox() -> Optional[EmailOutbox]:
+    """
+    Process-wide outbox, or None with ATS_OUTBOX=0 (emails are then sent
+    inline). Stored at ATS_OUTBOX_PATH; ATS_OUTBOX_MAX_ATTEMPTS,
+    ATS_OUTBOX_RETRY_DELAY (seconds before the first retry, doubled each
+    time), ATS_OUTBOX_LEASE (seconds before a message claimed by a worker
+    that died is retried) and ATS_OUTBOX_RETENTION_DAYS (how long sent keys
+    are remembered) tune it. Unless ATS_OUTBOX_WORKER=0 this process also delivers, with
+    ATS_SMTP_POOL_SIZE worker threads.
+    """
+    global _outbox
+    if os.getenv("ATS_OUTBOX", "1").lower() in ("0", "false", "no"):
+        return None
+    with _outbox_lock:
+        if _outbox is None:
+            _outbox = EmailOutbox(
+                os.getenv("ATS_OUTBOX_PATH", os.path.join(".ats_cache", "email_outbox.sqlite3")),
+                max_attempts=int(os.getenv("ATS_OUTBOX_MAX_ATTEMPTS", 6)),
+                base_delay=float(os.getenv("ATS_OUTBOX_RETRY_DELAY", 30)),
+                lease_seconds=float(os.getenv("ATS_OUTBOX_LEASE", 300)),
+                retention_days=float(os.getenv("ATS_OUTBOX_RETENTION_DAYS", 30)),
+            )
+            if os.getenv("ATS_OUTBOX_WORKER", "1").lower() not in ("0", "false", "no"):
+                _outbox.start(workers=get_mailer().pool.size)
+        return _outbox
+
+
+if __name__ == "__main__":
+    # Dedicated delivery process for deployments that queue with ATS_OUTBOX_WORKER=0
+    os.environ["ATS_OUTBOX_WORKER"] = "1"
+    outbox = get_email_outbox()
+    print(f"Delivering emails from {outbox.path}: {outbox.stats()}")
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        outbox.stop()
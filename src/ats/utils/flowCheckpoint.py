@@ -0,0 +1,138 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Type
+
+from pydantic import BaseModel
+
+
+class FlowCheckpoint:
+    """
+    Per-candidate checkpoints of employer runs in a local SQLite file.
+
+    A run records its inputs once, then every extracted candidate, filter
+    decision and score under (run ID, stage, candidate ID) as soon as it is
+    produced, so a stage interrupted halfway keeps its partial results. A
+    resumed run loads them and only does the work that is missing. The rows
+    of a run are deleted when it finishes, and those of a run not updated
+    for `retention_days` are deleted as abandoned, since they hold the full
+    resume text.
+    """
+
+    def __init__(self, path: str, retention_days: float = 7):
+        self.path = path
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS checkpoint_runs (
+                run_id TEXT PRIMARY KEY,
+                flow TEXT NOT NULL,
+                inputs TEXT NOT NULL,
+                started_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS checkpoint_items (
+                run_id TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                item_id TEXT NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (run_id, stage, item_id)
+            )"""
+        )
+        self._conn.commit()
+        self.purge_abandoned()
+
+    def purge_abandoned(self):
+        """Delete the checkpoints of runs not updated within the retention period."""
+        cutoff = time.time() - self.retention_days * 86400
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM checkpoint_items WHERE run_id IN (SELECT run_id FROM checkpoint_runs WHERE updated_at < ?)",
+                (cutoff,),
+            )
+            self._conn.execute("DELETE FROM checkpoint_runs WHERE updated_at < ?", (cutoff,))
+
+    def start(self, run_id: str, flow: str, inputs: dict):
+        """Record a run's inputs; a resumed run keeps the ones it started with."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO checkpoint_runs (run_id, flow, inputs, started_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (run_id, flow, json.dumps(inputs), now, now),
+            )
+
+    def run(self, run_id: str) -> Optional[dict]:
+        """The flow name and inputs of an unfinished run, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT flow, inputs FROM checkpoint_runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return {"flow": row[0], "inputs": json.loads(row[1])} if row else None
+
+    def unfinished_runs(self) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT r.run_id, r.flow, r.started_at, r.updated_at, COUNT(i.item_id) FROM checkpoint_runs r "
+                "LEFT JOIN checkpoint_items i ON i.run_id = r.run_id GROUP BY r.run_id ORDER BY r.updated_at DESC"
+            ).fetchall()
+        return [
+            {"run_id": run_id, "flow": flow, "started_at": started, "updated_at": updated, "items": items}
+            for run_id, flow, started, updated, items in rows
+        ]
+
+    def save(self, run_id: str, stage: str, items: List[BaseModel]):
+        """Checkpoint finished items of a stage, keyed by their `id`."""
+        rows = [(run_id, stage, str(item.id), item.model_dump_json()) for item in items if item is not None]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO checkpoint_items (run_id, stage, item_id, value) VALUES (?, ?, ?, ?)", rows
+            )
+            self._conn.execute("UPDATE checkpoint_runs SET updated_at = ? WHERE run_id = ?", (time.time(), run_id))
+
+    def load(self, run_id: str, stage: str, model: Type[BaseModel]) -> Dict[str, BaseModel]:
+        """Items already checkpointed for a stage, by ID."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT item_id, value FROM checkpoint_items WHERE run_id = ? AND stage = ?", (run_id, stage)
+            ).fetchall()
+        return {item_id: model.model_validate_json(value) for item_id, value in rows}
+
+    def finish(self, run_id: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM checkpoint_items WHERE run_id = ?", (run_id,))
+            self._conn.execute("DELETE FROM checkpoint_runs WHERE run_id = ?", (run_id,))
+
+
+_checkpoint = None
+_checkpoint_lock = threading.Lock()
+
+
+def get_flow_checkpoint() -> Optional[FlowCheckpoint]:
+    """
+    Process-wide checkpoint store at ATS_CHECKPOINT_PATH (default
+    .ats_cache/checkpoints.sqlite3), or None with ATS_CHECKPOINT=0. Runs not
+    updated for ATS_CHECKPOINT_RETENTION_DAYS (default 7) are deleted.
+    """
+    global _checkpoint
+    if os.getenv("ATS_CHECKPOINT", "1").lower() in ("0", "false", "no"):
+        return None
+    with _checkpoint_lock:
+        if _checkpoint is None:
+            _checkpoint = FlowCheckpoint(
+                os.getenv("ATS_CHECKPOINT_PATH", os.path.join(".ats_cache", "checkpoints.sqlite3")),
+                retention_days=float(os.getenv("ATS_CHECKPOINT_RETENTION_DAYS", 7)),
+            )
+        return _checkpoint
@@ -0,0 +1,153 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+
+from src.ats.utils.jobFetcher import fetch_page
+
+# Query parameters that only track where a visitor came from
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "ref", "refid", "trk", "trackingid"}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Cache key for a job posting URL: scheme and host lower-cased, default
+    port, fragment, tracking parameters and a trailing slash dropped, and the
+    remaining query parameters sorted.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+class JobDescriptionCache:
+    """
+    Process-wide cache of cleaned job descriptions keyed by normalized URL.
+
+    Entries are served as is for `ttl_seconds`, then revalidated with
+    If-None-Match / If-Modified-Since, so an unchanged posting costs a 304
+    instead of a download and another HTML clean-up. Concurrent requests for
+    the same URL share one fetch. A stale entry is served when revalidation
+    fails.
+    """
+
+    def __init__(self, ttl_seconds: float = 3600, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.fetches = 0
+        self.revalidations = 0
+        self.not_modified = 0
+        self.shared_waits = 0
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> str:
+        key = normalize_url(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if time.monotonic() - entry["fetched_at"] < self.ttl_seconds:
+                    self.hits += 1
+                    return entry["text"]
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+            else:
+                self.shared_waits += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            text = self._load(key, url, entry)
+            future.set_result(text)
+            return text
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def _load(self, key: str, url: str, entry: Optional[dict]) -> str:
+        etag = entry["etag"] if entry else None
+        last_modified = entry["last_modified"] if entry else None
+        try:
+            text, new_etag, new_last_modified = fetch_page(url, etag, last_modified)
+        except requests.RequestException as e:
+            if entry is None:
+                raise
+            print(f"Revalidating the job description at {url} failed, using the cached copy: {e}")
+            return entry["text"]
+
+        with self._lock:
+            if entry and (etag or last_modified):
+                self.revalidations += 1
+            if text is None:
+                # 304 Not Modified: the cached text is still current
+                self.not_modified += 1
+                text = entry["text"]
+                new_etag, new_last_modified = new_etag or etag, new_last_modified or last_modified
+            else:
+                self.fetches += 1
+            self._entries[key] = {
+                "text": text,
+                "etag": new_etag,
+                "last_modified": new_last_modified,
+                "fetched_at": time.monotonic(),
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return text
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "fetches": self.fetches,
+                "revalidations": self.revalidations,
+                "not_modified": self.not_modified,
+                "shared_waits": self.shared_waits,
+                "entries": len(self._entries),
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_job_description_cache() -> Optional[JobDescriptionCache]:
+    """
+    Process-wide job description cache, on unless ATS_JD_CACHE=0. Configured
+    with ATS_JD_CACHE_TTL (seconds before revalidating, default 3600) and
+    ATS_JD_CACHE_SIZE (URLs kept, default 256).
+    """
+    global _cache
+    if os.getenv("ATS_JD_CACHE", "1").lower() in ("0", "false", "no"):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = JobDescriptionCache(
+                ttl_seconds=float(os.getenv("ATS_JD_CACHE_TTL", 3600)),
+                max_entries=int(os.getenv("ATS_JD_CACHE_SIZE", 256)),
+            )
+        return _cache
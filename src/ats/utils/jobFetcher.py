@@ -0,0 +1,169 @@
+import os
+import re
+import threading
+from html.parser import HTMLParser
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = "Mozilla/5.0 (compatible; ATS-CrewAI job description fetcher)"
+
+# Elements whose text is never part of a job description
+SKIPPED_TAGS = {"script", "style", "noscript", "template", "svg", "canvas", "iframe", "head",
+                "nav", "header", "footer", "aside", "form", "button", "select"}
+# Elements holding the main content of a page, when it marks one
+MAIN_TAGS = {"main", "article"}
+BLOCK_TAGS = {"p", "div", "section", "br", "li", "ul", "ol", "tr", "table", "h1", "h2", "h3", "h4", "h5", "h6",
+              "main", "article", "dd", "dt", "blockquote", "pre"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+SPACES_PATTERN = re.compile(r"[ \t\r\f\v]+")
+BLANK_LINES_PATTERN = re.compile(r"\n\s*\n+")
+
+
+class MainContentParser(HTMLParser):
+    """
+    Collects the visible text of an HTML page, keeping the text inside
+    <main>, <article> or role="main" separately so it can be preferred over
+    the whole page.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.page = []
+        self.main = []
+        self._skip_depth = 0
+        self._main_depth = 0
+        self._stack = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            if tag == "br":
+                self._newline()
+            return
+        is_main = tag in MAIN_TAGS or dict(attrs).get("role") == "main"
+        is_skipped = tag in SKIPPED_TAGS or dict(attrs).get("aria-hidden") == "true"
+        self._stack.append((tag, is_main, is_skipped))
+        self._main_depth += is_main
+        self._skip_depth += is_skipped
+        if tag in BLOCK_TAGS:
+            self._newline()
+
+    def handle_endtag(self, tag):
+        # Pop up to the matching tag, so unclosed children do not leak state
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i][0] == tag:
+                for _, is_main, is_skipped in self._stack[i:]:
+                    self._main_depth -= is_main
+                    self._skip_depth -= is_skipped
+                del self._stack[i:]
+                break
+        if tag in BLOCK_TAGS:
+            self._newline()
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        self.page.append(data)
+        if self._main_depth:
+            self.main.append(data)
+
+    def _newline(self):
+        self.page.append("\n")
+        if self._main_depth:
+            self.main.append("\n")
+
+
+def _clean(parts) -> str:
+    text = SPACES_PATTERN.sub(" ", "".join(parts))
+    text = "\n".join(line.strip() for line in text.split("\n"))
+    return BLANK_LINES_PATTERN.sub("\n\n", text).strip()
+
+
+def html_to_text(html: str) -> str:
+    """Readable text of the main content of an HTML page."""
+    parser = MainContentParser()
+    parser.feed(html)
+    parser.close()
+    main = _clean(parser.main)
+    # Some pages wrap only a banner in <main>; fall back to the whole page then
+    return main if len(main) >= int(os.getenv("ATS_JD_MIN_CHARS", 200)) else _clean(parser.page)
+
+
+def as_url(text: str):
+    """`text` as an http(s) URL ("https://" is added to bare domains), or None if it is not one."""
+    text = text.strip()
+    if re.match(r"https?://\S+$", text, flags=re.IGNORECASE):
+        return text
+    if re.match(r"[\w-]+(\.[\w-]+)*\.[a-z]{2,}(/\S*)?$", text, flags=re.IGNORECASE):
+        return "https://" + text
+    return None
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Process-wide HTTP session, so requests to the same host reuse connections."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            pool_size = int(os.getenv("ATS_JD_FETCH_POOL", 10))
+            session = requests.Session()
+            # Retry a failed connect once (a pooled connection may have gone stale), never a slow read
+            retries = Retry(total=1, connect=1, read=False, redirect=5)
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = USER_AGENT
+            _session = session
+        return _session
+
+
+def read_capped(response: requests.Response, max_bytes: int) -> str:
+    """Body of a streamed response decoded as text, truncated to `max_bytes`."""
+    chunks, size = [], 0
+    for chunk in response.iter_content(chunk_size=64 * 1024):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= max_bytes:
+            break
+    body = b"".join(chunks)[:max_bytes]
+    # requests assumes ISO-8859-1 for text/* without a charset; pages today are nearly all UTF-8
+    declared = "charset=" in response.headers.get("Content-Type", "").lower()
+    return body.decode(response.encoding if declared else "utf-8", errors="replace")
+
+
+def fetch_page(url: str, etag: str = None, last_modified: str = None):
+    """
+    Conditional GET of a job posting. Returns (text, etag, last_modified),
+    with text None when the server answered 304 Not Modified to the given
+    validators. Raises requests.RequestException on network errors and HTTP
+    error statuses.
+
+    Limits come from ATS_JD_FETCH_TIMEOUT (seconds, default 10),
+    ATS_JD_MAX_BYTES (downloaded HTML, default 2 MB) and ATS_JD_MAX_CHARS
+    (returned text, default 20000).
+    """
+    timeout = float(os.getenv("ATS_JD_FETCH_TIMEOUT", 10))
+    max_bytes = int(os.getenv("ATS_JD_MAX_BYTES", 2 * 1024 * 1024))
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    with get_session().get(url, headers=headers, timeout=(min(timeout, 5), timeout), stream=True) as response:
+        validators = response.headers.get("ETag"), response.headers.get("Last-Modified")
+        if response.status_code == 304:
+            return (None, *validators)
+        response.raise_for_status()
+        body = read_capped(response, max_bytes)
+        content_type = response.headers.get("Content-Type", "")
+    text = _clean([body]) if content_type.startswith("text/plain") else html_to_text(body)
+    return (text[:int(os.getenv("ATS_JD_MAX_CHARS", 20000))], *validators)
+
+
+def fetch_job_description(url: str) -> str:
+    """Download a job posting and return the text of its main content."""
+    return fetch_page(url)[0]
@@ -0,0 +1,90 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Iterable, List
+
+from src.ats.utils.spacyModel import get_nlp
+
+KEYWORD_POS = {"NOUN", "PROPN", "ADJ", "VERB"}
+
+
+def batch_size() -> int:
+    return int(os.getenv("ATS_SPACY_BATCH_SIZE", 32))
+
+
+def parse_texts(texts: Iterable[str]) -> list:
+    """spaCy docs for `texts`, processed together with nlp.pipe."""
+    return list(get_nlp().pipe(texts, batch_size=batch_size()))
+
+
+def doc_keywords(doc) -> set:
+    return {
+        token.lemma_.lower()
+        for token in doc
+        if token.pos_ in KEYWORD_POS and not token.is_stop
+    }
+
+
+def doc_lemmas(doc) -> set:
+    return {token.lemma_ for token in doc if not token.is_stop}
+
+
+class KeywordMemo:
+    """
+    LRU map from the SHA-256 of a job description to its keyword set, so the
+    same JD is only run through spaCy once per process.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, jd_text: str) -> frozenset:
+        key = hashlib.sha256(jd_text.encode("utf-8")).hexdigest()
+        with self._lock:
+            keywords = self._entries.get(key)
+            if keywords is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return keywords
+            self.misses += 1
+
+        keywords = frozenset(doc_keywords(get_nlp()(jd_text)))
+        with self._lock:
+            self._entries[key] = keywords
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return keywords
+
+
+_memo = None
+_memo_lock = threading.Lock()
+
+
+def get_keyword_memo() -> KeywordMemo:
+    """Process-wide JD keyword memo, sized by ATS_JD_KEYWORD_CACHE_SIZE."""
+    global _memo
+    with _memo_lock:
+        if _memo is None:
+            _memo = KeywordMemo(int(os.getenv("ATS_JD_KEYWORD_CACHE_SIZE", 128)))
+        return _memo
+
+
+def jd_keywords(jd_text: str) -> frozenset:
+    """Lemmatized nouns, proper nouns, adjectives and verbs of a job description."""
+    return get_keyword_memo().get(jd_text)
+
+
+def find_missing_keywords(resume_texts: List[str], jd_text: str) -> List[set]:
+    """
+    JD keywords absent from each resume. The JD is parsed once (or not at
+    all when memoized) and the resumes go through nlp.pipe together.
+    """
+    keywords = jd_keywords(jd_text)
+    docs = parse_texts([text.lower() for text in resume_texts])
+    return [keywords - doc_lemmas(doc) for doc in docs]
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+
+def cache_key(*parts) -> str:
+    """SHA-256 over the given key parts (strings or JSON-serialisable values)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, str):
+            part = json.dumps(part, sort_keys=True, default=str)
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def schema_fingerprint(model) -> str:
+    """Name plus a short hash of a pydantic model's JSON schema ("raw" for no schema)."""
+    if model is None:
+        return "raw"
+    return f"{model.__name__}:{cache_key(model.model_json_schema())[:16]}"
+
+
+class LLMCache:
+    """
+    Content-addressed cache of LLM results stored in a local SQLite file.
+
+    Entries expire after `ttl_seconds`; when the stored payloads exceed
+    `max_bytes` the least recently read entries are evicted first.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 7 * 24 * 3600, max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._by_name = {}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)")
+        self._conn.commit()
+
+    def _count(self, name, field):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+            counters = self._by_name.setdefault(name, {"hits": 0, "misses": 0})
+            counters[field] += 1
+
+    def get(self, name: str, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row and now - row[1] <= self.ttl_seconds:
+                self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+            else:
+                row = None
+        if row is None:
+            self._count(name, "misses")
+            return None
+        self._count(name, "hits")
+        return json.loads(row[0])
+
+    def put(self, name: str, key: str, value: dict):
+        payload = json.dumps(value, default=str)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, name, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, name, payload, len(payload), now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now):
+        expired = self._conn.execute(
+            "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        self.evictions += max(expired, 0)
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM llm_cache ORDER BY accessed_at"
+        ).fetchall():
+            self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": entries,
+                "bytes": size,
+                "by_name": {name: dict(counters) for name, counters in self._by_name.items()},
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """
+    Process-wide cache, or None unless ATS_LLM_CACHE=1. Configured with
+    ATS_LLM_CACHE_PATH, ATS_LLM_CACHE_TTL (seconds) and ATS_LLM_CACHE_MAX_MB.
+    """
+    global _cache
+    if os.getenv("ATS_LLM_CACHE", "0").lower() not in ("1", "true", "yes"):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache(
+                os.getenv("ATS_LLM_CACHE_PATH", os.path.join(".ats_cache", "llm_cache.sqlite3")),
+                ttl_seconds=float(os.getenv("ATS_LLM_CACHE_TTL", 7 * 24 * 3600)),
+                max_bytes=int(float(os.getenv("ATS_LLM_CACHE_MAX_MB", 256)) * 1024 * 1024),
+            )
+        return _cache
@@ -0,0 +1,337 @@
+import bisect
+import contextlib
+import contextvars
+import json
+import os
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from crewai.utilities.events import crewai_event_bus
+from crewai.utilities.events.flow_events import FlowFinishedEvent, MethodExecutionFailedEvent, MethodExecutionStartedEvent
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+# Prometheus labels; candidate IDs stay out of them (one series per candidate) and go to the run summaries
+LABELS = ("crew", "flow", "stage")
+
+_tags = contextvars.ContextVar("ats_llm_tags", default={})
+
+
+def current_tags() -> dict:
+    """Flow, stage, run and candidate tags of the code that is running."""
+    return _tags.get()
+
+
+@contextlib.contextmanager
+def metric_tags(**tags):
+    """Add tags to every LLM call made inside the block."""
+    token = _tags.set({**_tags.get(), **tags})
+    try:
+        yield
+    finally:
+        _tags.reset(token)
+
+
+def token_counts(result) -> Tuple[int, int]:
+    """(prompt, completion) tokens of a CrewOutput or an OpenAI chat completion."""
+    usage = getattr(result, "token_usage", None) or getattr(result, "usage", None)
+    return getattr(usage, "prompt_tokens", 0) or 0, getattr(usage, "completion_tokens", 0) or 0
+
+
+def percentiles(values: List[float]) -> dict:
+    """p50/p95/p99 by linear interpolation between the closest ranks."""
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    ordered = sorted(values)
+
+    def at(q):
+        position = (len(ordered) - 1) * q
+        low = int(position)
+        high = min(low + 1, len(ordered) - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+    return {"p50": round(at(0.50), 4), "p95": round(at(0.95), 4), "p99": round(at(0.99), 4)}
+
+
+class Histogram:
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(LATENCY_BUCKETS, value)
+        if index < len(self.buckets):
+            self.buckets[index] += 1
+        self.count += 1
+        self.sum += value
+
+
+class Series:
+    """Counters and histograms of one (crew, flow, stage) label set."""
+
+    def __init__(self):
+        self.calls = {"ok": 0, "failed": 0, "cached": 0}
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+        self.latency = Histogram()
+        self.queue_wait = Histogram()
+
+
+class LLMMetrics:
+    """
+    Records every LLM call (crew kickoffs and candidate extraction): wall
+    time, time spent queued by the scheduler, retries, prompt and completion
+    tokens and their cost, tagged by crew, flow, stage, run and candidate.
+
+    Totals and latency histograms per crew, flow and stage are exported in
+    the Prometheus text format; the individual calls of the last `max_runs`
+    runs are kept for per-run summaries with p50/p95/p99 latencies.
+    """
+
+    def __init__(self, prompt_price: float = 2.5, completion_price: float = 10.0, max_runs: int = 50):
+        # Prices in USD per million tokens
+        self.prompt_price = prompt_price
+        self.completion_price = completion_price
+        self.max_runs = max_runs
+        self._series: Dict[tuple, Series] = {}
+        self._runs: "OrderedDict[str, List[dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        return (prompt_tokens * self.prompt_price + completion_tokens * self.completion_price) / 1e6
+
+    def record(self, crew: str, seconds: float, queue_seconds: float = 0.0, retries: int = 0,
+               prompt_tokens: int = 0, completion_tokens: int = 0, outcome: str = "ok", tags: dict = None):
+        tags = {**current_tags(), **(tags or {})}
+        call = {
+            "crew": crew,
+            "flow": tags.get("flow", ""),
+            "stage": tags.get("stage", ""),
+            "candidate_id": str(tags.get("candidate_id") or ""),
+            "outcome": outcome,
+            "seconds": seconds,
+            "queue_seconds": queue_seconds,
+            "retries": retries,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cost_usd": self.cost(prompt_tokens, completion_tokens),
+        }
+        run_id = tags.get("run_id")
+        with self._lock:
+            series = self._series.get((crew, call["flow"], call["stage"]))
+            if series is None:
+                series = self._series[(crew, call["flow"], call["stage"])] = Series()
+            series.calls[outcome] += 1
+            series.retries += retries
+            series.prompt_tokens += prompt_tokens
+            series.completion_tokens += completion_tokens
+            series.cost += call["cost_usd"]
+            if outcome != "cached":
+                series.latency.observe(seconds)
+                series.queue_wait.observe(queue_seconds)
+            if run_id:
+                self._runs.setdefault(run_id, []).append(call)
+                self._runs.move_to_end(run_id)
+                while len(self._runs) > self.max_runs:
+                    self._runs.popitem(last=False)
+
+    def prometheus(self) -> str:
+        """All series in the Prometheus text exposition format."""
+        with self._lock:
+            series = list(self._series.items())
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+
+        def labels(key, **extra):
+            pairs = list(zip(LABELS, key)) + list(extra.items())
+            return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+        metric("ats_llm_calls_total", "counter", "LLM calls by outcome (ok, failed, served from the cache).", [
+            f"ats_llm_calls_total{labels(key, outcome=outcome)} {count}"
+            for key, s in series for outcome, count in s.calls.items() if count
+        ])
+        for name, attribute, help_text in [
+            ("ats_llm_retries_total", "retries", "Rate-limited calls retried by the scheduler."),
+            ("ats_llm_prompt_tokens_total", "prompt_tokens", "Prompt tokens sent."),
+            ("ats_llm_completion_tokens_total", "completion_tokens", "Completion tokens received."),
+            ("ats_llm_cost_usd_total", "cost", "Estimated cost in USD."),
+        ]:
+            metric(name, "counter", help_text, [f"{name}{labels(key)} {getattr(s, attribute):g}" for key, s in series])
+        for name, attribute, help_text in [
+            ("ats_llm_call_seconds", "latency", "Wall time of LLM calls, queueing and retries included."),
+            ("ats_llm_queue_wait_seconds", "queue_wait", "Time LLM calls waited for a scheduler slot and rate budget."),
+        ]:
+            samples = []
+            for key, s in series:
+                histogram = getattr(s, attribute)
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, histogram.buckets):
+                    cumulative += count
+                    samples.append(f"{name}_bucket{labels(key, le=f'{bound:g}')} {cumulative}")
+                samples.append(f"{name}_bucket{labels(key, le='+Inf')} {histogram.count}")
+                samples.append(f"{name}_sum{labels(key)} {histogram.sum:g}")
+                samples.append(f"{name}_count{labels(key)} {histogram.count}")
+            metric(name, "histogram", help_text, samples)
+        return "\n".join(lines) + "\n"
+
+    def run_summary(self, run_id: str) -> Optional[dict]:
+        """Totals and p50/p95/p99 latencies of one run, overall and by crew, stage and candidate."""
+        with self._lock:
+            calls = list(self._runs.get(run_id, []))
+        if not calls:
+            return None
+
+        def summarize(group: List[dict]) -> dict:
+            timed = [call for call in group if call["outcome"] != "cached"]
+            return {
+                "calls": len(group),
+                "failed": sum(call["outcome"] == "failed" for call in group),
+                "cached": len(group) - len(timed),
+                "retries": sum(call["retries"] for call in group),
+                "prompt_tokens": sum(call["prompt_tokens"] for call in group),
+                "completion_tokens": sum(call["completion_tokens"] for call in group),
+                "cost_usd": round(sum(call["cost_usd"] for call in group), 6),
+                "seconds": round(sum(call["seconds"] for call in timed), 4),
+                "latency_seconds": percentiles([call["seconds"] for call in timed]),
+                "queue_wait_seconds": percentiles([call["queue_seconds"] for call in timed]),
+            }
+
+        def by(field):
+            groups = {}
+            for call in calls:
+                groups.setdefault(call[field], []).append(call)
+            return {name: summarize(group) for name, group in groups.items() if name}
+
+        return {
+            "run_id": run_id,
+            "flow": calls[0]["flow"],
+            **summarize(calls),
+            "by_crew": by("crew"),
+            "by_stage": by("stage"),
+            "by_candidate": by("candidate_id"),
+        }
+
+    def write_run_summary(self, run_id: str, directory: str) -> Optional[str]:
+        summary = self.run_summary(run_id)
+        if summary is None:
+            return None
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{run_id}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        return path
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsServer:
+    """Serves /metrics (Prometheus) and /runs/<run_id> (JSON summary) from a daemon thread."""
+
+    def __init__(self, metrics: LLMMetrics, host: str = "127.0.0.1", port: int = 9464):
+        self.metrics = metrics
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="llm-metrics", daemon=True).start()
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, content_type = metrics.prometheus().encode("utf-8"), "text/plain; version=0.0.4"
+                elif self.path.startswith("/runs/"):
+                    summary = metrics.run_summary(self.path[len("/runs/"):])
+                    if summary is None:
+                        self.send_error(404)
+                        return
+                    body, content_type = json.dumps(summary).encode("utf-8"), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+_metrics = None
+_server = None
+_metrics_lock = threading.Lock()
+
+
+def get_llm_metrics() -> Optional[LLMMetrics]:
+    """
+    Process-wide metrics, or None with ATS_METRICS=0. Costs use
+    ATS_LLM_PRICE_PROMPT / ATS_LLM_PRICE_COMPLETION (USD per million tokens,
+    default gpt-4o's 2.5 / 10). With ATS_METRICS_PORT set, /metrics and
+    /runs/<run_id> are served on ATS_METRICS_HOST (default 127.0.0.1).
+    """
+    global _metrics, _server
+    if os.getenv("ATS_METRICS", "1").lower() in ("0", "false", "no"):
+        return None
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = LLMMetrics(
+                prompt_price=float(os.getenv("ATS_LLM_PRICE_PROMPT", 2.5)),
+                completion_price=float(os.getenv("ATS_LLM_PRICE_COMPLETION", 10.0)),
+            )
+            if os.getenv("ATS_METRICS_PORT"):
+                try:
+                    _server = MetricsServer(_metrics, os.getenv("ATS_METRICS_HOST", "127.0.0.1"), int(os.getenv("ATS_METRICS_PORT")))
+                except OSError as e:
+                    # Another process (e.g. a second Streamlit worker) already serves the port
+                    print(f"Metrics endpoint not started: {e}")
+        return _metrics
+
+
+def _flow_run_id(flow) -> str:
+    state = getattr(flow, "state", None)
+    return getattr(state, "run_id", "") or getattr(state, "id", "") or ""
+
+
+# Flow methods run in their own asyncio tasks (or inline for synchronous
+# flows), so tags set when a method starts reach every call it makes.
+@crewai_event_bus.on(MethodExecutionStartedEvent)
+def _tag_flow_method(source, event):
+    _tags.set({"flow": event.flow_name, "stage": event.method_name, "run_id": _flow_run_id(source)})
+
+
+def _write_summary(source, event):
+    metrics = get_llm_metrics()
+    if metrics is None:
+        return
+    path = metrics.write_run_summary(_flow_run_id(source), os.getenv("ATS_METRICS_DIR", os.path.join(".ats_cache", "metrics")))
+    if path:
+        print(f"LLM usage of the run written to {path}")
+
+
+crewai_event_bus.on(FlowFinishedEvent)(_write_summary)
+# A run that fails still leaves a summary of what it spent
+crewai_event_bus.on(MethodExecutionFailedEvent)(_write_summary)
@@ -0,0 +1,359 @@
+import asyncio
+import os
+import random
+import threading
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from src.ats.utils.llmMetrics import get_llm_metrics, token_counts
+
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at `rate_per_minute`.
+
+    Reservations are taken up front and may drive the bucket negative; the
+    caller then waits until the debt has been refilled. This keeps callers in
+    arrival order without polling.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate_per_minute = rate_per_minute
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.factor = 1.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate_per_second(self):
+        return self.rate_per_minute * self.factor / 60.0
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._updated = now
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate_per_second)
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` tokens and return how many seconds to wait before using them."""
+        if self.rate_per_minute <= 0:
+            return 0.0
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= min(amount, self.capacity)
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate_per_second
+
+    def adjust(self, delta: float):
+        """Return unused tokens (positive delta) or charge extra usage (negative delta)."""
+        if self.rate_per_minute <= 0:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.capacity, self.tokens + delta)
+
+    def level(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            return self.tokens
+
+
+class CrewStats:
+    def __init__(self):
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.max_queue_depth = 0
+
+    def as_dict(self):
+        return dict(self.__dict__)
+
+
+def rate_limit_delay(exc: BaseException) -> Optional[float]:
+    """
+    Return the delay requested by a rate limit error (0.0 when the provider
+    did not say), or None when `exc` is not a rate limit error.
+    """
+    status = getattr(exc, "status_code", None) or getattr(getattr(exc, "response", None), "status_code", None)
+    if status != 429 and "ratelimit" not in type(exc).__name__.lower():
+        return None
+
+    headers = getattr(exc, "litellm_response_headers", None) or getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return 0.0
+
+
+class _CallTiming:
+    """Queue wait, wall time and retries of one scheduled call, for the LLM metrics."""
+
+    def __init__(self):
+        self.submitted = time.monotonic()
+        self.started = None
+        self.retries = 0
+        self.result = None
+
+    def start(self):
+        self.started = time.monotonic()
+
+    def record(self, crew_name, tags):
+        metrics = get_llm_metrics()
+        if metrics is None:
+            return
+        now = time.monotonic()
+        prompt_tokens, completion_tokens = token_counts(self.result)
+        metrics.record(
+            crew_name,
+            seconds=now - self.submitted,
+            queue_seconds=(self.started or now) - self.submitted,
+            retries=self.retries,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            outcome="ok" if self.result is not None else "failed",
+            tags=tags,
+        )
+
+
+class LLMScheduler:
+    """
+    Schedules LLM calls against provider limits.
+
+    Every call waits for a per-crew concurrency slot, then, when RPM/TPM caps
+    are set (a rate <= 0 is unlimited), reserves request and token budget from
+    the shared buckets once. On a 429 the call is retried after the
+    Retry-After delay (or exponential backoff), and every call waits out that
+    cooldown; capped rates are also halved and recover gradually as calls
+    succeed.
+    """
+
+    def __init__(
+        self,
+        rpm: int = 0,
+        tpm: int = 0,
+        max_concurrency: int = 16,
+        crew_concurrency: Dict[str, int] = None,
+        max_retries: int = 5,
+        base_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+    ):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_concurrency = max_concurrency
+        self.crew_concurrency = crew_concurrency or {}
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.min_rate_factor = 0.1
+        self._cooldown_until = 0.0
+        self._stats: Dict[str, CrewStats] = {}
+        self._lock = threading.Lock()
+        self._thread_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._loop_slots = weakref.WeakKeyDictionary()
+
+    def _limit(self, crew_name):
+        return self.crew_concurrency.get(crew_name, self.max_concurrency)
+
+    def _crew_stats(self, crew_name) -> CrewStats:
+        with self._lock:
+            if crew_name not in self._stats:
+                self._stats[crew_name] = CrewStats()
+            return self._stats[crew_name]
+
+    def _async_slot(self, crew_name) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            slots = self._loop_slots.setdefault(loop, {})
+            if crew_name not in slots:
+                slots[crew_name] = asyncio.Semaphore(self._limit(crew_name))
+            return slots[crew_name]
+
+    def _thread_slot(self, crew_name) -> threading.BoundedSemaphore:
+        with self._lock:
+            if crew_name not in self._thread_slots:
+                self._thread_slots[crew_name] = threading.BoundedSemaphore(self._limit(crew_name))
+            return self._thread_slots[crew_name]
+
+    def _update(self, stats: CrewStats, **deltas):
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(stats, name, getattr(stats, name) + delta)
+            stats.max_queue_depth = max(stats.max_queue_depth, stats.queued)
+
+    def _budget_wait(self, est_tokens) -> float:
+        wait = max(self.requests.reserve(1), self.tokens.reserve(est_tokens))
+        return max(wait, self._cooldown_wait())
+
+    def _cooldown_wait(self) -> float:
+        return self._cooldown_until - time.monotonic()
+
+    def _on_success(self, est_tokens, used_tokens):
+        if used_tokens:
+            self.tokens.adjust(est_tokens - used_tokens)
+        with self._lock:
+            for bucket in (self.requests, self.tokens):
+                bucket.factor = min(1.0, bucket.factor + 0.05)
+
+    def _on_rate_limit(self, stats: CrewStats, attempt, delay) -> float:
+        backoff = min(self.max_backoff, self.base_backoff * (2 ** attempt))
+        delay = max(delay or 0.0, backoff) + random.uniform(0, self.base_backoff)
+        with self._lock:
+            for bucket in (self.requests, self.tokens):
+                bucket.factor = max(self.min_rate_factor, bucket.factor * 0.5)
+            self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+            stats.rate_limited += 1
+            stats.retries += 1
+        return delay
+
+    async def submit(
+        self,
+        crew_name: str,
+        call: Callable[[], Awaitable[Any]],
+        est_tokens: int = 0,
+        usage: Callable[[Any], int] = None,
+        tags: dict = None,
+    ) -> Any:
+        """
+        Run `call` under the scheduler. `call` is invoked again on every retry,
+        so it must build a fresh awaitable each time. `usage` optionally maps the
+        result to the tokens actually spent, to correct the TPM estimate.
+        `tags` (e.g. the candidate ID) are added to the call's metrics.
+        """
+        stats = self._crew_stats(crew_name)
+        self._update(stats, queued=1)
+        slot = None
+        started = False
+        timing = _CallTiming()
+        try:
+            acquiring = self._async_slot(crew_name)
+            await acquiring.acquire()
+            slot = acquiring
+            for attempt in range(self.max_retries + 1):
+                # Budget is reserved once per call; a retry only waits out the rate limit cooldown
+                wait = self._budget_wait(est_tokens) if attempt == 0 else self._cooldown_wait()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                if not started:
+                    started = True
+                    timing.start()
+                    self._update(stats, queued=-1, running=1)
+                try:
+                    result = await call()
+                except Exception as e:
+                    delay = rate_limit_delay(e)
+                    if delay is None or attempt == self.max_retries:
+                        self._update(stats, failed=1)
+                        raise
+                    timing.retries += 1
+                    await asyncio.sleep(self._on_rate_limit(stats, attempt, delay))
+                    continue
+                self._on_success(est_tokens, usage(result) if usage else 0)
+                self._update(stats, completed=1)
+                timing.result = result
+                return result
+        finally:
+            timing.record(crew_name, tags)
+            self._update(stats, **({"running": -1} if started else {"queued": -1}))
+            if slot is not None:
+                slot.release()
+
+    def submit_sync(
+        self,
+        crew_name: str,
+        call: Callable[[], Any],
+        est_tokens: int = 0,
+        usage: Callable[[Any], int] = None,
+        tags: dict = None,
+    ) -> Any:
+        """Blocking counterpart of submit() for synchronous kickoffs."""
+        stats = self._crew_stats(crew_name)
+        self._update(stats, queued=1)
+        timing = _CallTiming()
+        slot = self._thread_slot(crew_name)
+        slot.acquire()
+        started = False
+        try:
+            for attempt in range(self.max_retries + 1):
+                # Budget is reserved once per call; a retry only waits out the rate limit cooldown
+                wait = self._budget_wait(est_tokens) if attempt == 0 else self._cooldown_wait()
+                if wait > 0:
+                    time.sleep(wait)
+                if not started:
+                    started = True
+                    timing.start()
+                    self._update(stats, queued=-1, running=1)
+                try:
+                    result = call()
+                except Exception as e:
+                    delay = rate_limit_delay(e)
+                    if delay is None or attempt == self.max_retries:
+                        self._update(stats, failed=1)
+                        raise
+                    timing.retries += 1
+                    time.sleep(self._on_rate_limit(stats, attempt, delay))
+                    continue
+                self._on_success(est_tokens, usage(result) if usage else 0)
+                self._update(stats, completed=1)
+                timing.result = result
+                return result
+        finally:
+            timing.record(crew_name, tags)
+            self._update(stats, **({"running": -1} if started else {"queued": -1}))
+            slot.release()
+
+    def stats(self) -> dict:
+        """Queue depth and outcome counters per crew, plus the shared budget state."""
+        with self._lock:
+            crews = {name: stats.as_dict() for name, stats in self._stats.items()}
+        return {
+            "crews": crews,
+            "queue_depth": sum(c["queued"] for c in crews.values()),
+            "running": sum(c["running"] for c in crews.values()),
+            "rate_factor": self.requests.factor,
+            "request_budget": self.requests.level(),
+            "token_budget": self.tokens.level(),
+            "cooldown_seconds": max(0.0, self._cooldown_until - time.monotonic()),
+        }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> LLMScheduler:
+    """
+    Process-wide scheduler configured from the environment:
+    ATS_LLM_RPM and ATS_LLM_TPM (static caps, off unless set above 0),
+    ATS_LLM_CONCURRENCY, ATS_LLM_MAX_RETRIES and ATS_LLM_CREW_CONCURRENCY
+    (e.g. "LeadScoreCrew:4,LeadFilterCrew:8").
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            crew_concurrency = {}
+            for item in os.getenv("ATS_LLM_CREW_CONCURRENCY", "").split(","):
+                if ":" in item:
+                    name, limit = item.split(":", 1)
+                    crew_concurrency[name.strip()] = int(limit)
+            _scheduler = LLMScheduler(
+                rpm=_env_int("ATS_LLM_RPM", 0),
+                tpm=_env_int("ATS_LLM_TPM", 0),
+                max_concurrency=_env_int("ATS_LLM_CONCURRENCY", 16),
+                crew_concurrency=crew_concurrency,
+                max_retries=_env_int("ATS_LLM_MAX_RETRIES", 5),
+            )
+        return _scheduler
@@ -0,0 +1,167 @@
+import asyncio
+import os
+import queue
+import smtplib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from email.message import Message
+from email.mime.text import MIMEText
+
+# Errors after which a pooled connection is dropped and the message retried on a new one.
+# Other SMTPExceptions (refused recipients, ...) are also OSErrors but leave the connection usable.
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+def build_message(file_path, to_email: str, from_email: str = None) -> MIMEText:
+    """Email from a file whose first line is "Subject: ..." and the rest the body."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+
+    if not lines or not lines[0].lower().startswith("subject:"):
+        raise ValueError(f"File {file_path} does not start with 'Subject:'")
+
+    msg = MIMEText("".join(lines[1:]).strip())
+    msg['Subject'] = lines[0][8:].strip()
+    msg['From'] = from_email or os.getenv("EMAIL_ADDRESS")
+    msg['To'] = to_email
+    return msg
+
+
+class SMTPPool:
+    """
+    Small pool of logged-in SMTP connections reused across messages.
+
+    A connection is opened (EHLO, STARTTLS, login) only when no idle one is
+    available and fewer than `size` exist. It is replaced after
+    `max_messages` sends, and when it turns out to be broken the message is
+    retried once on a fresh connection.
+    """
+
+    def __init__(self, host: str, port: int, username: str = None, password: str = None, size: int = 4,
+                 starttls: bool = True, timeout: float = 30, max_messages: int = 100):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = size
+        self.starttls = starttls
+        self.timeout = timeout
+        self.max_messages = max_messages
+        self.connects = 0
+        self.reconnects = 0
+        self.sent = 0
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            server.ehlo()
+            if self.starttls:
+                server.starttls()
+                server.ehlo()
+            if self.username and self.password:
+                server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        with self._lock:
+            self.connects += 1
+        server.messages_sent = 0
+        return server
+
+    def _acquire(self) -> smtplib.SMTP:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def _release(self, server: smtplib.SMTP):
+        if server.messages_sent >= self.max_messages:
+            self._discard(server)
+        else:
+            self._idle.put(server)
+
+    @staticmethod
+    def _discard(server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def send(self, msg: Message):
+        """Send one message, blocking. Raises smtplib.SMTPException when the server rejects it."""
+        with self._slots:
+            server = self._acquire()
+            try:
+                server.send_message(msg)
+            except Exception as e:
+                if not isinstance(e, CONNECTION_ERRORS):
+                    self._release(server)
+                    raise
+                # The pooled connection went stale (server timeout, network drop); retry once on a new one
+                server.close()
+                with self._lock:
+                    self.reconnects += 1
+                server = self._connect()
+                try:
+                    server.send_message(msg)
+                except Exception:
+                    server.close()
+                    raise
+            server.messages_sent += 1
+            with self._lock:
+                self.sent += 1
+            self._release(server)
+
+    def close(self):
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+class Mailer:
+    """SMTPPool run on its own threads, so coroutines can await sends without blocking the event loop."""
+
+    def __init__(self, pool: SMTPPool):
+        self.pool = pool
+        self._executor = ThreadPoolExecutor(max_workers=pool.size, thread_name_prefix="smtp")
+
+    def send(self, msg: Message):
+        self.pool.send(msg)
+
+    async def send_async(self, msg: Message):
+        await asyncio.get_running_loop().run_in_executor(self._executor, self.pool.send, msg)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.pool.close()
+
+
+_mailer = None
+_mailer_lock = threading.Lock()
+
+
+def get_mailer() -> Mailer:
+    """
+    Process-wide mailer. The server comes from ATS_SMTP_HOST / ATS_SMTP_PORT
+    (default smtp.gmail.com:587, with STARTTLS unless ATS_SMTP_STARTTLS=0),
+    the login from EMAIL_ADDRESS / EMAIL_PASSWORD, and the number of pooled
+    connections from ATS_SMTP_POOL_SIZE (default 4).
+    """
+    global _mailer
+    with _mailer_lock:
+        if _mailer is None:
+            _mailer = Mailer(SMTPPool(
+                os.getenv("ATS_SMTP_HOST", "smtp.gmail.com"),
+                int(os.getenv("ATS_SMTP_PORT", 587)),
+                username=os.getenv("EMAIL_ADDRESS"),
+                password=os.getenv("EMAIL_PASSWORD"),
+                size=int(os.getenv("ATS_SMTP_POOL_SIZE", 4)),
+                starttls=os.getenv("ATS_SMTP_STARTTLS", "1").lower() not in ("0", "false", "no"),
+                max_messages=int(os.getenv("ATS_SMTP_MAX_MESSAGES_PER_CONNECTION", 100)),
+            ))
+        return _mailer
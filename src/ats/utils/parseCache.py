@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import zlib
+from typing import Optional
+
+
+def content_key(data: bytes, version: str) -> str:
+    """Cache key for a file: parser version plus SHA-256 of its bytes."""
+    return f"v{version}-{hashlib.sha256(data).hexdigest()}"
+
+
+class ParseCache:
+    """
+    Content-addressed cache of parsed resumes on disk.
+
+    Each entry is one zlib-compressed JSON file named after its key. Reads
+    refresh the file's modification time, and when the directory grows past
+    `max_bytes` the least recently used entries are deleted first. Entries
+    hold resume text and contact details, so they are also deleted `ttl`
+    seconds after they were written, however often they are read.
+    """
+
+    SUFFIX = ".json.z"
+
+    def __init__(self, directory: str, max_bytes: int = 64 * 1024 * 1024, ttl: float = 7 * 24 * 3600):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(size for _, _, size in self._entries())
+        self._purged_at = 0.0
+        self.purge_expired()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def _read(self, path: str) -> dict:
+        """The stored entry, or ValueError when it is expired or not one this cache wrote."""
+        with open(path, "rb") as f:
+            entry = json.loads(zlib.decompress(f.read()))
+        if not isinstance(entry, dict) or time.time() - entry.get("created_at", 0) > self.ttl:
+            raise ValueError("expired")
+        return entry
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(self.SUFFIX):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, entry.path, stat.st_size))
+        return entries
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        try:
+            try:
+                value = self._read(path)["value"]
+            except (ValueError, KeyError, zlib.error):
+                self._remove(path)
+                raise
+            os.utime(path)
+        except (OSError, ValueError, KeyError, zlib.error):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: dict):
+        entry = {"created_at": time.time(), "value": value}
+        payload = zlib.compress(json.dumps(entry, separators=(",", ":")).encode("utf-8"), 6)
+        path = self._path(key)
+        # Write to a temporary file first so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        with self._lock:
+            try:
+                self._size -= os.path.getsize(path)
+            except OSError:
+                pass
+            os.replace(tmp_path, path)
+            self._size += len(payload)
+            if self._size > self.max_bytes:
+                self._evict()
+        # A long-running process also drops entries that nobody reads again
+        if time.time() - self._purged_at > min(self.ttl, 3600):
+            self.purge_expired()
+
+    def _remove(self, path: str):
+        with self._lock:
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+            except OSError:
+                return
+            self._size -= size
+
+    def purge_expired(self):
+        """Delete entries written more than the TTL ago, going by their stored creation time."""
+        self._purged_at = time.time()
+        for _, path, _ in self._entries():
+            try:
+                self._read(path)
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError, zlib.error):
+                self._remove(path)
+
+    def _evict(self):
+        # Rescan, since other processes may share the directory
+        entries = sorted(self._entries())
+        self._size = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._size -= size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "bytes": self._size,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_parse_cache() -> Optional[ParseCache]:
+    """
+    Process-wide parsed-resume cache, or None unless ATS_PARSE_CACHE=1.
+    Configured with ATS_PARSE_CACHE_DIR, ATS_PARSE_CACHE_MAX_MB and
+    ATS_PARSE_CACHE_TTL (seconds).
+    """
+    global _cache
+    if os.getenv("ATS_PARSE_CACHE", "0").lower() not in ("1", "true", "yes"):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ParseCache(
+                os.getenv("ATS_PARSE_CACHE_DIR", os.path.join(".ats_cache", "parsed_resumes")),
+                max_bytes=int(float(os.getenv("ATS_PARSE_CACHE_MAX_MB", 64)) * 1024 * 1024),
+                ttl=float(os.getenv("ATS_PARSE_CACHE_TTL", 7 * 24 * 3600)),
+            )
+        return _cache
@@ -0,0 +1,191 @@
+import os
+import re
+from typing import List, Optional, Set, Tuple
+
+from src.ats.types import Candidate, CandidateFilter
+
+# "5+ years", "3-5 years", "at least 4 yrs", "2 to 4 years of experience"
+_YEARS_RE = re.compile(r"(\d+(?:\.\d+)?)\s*\+?\s*(?:(?:-|–|to)\s*\d+(?:\.\d+)?\s*)?(?:years?|yrs?)\b", re.IGNORECASE)
+# "minimum of 5 years", "at least 4 yrs"; "5 years of / in / with / working with ..."
+_MINIMUM_RE = re.compile(r"\b(?:minimum|min\.?|at least)\b(?:\s+of)?\s*$")
+_CONTEXT_RE = re.compile(r"\s*(?:of|in|with|working|using|building|developing)\b")
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+_SKILL_SPLIT_RE = re.compile(r"[,;|\n/]+|\band\b")
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+# Spelled-out skills and the short forms job descriptions use for them
+ALIASES = {
+    "machine learning": "ml",
+    "deep learning": "dl",
+    "natural language processing": "nlp",
+    "artificial intelligence": "ai",
+    "amazon web services": "aws",
+    "google cloud platform": "gcp",
+    "google cloud": "gcp",
+    "microsoft azure": "azure",
+    "continuous integration": "ci",
+    "continuous delivery": "cd",
+    "continuous deployment": "cd",
+    "kubernetes": "k8s",
+    "javascript": "js",
+    "typescript": "ts",
+    "postgresql": "postgres",
+    "golang": "go",
+    "large language models": "llm",
+    "large language model": "llm",
+}
+_ALIAS_RE = re.compile(r"\b(" + "|".join(re.escape(phrase) for phrase in sorted(ALIASES, key=len, reverse=True)) + r")\b")
+
+# Words that qualify a skill rather than name it ("Python programming", "strong SQL skills")
+_GENERIC_TOKENS = {
+    "programming", "language", "languages", "development", "developer", "experience", "skill", "skills",
+    "knowledge", "proficiency", "proficient", "advanced", "basic", "strong", "good", "tool", "tools",
+    "framework", "frameworks", "engineering", "technology", "technologies", "of", "in", "with", "the", "for",
+}
+
+
+def _env_float(name, default):
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def prefilter_enabled() -> bool:
+    return os.getenv("ATS_PREFILTER", "1").lower() not in ("0", "false", "no")
+
+
+def required_years(jd: str) -> Optional[float]:
+    """
+    The 'N years' experience requirement of the job description, if any.
+
+    Only numbers with experience context count: "experience" shortly after,
+    "minimum" or "at least" before, or "of", "in", "with" or "working" right
+    after, so "over 20 years" of company history or "a 25 years old company"
+    are ignored. Returns the largest value near "experience", otherwise the
+    smallest value with the weaker context, otherwise None.
+    """
+    jd = jd or ""
+    strong, weak = [], []
+    for match in _YEARS_RE.finditer(jd):
+        value = float(match.group(1))
+        if not 0 < value <= 40:
+            continue
+        before = jd[max(0, match.start() - 20):match.start()].lower()
+        after = jd[match.end():match.end() + 40].lower()
+        if "experience" in after or _MINIMUM_RE.search(before):
+            strong.append(value)
+        elif _CONTEXT_RE.match(after):
+            weak.append(value)
+    if strong:
+        return max(strong)
+    return min(weak) if weak else None
+
+
+def candidate_years(years_of_exp: str) -> Optional[float]:
+    match = _NUMBER_RE.search(str(years_of_exp or ""))
+    return float(match.group()) if match else None
+
+
+def split_skills(skills: str) -> List[str]:
+    """Normalised, de-duplicated skills from the comma separated Candidate.skills field."""
+    text = str(skills or "").strip().strip("[]")
+    result = []
+    for skill in _SKILL_SPLIT_RE.split(text):
+        skill = skill.strip().strip("'\"").strip().lower()
+        if len(skill) > 1 and skill not in result:
+            result.append(skill)
+    return result
+
+
+def _stem(token: str) -> str:
+    # Plurals only: "services" and "service", "apis" and "api" match
+    return token[:-1] if len(token) > 3 and token.endswith("s") and not token.endswith("ss") else token
+
+
+def skill_tokens(text: str) -> Set[str]:
+    """Lower-cased, de-pluralised tokens of a skill or job description, with known aliases shortened."""
+    text = " ".join(re.sub(r"[-_.]", " ", (text or "").lower()).split())
+    text = _ALIAS_RE.sub(lambda match: ALIASES[match.group(1)], text)
+    return {_stem(token) for token in _TOKEN_RE.findall(text)}
+
+
+class JobTerms:
+    """Job description terms the pre-filter matches candidates against, built once per run."""
+
+    def __init__(self, jd: str):
+        self.tokens = skill_tokens(jd)
+        self.years = required_years(jd)
+        # Years are mentioned but none reads as a requirement: leave the experience call to the LLM
+        self.years_unclear = self.years is None and _YEARS_RE.search(jd or "") is not None
+        self._tokens = {}
+
+    def _skill(self, skill: str) -> Set[str]:
+        if skill not in self._tokens:
+            tokens = skill_tokens(skill)
+            self._tokens[skill] = (tokens - _GENERIC_TOKENS) or tokens
+        return self._tokens[skill]
+
+    def mentions(self, skill: str) -> bool:
+        """Every distinctive token of the skill appears in the job description."""
+        tokens = self._skill(skill)
+        return bool(tokens) and tokens <= self.tokens
+
+    def overlaps(self, skill: str) -> bool:
+        """Any distinctive token of the skill appears in the job description."""
+        return not self._skill(skill).isdisjoint(self.tokens)
+
+
+def prefilter_candidate(candidate: Candidate, terms: JobTerms) -> Tuple[Optional[str], str]:
+    """
+    Decide clear-cut candidates locally. Returns ("Pass" or "Fail", reason),
+    or (None, "") when the candidate should go to LeadFilterCrew.
+
+    Configured with ATS_PREFILTER_MIN_SKILLS (skills a candidate must list
+    before a zero overlap counts as a Fail, default 3), ATS_PREFILTER_YEARS_RATIO
+    (Fail below this share of the required years, default 0.5),
+    ATS_PREFILTER_PASS_MATCHES and ATS_PREFILTER_PASS_RATIO (matched skills and
+    share of listed skills needed to Pass, defaults 5 and 0.6).
+    """
+    skills = split_skills(candidate.skills)
+    matched = [skill for skill in skills if terms.mentions(skill)]
+    years = candidate_years(candidate.years_of_exp)
+
+    # A Fail sends a rejection without LLM review, so it needs zero overlap even token by token
+    if len(skills) >= _env_float("ATS_PREFILTER_MIN_SKILLS", 3) and not any(terms.overlaps(skill) for skill in skills):
+        return "Fail", f"None of the candidate's listed skills ({', '.join(skills)}) are mentioned in the job description."
+
+    if terms.years and years is not None and years < terms.years * _env_float("ATS_PREFILTER_YEARS_RATIO", 0.5):
+        return "Fail", f"The candidate has {years:g} years of experience; the job requires at least {terms.years:g}."
+
+    meets_years = terms.years is None and not terms.years_unclear or (
+        terms.years is not None and years is not None and years >= terms.years
+    )
+    if (
+        meets_years
+        and len(matched) >= _env_float("ATS_PREFILTER_PASS_MATCHES", 5)
+        and len(matched) / len(skills) >= _env_float("ATS_PREFILTER_PASS_RATIO", 0.6)
+    ):
+        return "Pass", f"The candidate's skills match the job description ({', '.join(matched)}) and meet the experience requirement."
+
+    return None, ""
+
+
+def prefilter_candidates(candidates: List[Candidate], jd: str) -> Tuple[List[CandidateFilter], List[Candidate]]:
+    """Split candidates into locally decided CandidateFilter records and those left for the LLM."""
+    if not prefilter_enabled():
+        return [], list(candidates)
+
+    terms = JobTerms(jd)
+    decided, ambiguous = [], []
+    for candidate in candidates:
+        result, reason = prefilter_candidate(candidate, terms)
+        if result is None:
+            ambiguous.append(candidate)
+        else:
+            decided.append(CandidateFilter(
+                id=candidate.id,
+                name=candidate.name,
+                email=candidate.email,
+                result=result,
+                reason=reason,
+            ))
+    return decided, ambiguous
@@ -0,0 +1,212 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from src.ats.types import Candidate, CandidateFilter, CandidateScore
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS runs (
+        run_id TEXT PRIMARY KEY,
+        flow TEXT NOT NULL,
+        started_at REAL NOT NULL,
+        finished_at REAL
+    )""",
+    """CREATE TABLE IF NOT EXISTS candidates (
+        run_id TEXT NOT NULL,
+        candidate_id TEXT NOT NULL,
+        name TEXT,
+        email TEXT,
+        bio TEXT,
+        years_of_exp TEXT,
+        skills TEXT,
+        PRIMARY KEY (run_id, candidate_id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS filters (
+        run_id TEXT NOT NULL,
+        candidate_id TEXT NOT NULL,
+        result TEXT,
+        reason TEXT,
+        PRIMARY KEY (run_id, candidate_id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS scores (
+        run_id TEXT NOT NULL,
+        candidate_id TEXT NOT NULL,
+        score INTEGER,
+        reason TEXT,
+        PRIMARY KEY (run_id, candidate_id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS candidates_by_id ON candidates (candidate_id)",
+    "CREATE INDEX IF NOT EXISTS filters_by_id ON filters (candidate_id)",
+    "CREATE INDEX IF NOT EXISTS scores_by_id ON scores (candidate_id)",
+    # What lead_scores.csv held: the scored candidates of a run
+    """CREATE VIEW IF NOT EXISTS lead_scores AS
+        SELECT s.run_id, s.candidate_id, c.name, c.email, s.score, s.reason
+        FROM scores s JOIN candidates c ON c.run_id = s.run_id AND c.candidate_id = s.candidate_id""",
+]
+
+INSERTS = {
+    "candidates": "INSERT OR REPLACE INTO candidates (run_id, candidate_id, name, email, bio, years_of_exp, skills) VALUES (?, ?, ?, ?, ?, ?, ?)",
+    "filters": "INSERT OR REPLACE INTO filters (run_id, candidate_id, result, reason) VALUES (?, ?, ?, ?)",
+    "scores": "INSERT OR REPLACE INTO scores (run_id, candidate_id, score, reason) VALUES (?, ?, ?, ?)",
+}
+
+
+class RunResults:
+    """
+    Buffered writer for the results of one run. Rows are kept until
+    `buffer_size` of them are waiting or `flush` is called, then written in
+    a single transaction. Writing a candidate again replaces its row, so a
+    rescoring pass leaves one score per candidate.
+    """
+
+    def __init__(self, store: "ResultStore", run_id: str, buffer_size: int = 100):
+        self.store = store
+        self.run_id = run_id
+        self.buffer_size = buffer_size
+        self._pending = {table: [] for table in INSERTS}
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def _add(self, table: str, rows: List[tuple]):
+        with self._lock:
+            self._pending[table].extend(rows)
+            self._count += len(rows)
+            full = self._count >= self.buffer_size
+        if full:
+            self.flush()
+
+    def add_candidates(self, candidates: List[Candidate]):
+        self._add("candidates", [
+            (self.run_id, c.id, c.name, c.email, c.bio, c.years_of_exp, c.skills) for c in candidates if c
+        ])
+
+    def add_filters(self, filters: List[CandidateFilter]):
+        self._add("filters", [(self.run_id, f.id, f.result, f.reason) for f in filters if f])
+
+    def add_scores(self, scores: List[CandidateScore]):
+        self._add("scores", [(self.run_id, s.id, s.score, s.reason) for s in scores if s])
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {table: [] for table in INSERTS}
+            self._count = 0
+        self.store._write(pending)
+
+    def finish(self):
+        self.flush()
+        self.store.finish_run(self.run_id)
+
+
+class ResultStore:
+    """
+    Results of every employer run in one SQLite file: the extracted
+    candidates, filter decisions and scores, keyed by run ID and candidate
+    ID. Concurrent runs write their own rows instead of overwriting shared
+    files, and finished runs stay queryable. The rows hold candidates' names,
+    emails and bios, so runs started more than `retention_days` ago are
+    deleted (never with a retention of 0 or less).
+    """
+
+    def __init__(self, path: str, buffer_size: int = 100, retention_days: float = 30):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.retention_days = retention_days
+        self._runs: Dict[str, RunResults] = {}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+        self.prune()
+
+    def prune(self):
+        """Delete the runs started before the retention period, with all their rows."""
+        if self.retention_days <= 0:
+            return
+        cutoff = time.time() - self.retention_days * 86400
+        with self._lock, self._conn:
+            expired = "SELECT run_id FROM runs WHERE started_at < ?"
+            for table in INSERTS:
+                self._conn.execute(f"DELETE FROM {table} WHERE run_id IN ({expired})", (cutoff,))
+            self._conn.execute("DELETE FROM runs WHERE started_at < ?", (cutoff,))
+
+    def run(self, run_id: str, flow: str = "") -> RunResults:
+        """Writer for a run, registering the run on first use."""
+        with self._lock:
+            results = self._runs.get(run_id)
+            if results is None:
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO runs (run_id, flow, started_at) VALUES (?, ?, ?)",
+                    (run_id, flow, time.time()),
+                )
+                self._conn.commit()
+                results = self._runs[run_id] = RunResults(self, run_id, self.buffer_size)
+        return results
+
+    def _write(self, pending: Dict[str, List[tuple]]):
+        if not any(pending.values()):
+            return
+        with self._lock, self._conn:
+            for table, rows in pending.items():
+                if rows:
+                    self._conn.executemany(INSERTS[table], rows)
+
+    def finish_run(self, run_id: str):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE runs SET finished_at = ? WHERE run_id = ?", (time.time(), run_id))
+            self._runs.pop(run_id, None)
+        # Long-running processes prune as runs finish, not only on startup
+        self.prune()
+
+    def _query(self, sql: str, params=()) -> List[dict]:
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def runs(self) -> List[dict]:
+        return self._query("SELECT * FROM runs ORDER BY started_at DESC")
+
+    def candidates(self, run_id: str) -> List[dict]:
+        return self._query("SELECT * FROM candidates WHERE run_id = ? ORDER BY rowid", (run_id,))
+
+    def filters(self, run_id: str) -> List[dict]:
+        return self._query("SELECT * FROM filters WHERE run_id = ? ORDER BY rowid", (run_id,))
+
+    def scores(self, run_id: str) -> List[dict]:
+        return self._query("SELECT * FROM scores WHERE run_id = ? ORDER BY rowid", (run_id,))
+
+    def lead_scores(self, run_id: str) -> List[dict]:
+        return self._query("SELECT * FROM lead_scores WHERE run_id = ? ORDER BY score DESC", (run_id,))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_result_store() -> Optional[ResultStore]:
+    """
+    Process-wide result store at ATS_RESULTS_PATH (default
+    ats_results.sqlite3), or None with ATS_RESULTS=0. ATS_RESULTS_BUFFER
+    (default 100) is the number of rows buffered before a write, and runs
+    older than ATS_RESULTS_RETENTION_DAYS (default 30) are deleted.
+    """
+    global _store
+    if os.getenv("ATS_RESULTS", "1").lower() in ("0", "false", "no"):
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = ResultStore(
+                os.getenv("ATS_RESULTS_PATH", "ats_results.sqlite3"),
+                buffer_size=int(os.getenv("ATS_RESULTS_BUFFER", 100)),
+                retention_days=float(os.getenv("ATS_RESULTS_RETENTION_DAYS", 30)),
+            )
+        return _store
@@ -0,0 +1,173 @@
+import asyncio
+import string
+from typing import List, Tuple
+
+import numpy as np
+
+# Bytes that make up tokens (ASCII letters, digits, "+#." and any UTF-8 byte
+# of a non-ASCII character) map to themselves in lower case, the rest to a space
+_KEEP = set((string.ascii_lowercase + string.digits + "+#.").encode()) | set(range(128, 256))
+_TOKEN_TABLE = bytes(b if b in _KEEP else 32 for b in bytes(range(256)).lower())
+_SPACE = 32
+_DOT = ord(".")
+
+_BASE = 16777619
+_CHUNK_BYTES = 1 << 21
+_powers = np.ones(1, dtype=np.uint32)
+_inverse_powers = np.ones(1, dtype=np.uint32)
+
+
+def _power_tables(size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """BASE**i and BASE**-i modulo 2**32 for i < size, grown on demand."""
+    global _powers, _inverse_powers
+    if _powers.size < size:
+        powers = np.empty(size, dtype=np.uint32)
+        powers[0] = 1
+        powers[1:] = _BASE
+        inverse = np.empty(size, dtype=np.uint32)
+        inverse[0] = 1
+        inverse[1:] = pow(_BASE, -1, 2 ** 32)
+        _powers, _inverse_powers = np.cumprod(powers, dtype=np.uint32), np.cumprod(inverse, dtype=np.uint32)
+    return _powers, _inverse_powers
+
+
+def _hash_tokens(texts: List[bytes], n_features: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Term counts for a chunk of encoded texts as (document, feature, count)
+    arrays, with one entry per distinct feature of each document.
+
+    Every token is hashed at once with a polynomial rolling hash over the
+    whole chunk: the hash of bytes [s, e) is (P[e] - P[s]) * BASE**-s, where P
+    is the prefix sum of byte * BASE**i. No Python object is made per token.
+    """
+    data = (b" ".join(texts) + b" ").translate(_TOKEN_TABLE)
+    chars = np.frombuffer(data, dtype=np.uint8)
+    edges = np.flatnonzero(np.diff(chars != _SPACE, prepend=False, append=False))
+    starts, ends = edges[0::2], edges[1::2]
+    # A trailing full stop ends a sentence; keep it only inside tokens ("node.js")
+    ends = ends - (chars[ends - 1] == _DOT)
+    nonempty = ends > starts
+    starts, ends = starts[nonempty], ends[nonempty]
+
+    powers, inverse_powers = _power_tables(chars.size)
+    prefix = np.zeros(chars.size + 1, dtype=np.uint32)
+    np.cumsum(chars * powers[:chars.size], dtype=np.uint32, out=prefix[1:])
+    hashes = (prefix[ends] - prefix[starts]) * inverse_powers[starts]
+    # murmur3 finaliser, so the low bits used as the feature are well mixed
+    hashes ^= hashes >> np.uint32(16)
+    hashes *= np.uint32(0x85EBCA6B)
+    hashes ^= hashes >> np.uint32(13)
+    hashes *= np.uint32(0xC2B2AE35)
+    hashes ^= hashes >> np.uint32(16)
+    features = hashes.astype(np.int64) % n_features
+
+    doc_ends = np.cumsum([len(text) + 1 for text in texts])
+    tokens_per_doc = np.diff(np.searchsorted(starts, doc_ends), prepend=0)
+    docs = np.repeat(np.arange(len(texts)), tokens_per_doc)
+    keys, counts = np.unique(docs * n_features + features, return_counts=True)
+    return keys // n_features, keys % n_features, counts
+
+
+def term_counts(texts: List[str], n_features: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Hashed term counts of `texts` as flat (document, feature, count) arrays."""
+    encoded = [(text or "").encode("utf-8") for text in texts]
+    docs, features, counts = [], [], []
+    start = 0
+    while start < len(encoded):
+        end, size = start, 0
+        while end < len(encoded) and (end == start or size + len(encoded[end]) < _CHUNK_BYTES):
+            size += len(encoded[end]) + 1
+            end += 1
+        chunk_docs, chunk_features, chunk_counts = _hash_tokens(encoded[start:end], n_features)
+        docs.append(chunk_docs + start)
+        features.append(chunk_features)
+        counts.append(chunk_counts)
+        start = end
+    if not docs:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+    return np.concatenate(docs), np.concatenate(features), np.concatenate(counts)
+
+
+class SimilarityIndex:
+    """
+    Hashed TF-IDF index over a batch of documents, for cosine similarity
+    against a query (the job description).
+
+    The non-zero entries are kept as flat (document, feature, weight) arrays,
+    so scoring every document against a query is a single NumPy pass.
+    """
+
+    def __init__(self, texts: List[str], n_features: int = 2 ** 18):
+        self.n_features = n_features
+        self.size = len(texts)
+        self.docs, self.features, counts = term_counts(texts, n_features)
+
+        df = np.bincount(self.features, minlength=n_features)
+        self.idf = np.log((1 + self.size) / (1 + df)) + 1.0
+        self.weights = (1.0 + np.log(counts)) * self.idf[self.features]
+        self.norms = np.sqrt(np.bincount(self.docs, weights=self.weights ** 2, minlength=self.size))
+
+    def _query_vector(self, text: str) -> np.ndarray:
+        _, features, counts = term_counts([text], self.n_features)
+        vector = np.zeros(self.n_features)
+        vector[features] = (1.0 + np.log(counts)) * self.idf[features]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def scores(self, query: str) -> np.ndarray:
+        """Cosine similarity of every document to `query`, in document order."""
+        query = self._query_vector(query)
+        dots = np.bincount(self.docs, weights=self.weights * query[self.features], minlength=self.size)
+        return np.divide(dots, self.norms, out=np.zeros(self.size), where=self.norms > 0)
+
+    def top_k(self, query: str, k: int) -> List[int]:
+        """Indices of the `k` most similar documents, best first."""
+        scores = self.scores(query)
+        k = min(k, self.size)
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top], kind="stable")].tolist()
+
+
+class StreamingShortlist:
+    """
+    The `k` passing candidates with the most similar resumes, decided while
+    filter results arrive in any order. A passing candidate is admitted once
+    fewer than `k` candidates ranked above it can still pass, and cut once
+    `k` ranked above it have passed, so nobody is scored and then dropped.
+    """
+
+    def __init__(self, ids: List[str], similarity: np.ndarray, k: int):
+        order = np.argsort(-np.asarray(similarity), kind="stable")
+        self.ranked = [ids[i] for i in order]
+        self.k = k
+        self._passed = {}
+        loop = asyncio.get_running_loop()
+        self._decisions = {candidate_id: loop.create_future() for candidate_id in self.ranked}
+
+    def report(self, candidate_id: str, passed: bool):
+        """Record a candidate's filter result; only the first report counts."""
+        if candidate_id in self._passed:
+            return
+        self._passed[candidate_id] = passed
+        passing = pending = 0
+        for ranked_id in self.ranked:
+            result = self._passed.get(ranked_id)
+            if result is None:
+                pending += 1
+                continue
+            if not result:
+                continue
+            decision = self._decisions[ranked_id]
+            if not decision.done():
+                if passing >= self.k:
+                    decision.set_result(False)
+                elif passing + pending < self.k:
+                    decision.set_result(True)
+            passing += 1
+
+    async def admitted(self, candidate_id: str) -> bool:
+        """Wait until the candidate, who passed the filter, is in or out of the shortlist."""
+        return await self._decisions[candidate_id]
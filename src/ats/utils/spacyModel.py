@@ -0,0 +1,31 @@
+import os
+import threading
+
+# The rewrite tool only reads part-of-speech tags, lemmas, stop words and
+# sentence boundaries, so the dependency parser and NER are never loaded.
+# Sentences come from the small "senter" component instead of the parser.
+EXCLUDED_PIPES = ["parser", "ner"]
+
+_nlp = None
+_nlp_lock = threading.Lock()
+
+
+def get_nlp():
+    """
+    Process-wide spaCy pipeline, loaded on first use. The model is
+    ATS_SPACY_MODEL (default en_core_web_sm).
+    """
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                # Imported here so processes that never rewrite a resume skip spaCy entirely
+                import spacy
+
+                nlp = spacy.load(os.getenv("ATS_SPACY_MODEL", "en_core_web_sm"), exclude=EXCLUDED_PIPES)
+                if "senter" in nlp.disabled:
+                    nlp.enable_pipe("senter")
+                elif not (nlp.has_pipe("senter") or nlp.has_pipe("sentencizer")):
+                    nlp.add_pipe("sentencizer")
+                _nlp = nlp
+    return _nlp
@@ -0,0 +1,105 @@
+import io
+import os
+from typing import BinaryIO, Callable, Dict, Union
+
+import docx
+import docx2txt
+import fitz  # PyMuPDF
+import pdfplumber
+
+Source = Union[str, os.PathLike, bytes, bytearray, BinaryIO]
+
+PDF_TYPES = ["pdf", "application/pdf"]
+DOCX_TYPES = [
+    "docx",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "application/msword",
+]
+
+
+def _is_path(source) -> bool:
+    return isinstance(source, (str, os.PathLike))
+
+
+def _as_bytes(source) -> bytes:
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source.read()
+
+
+def _as_file(source):
+    """Path as is; bytes and file-like objects as a fresh seekable buffer."""
+    return os.fspath(source) if _is_path(source) else io.BytesIO(_as_bytes(source))
+
+
+def _pdf_pymupdf(source) -> str:
+    if _is_path(source):
+        doc = fitz.open(os.fspath(source))
+    else:
+        doc = fitz.open(stream=_as_bytes(source), filetype="pdf")
+    with doc:
+        return "\n".join([page.get_text() for page in doc])
+
+
+def _pdf_pdfplumber(source) -> str:
+    with pdfplumber.open(_as_file(source)) as pdf:
+        # extract_text() returns None for pages without a text layer
+        return "\n".join([page.extract_text() or "" for page in pdf.pages])
+
+
+def _docx_docx2txt(source) -> str:
+    return docx2txt.process(_as_file(source))
+
+
+def _docx_python_docx(source) -> str:
+    return "\n".join([para.text for para in docx.Document(_as_file(source)).paragraphs])
+
+
+# The first backend of each format is the default (the fastest, see
+# benchmarks/bench_text_extraction.py); ATS_PDF_BACKEND / ATS_DOCX_BACKEND override it
+BACKENDS: Dict[str, Dict[str, Callable[[Source], str]]] = {
+    "pdf": {"pymupdf": _pdf_pymupdf, "pdfplumber": _pdf_pdfplumber},
+    "docx": {"docx2txt": _docx_docx2txt, "python-docx": _docx_python_docx},
+}
+
+
+def detect_file_type(source: Source, file_type: str = None) -> str:
+    """
+    "pdf" or "docx", from an explicit extension/MIME type, the file name, or
+    the leading bytes of the content. Raises ValueError for anything else.
+    """
+    if file_type:
+        file_type = file_type.lower().lstrip(".")
+        if file_type in PDF_TYPES:
+            return "pdf"
+        if file_type in DOCX_TYPES:
+            return "docx"
+    else:
+        name = os.fspath(source) if _is_path(source) else getattr(source, "name", "")
+        if isinstance(name, str) and name.lower().endswith((".pdf", ".docx")):
+            return name.lower().rsplit(".", 1)[-1]
+        if not _is_path(source):
+            head = _as_bytes(source)[:4]
+            if head.startswith(b"%PDF"):
+                return "pdf"
+            if head.startswith(b"PK"):
+                return "docx"
+    raise ValueError("Unsupported file type. Only PDF and DOCX are supported.")
+
+
+def extract_text(source: Source, file_type: str = None, backend: str = None) -> str:
+    """
+    Extract the text of a PDF or DOCX resume given as a path, bytes or a
+    file-like object. `file_type` may be an extension or MIME type; without it
+    the type is taken from the file name or content.
+    """
+    kind = detect_file_type(source, file_type)
+    backends = BACKENDS[kind]
+    backend = backend or os.getenv(f"ATS_{kind.upper()}_BACKEND") or next(iter(backends))
+    if backend not in backends:
+        raise ValueError(f"Unknown {kind} backend {backend!r}; choose from {', '.join(backends)}")
+    return backends[backend](source)